@@ -0,0 +1,458 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------
+# Copyright (c) 2026, NeXpy Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file COPYING, distributed with this software.
+# -----------------------------------------------------------------------------
+"""
+Benchmarks of the NeXpy plotting and projection hot paths.
+
+The benchmarks run the NeXpy GUI without a display, using Qt's offscreen
+platform, on synthetic NXdata groups, which are held either in memory or
+in a temporary HDF5 file. They time the following operations:
+
+* NXPlotView.plot for 1D, 2D and 3D data, with and without the
+  decimation of 1D data to the screen resolution.
+* Stepping through the z-axis slices of 3D data, which calls
+  NXPlotView.replot_data and redraws the canvas.
+* ProjectionTab.get_projection for a 2D projection summed over the
+  z-axis.
+* utils.rotate_data on a 2D frame.
+* NXPlotView.format_coord, which is called on every mouse movement.
+
+The results are saved as JSON, together with the package versions and
+data sizes, so that they can be compared with those of a previous run.
+Benchmarks that are slower than the baseline by more than the given
+threshold are reported as regressions and the script exits with a
+non-zero status.
+
+Examples
+--------
+$ python benchmarks/benchmark_plotting.py --sizes small -o baseline.json
+$ python benchmarks/benchmark_plotting.py --sizes small -o new.json \\
+      --compare baseline.json
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np  # noqa: E402
+
+SIZES = {
+    'small': {'points': 100_000, 'frame': (512, 512),
+              'volume': (20, 256, 256)},
+    'default': {'points': 10_000_000, 'frame': (2048, 2048),
+                'volume': (100, 512, 512)},
+    'large': {'points': 50_000_000, 'frame': (4096, 4096),
+              'volume': (200, 1024, 1024)},
+}
+
+
+def parse_shape(text):
+    """Convert a comma-separated string to a tuple of integers."""
+    return tuple(int(n) for n in text.split(','))
+
+
+def start_nexpy(user_settings=False):
+    """
+    Start the NeXpy application without a display.
+
+    Unless requested, the NeXpy directory, i.e., ~/.nexpy, is created in
+    a temporary home directory, so that the benchmarks do not depend on
+    the user's settings or modify them. The standard output and error
+    streams, which NeXpy redirects to its log, are restored.
+
+    Returns
+    -------
+    NXConsoleApp
+        The initialized NeXpy application.
+    """
+    if not user_settings:
+        home = tempfile.mkdtemp(prefix='nexpy-benchmark-')
+        os.environ['HOME'] = os.environ['USERPROFILE'] = home
+    from nexpy.gui.consoleapp import NXConsoleApp
+    app = NXConsoleApp()
+    app.initialize(argparse.Namespace(filenames=[], restore=False,
+                                      faulthandler=False))
+    # NeXpy redirects the standard streams to its log file
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    return app
+
+
+def make_data(sizes, directory=None):
+    """
+    Create the synthetic data used by the benchmarks.
+
+    The 2D and 3D signals contain Gaussian peaks on a noisy background,
+    so that the color limits and projections are representative of
+    real data.
+
+    Parameters
+    ----------
+    sizes : dict
+        Number of points in the 1D data and the shapes of the 2D and 3D
+        data.
+    directory : str, optional
+        If given, the data are also saved to an HDF5 file in this
+        directory and the file-backed groups are returned as well.
+
+    Returns
+    -------
+    dict
+        NXdata groups keyed by a label, e.g., '3d[hdf5]'.
+    """
+    from nexusformat.nexus import NXdata, NXentry, NXfield, NXroot, nxload
+
+    rng = np.random.default_rng(0)
+    arrays = {}
+
+    n = sizes['points']
+    x = np.linspace(0.0, 100.0, n)
+    y = (np.sin(x) + rng.normal(0.0, 0.1, n)).astype(np.float32)
+    arrays['1d'] = (y, (x,), ('x',))
+
+    ny, nx = sizes['frame']
+    yy, xx = np.ogrid[-1:1:ny*1j, -1:1:nx*1j]
+    frame = (np.exp(-(xx**2 + yy**2) / 0.05) * 1000.0 +
+             rng.poisson(10.0, (ny, nx))).astype(np.float32)
+    arrays['2d'] = (frame, (yy.ravel(), xx.ravel()), ('y', 'x'))
+
+    nz, ny, nx = sizes['volume']
+    zz, yy, xx = np.ogrid[-1:1:nz*1j, -1:1:ny*1j, -1:1:nx*1j]
+    volume = np.empty((nz, ny, nx), dtype=np.float32)
+    for i in range(nz):
+        volume[i] = (np.exp(-(xx[0]**2 + yy[0]**2 + zz[i]**2) / 0.05)
+                     * 1000.0 + rng.poisson(10.0, (ny, nx)))
+    arrays['3d'] = (volume, (zz.ravel(), yy.ravel(), xx.ravel()),
+                    ('z', 'y', 'x'))
+
+    def nxdata(label):
+        signal, axes, names = arrays[label]
+        return NXdata(NXfield(signal, name='signal'),
+                      [NXfield(axis, name=name)
+                       for axis, name in zip(axes, names)],
+                      title=f'{label.upper()} Benchmark')
+
+    datasets = {f'{label}[memory]': nxdata(label) for label in arrays}
+    if directory is not None:
+        filename = Path(directory) / 'benchmark.nxs'
+        root = NXroot(NXentry())
+        for label in arrays:
+            root['entry'][f'data{label}'] = nxdata(label)
+        root.save(filename, 'w')
+        root = nxload(filename, 'r')
+        for label in arrays:
+            datasets[f'{label}[hdf5]'] = root['entry'][f'data{label}']
+    return datasets
+
+
+class BenchmarkSuite:
+    """
+    Collection of timed operations on an NXPlotView.
+
+    Parameters
+    ----------
+    datasets : dict
+        NXdata groups returned by make_data.
+    repeat : int
+        Number of times each operation is timed.
+    steps : int
+        Number of z-axis slices stepped through in each replot
+        benchmark.
+    calls : int
+        Number of calls to format_coord in each timing.
+    """
+
+    def __init__(self, datasets, repeat=5, steps=20, calls=1000):
+        from nexpy.gui.plotview import NXPlotView
+        self.datasets = datasets
+        self.repeat = repeat
+        self.steps = steps
+        self.calls = calls
+        self.plotview = NXPlotView('Benchmark')
+        self.plotview.set_size(8.0, 6.0)
+        self.results = {}
+
+    def flush(self):
+        """Process pending events, including any scheduled draws."""
+        self.plotview.canvas.flush_events()
+
+    def time(self, name, func, setup=None, number=1):
+        """
+        Time a function and store the statistics of the timings.
+
+        The mean durations of the stages of each plot update, which are
+        recorded by the plotview's NXTimings instance while the function
+        is being timed, are stored with the results.
+
+        Parameters
+        ----------
+        name : str
+            Name of the benchmark.
+        func : function
+            Function to be timed.
+        setup : function, optional
+            Function called, without being timed, before each timing.
+        number : int, optional
+            Number of operations performed by each call to func, used to
+            report the time per operation. The default is 1.
+        """
+        timings = self.plotview.timings
+        timings.clear()
+        times = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            timings.enabled = True
+            try:
+                start = time.perf_counter()
+                func()
+                times.append((time.perf_counter() - start) / number)
+            finally:
+                timings.enabled = False
+        self.results[name] = {
+            'min': min(times), 'median': statistics.median(times),
+            'mean': statistics.mean(times), 'max': max(times),
+            'repeat': self.repeat, 'number': number,
+            'stages': {stage: mean for stage, _, mean, _, _
+                       in timings.summary()}}
+        print(f"{name:<32}{statistics.median(times)*1000:>12.3f} ms",
+              flush=True)
+
+    def plot(self, data):
+        """Plot the data and draw the canvas."""
+        self.plotview.plot(data)
+        self.plotview.canvas.draw()
+
+    def bench_plot(self, label):
+        """Time a new plot of the data."""
+        data = self.datasets[label]
+        self.time(f'plot_{label}', lambda: self.plot(data))
+
+    def bench_decimated(self, label):
+        """Time a new plot of 1D data decimated to the screen resolution."""
+        data = self.datasets[label]
+        self.plotview.decimate = True
+        try:
+            self.time(f'decimated_{label}', lambda: self.plot(data))
+        finally:
+            self.plotview.decimate = False
+
+    def bench_replot(self, label):
+        """Time stepping through the z-axis slices of 3D data."""
+        data = self.datasets[label]
+        plotview = self.plotview
+        steps = min(self.steps, data.nxsignal.shape[0] - 1)
+
+        def setup():
+            self.plot(data)
+            plotview.clear_cache()
+            self.flush()
+
+        def step():
+            for _ in range(steps):
+                plotview.ztab.maxbox.stepBy(1)
+                self.flush()
+
+        self.time(f'replot_{label}', step, setup=setup, number=steps)
+
+    def bench_projection(self, label):
+        """Time a 2D projection summed over all z-axis values."""
+        data = self.datasets[label]
+        plotview = self.plotview
+        self.plot(data)
+        plotview.ptab.panel_combo.select('Projection')
+        plotview.ptab.open_panel()
+        panel = plotview.panels['Projection']
+        try:
+            tab = panel.tabs[plotview.label]
+            z = plotview.zaxis.dim
+            tab.minbox[z].setValue(tab.minbox[z].data[0])
+            tab.maxbox[z].setValue(tab.maxbox[z].data[-1])
+            tab.checkbox['sum'].setChecked(True)
+
+            def project():
+                result = tab.get_projection()
+                if (result is None or
+                        result.nxsignal.shape != data.nxsignal.shape[1:]):
+                    raise RuntimeError('The projection was not completed')
+
+            self.time(f'projection_{label}', project)
+        finally:
+            panel.close()
+
+    def bench_rotate(self, label):
+        """Time the rotation of a 2D frame by 30 degrees."""
+        from nexpy.gui.utils import rotate_data
+        data = self.datasets[label]
+        self.time(f'rotate_{label}', lambda: rotate_data(data, 30.0))
+
+    def bench_format_coord(self, label):
+        """Time the formatting of the cursor coordinates."""
+        data = self.datasets[label]
+        self.plot(data)
+        plotview = self.plotview
+        xmin, xmax = plotview.ax.get_xlim()
+        ymin, ymax = plotview.ax.get_ylim()
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(xmin, xmax, self.calls)
+        ys = rng.uniform(ymin, ymax, self.calls)
+
+        def format_coords():
+            for x, y in zip(xs, ys):
+                plotview.format_coord(x, y)
+
+        self.time(f'format_coord_{label}', format_coords, number=self.calls)
+
+    def run(self, pattern='*'):
+        """Run the benchmarks whose names match the pattern."""
+        benchmarks = []
+        for label in self.datasets:
+            if label.startswith('1d'):
+                benchmarks += [('plot', label), ('decimated', label),
+                               ('format_coord', label)]
+            elif label.startswith('2d'):
+                benchmarks += [('plot', label), ('rotate', label),
+                               ('format_coord', label)]
+            else:
+                benchmarks += [('plot', label), ('replot', label),
+                               ('projection', label)]
+        for kind, label in benchmarks:
+            if fnmatch.fnmatch(f'{kind}_{label}', pattern):
+                getattr(self, f'bench_{kind}')(label)
+        return self.results
+
+
+def environment():
+    """Return the versions of the packages used by the benchmarks."""
+    import h5py
+    import matplotlib
+    import nexusformat
+    import qtpy
+    import scipy
+
+    import nexpy
+    return {'nexpy': nexpy.__version__,
+            'nexusformat': nexusformat.__version__,
+            'numpy': np.__version__, 'scipy': scipy.__version__,
+            'matplotlib': matplotlib.__version__, 'h5py': h5py.__version__,
+            'qt_api': qtpy.API_NAME, 'qt': qtpy.QT_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(), 'cpus': os.cpu_count()}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare the median timings with those of a previous run.
+
+    Parameters
+    ----------
+    results : dict
+        Benchmark results of the current run.
+    baseline : dict
+        Benchmark results of the previous run.
+    threshold : float
+        Ratio of the current to the previous median time above which a
+        benchmark is reported as a regression.
+
+    Returns
+    -------
+    list of str
+        Names of the benchmarks that have regressed.
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<32}{'Baseline':>12}{'Current':>12}"
+          f"{'Ratio':>8}")
+    for name in results:
+        if name not in baseline:
+            continue
+        old = baseline[name]['median']
+        new = results[name]['median']
+        ratio = new / old if old > 0 else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<32}{old*1000:>12.3f}{new*1000:>12.3f}"
+              f"{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark NeXpy plotting and projections")
+    parser.add_argument('-o', '--output', default='benchmarks.json',
+                        help='JSON file to store the results')
+    parser.add_argument('-c', '--compare',
+                        help='JSON file containing baseline results')
+    parser.add_argument('-t', '--threshold', type=float, default=1.25,
+                        help='slowdown ratio reported as a regression')
+    parser.add_argument('-s', '--sizes', choices=list(SIZES),
+                        default='default', help='preset data sizes')
+    parser.add_argument('--points', type=int,
+                        help='number of points in the 1D data')
+    parser.add_argument('--frame', type=parse_shape,
+                        help='shape of the 2D data, e.g., 2048,2048')
+    parser.add_argument('--volume', type=parse_shape,
+                        help='shape of the 3D data, e.g., 100,512,512')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='number of timings of each benchmark')
+    parser.add_argument('--steps', type=int, default=20,
+                        help='number of slices stepped in replot benchmarks')
+    parser.add_argument('-k', '--select', default='*',
+                        help='glob pattern selecting the benchmarks')
+    parser.add_argument('--memory-only', action='store_true',
+                        help='skip the HDF5-backed benchmarks')
+    parser.add_argument('--user-settings', action='store_true',
+                        help='use the settings in ~/.nexpy')
+    args = parser.parse_args()
+
+    sizes = dict(SIZES[args.sizes])
+    for key in ('points', 'frame', 'volume'):
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    app = start_nexpy(user_settings=args.user_settings)
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = make_data(
+            sizes, directory=None if args.memory_only else directory)
+        suite = BenchmarkSuite(datasets, repeat=args.repeat,
+                               steps=args.steps)
+        results = suite.run(args.select)
+        suite.plotview.close()
+        datasets.clear()
+    app.app.closeAllWindows()
+
+    output = {'date': datetime.now().isoformat(timespec='seconds'),
+              'environment': environment(),
+              'sizes': {key: value if np.isscalar(value) else list(value)
+                        for key, value in sizes.items()},
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('sizes') != output['sizes']:
+            print("Warning: the baseline used different data sizes")
+        if compare(results, baseline['results'], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,9 @@
 # The full license is in the file COPYING, distributed with this software.
 # -----------------------------------------------------------------------------
 import logging
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
 import matplotlib as mpl
@@ -14,14 +17,16 @@ from matplotlib.legend import Legend
 from matplotlib.rcsetup import validate_aspect, validate_float
 from nexusformat.nexus import (NeXusError, NXattr, NXdata, NXentry, NXfield,
                                NXgroup, NXlink, NXroot, NXvirtualfield,
-                               nxconsolidate, nxgetconfig, nxload, nxsetconfig)
+                               nxgetconfig, nxload, nxsetconfig)
 from nexusformat.nexus.utils import all_dtypes, map_dtype
 
+from .index import NXIndex
 from .pyqt import QtCore, QtWidgets, getOpenFileName, getSaveFileName
+from .scans import NXScanBuilder, harvest_scalars
 from .utils import (convertHTML, display_message, fix_projection, format_date,
                     format_mtime, format_timestamp, get_color, get_mtime,
                     human_size, keep_data, load_plugin, natural_sort,
-                    report_error, set_style, timestamp, wrap)
+                    project_data, report_error, set_style, timestamp, wrap)
 from .widgets import (GridParameters, NXCheckBox, NXComboBox, NXDialog,
                       NXDoubleSpinBox, NXHierarchicalComboBox, NXLabel,
                       NXLineEdit, NXPanel, NXPlainTextEdit, NXpolygon,
@@ -159,6 +164,236 @@ class DirectoryDialog(NXDialog):
         super().accept()
 
 
+class NXIndexWorker(QtCore.QObject):
+    """
+    Worker that updates the metadata index in a separate thread.
+
+    Parameters
+    ----------
+    index : NXIndex
+        Index to be updated.
+    """
+
+    progress = QtCore.Signal(int)
+    finished = QtCore.Signal(object)
+
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self.cancelled = False
+
+    def report(self, fraction):
+        """Emit the percentage completed and return True if cancelled."""
+        self.progress.emit(int(100 * fraction))
+        return self.cancelled
+
+    def run(self):
+        """
+        Update the index and emit the number of files that were read.
+
+        If the update fails, the exception is emitted instead.
+        """
+        try:
+            result = self.index.update(callback=self.report)
+        except Exception as error:
+            result = NeXusError(str(error))
+        self.finished.emit(result)
+
+
+class SearchDialog(NXDialog):
+
+    def __init__(self, parent=None):
+        """
+        Initialize the dialog to search the metadata of NeXus files.
+
+        The metadata of the files in the chosen directories, i.e., the
+        titles, start times and sample names of each entry and the
+        values of selected scalar fields, are stored in a SQLite
+        database in the NeXpy directory. The index is updated in a
+        background thread, which only reads files that have been added
+        or modified since the last update, so searches never need to
+        open the files.
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            Parent of the dialog. Default is None.
+        """
+        super().__init__(parent=parent)
+
+        self.index = NXIndex(self.mainwindow.nexpy_dir / 'index.db')
+        self.thread = None
+        self.worker = None
+        self.limit = 5000
+
+        self.directory_combo = NXComboBox(slot=self.search)
+        directory_layout = self.make_layout(NXLabel('Directory'),
+                                            self.directory_combo)
+        self.table = QtWidgets.QTableWidget()
+        self.table.setSelectionBehavior(
+            QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.open_files)
+        self.set_layout(
+            directory_layout,
+            self.action_buttons(('Add Directory', self.add_directory),
+                                ('Remove Directory', self.remove_directory),
+                                ('Update Index', self.update_index)),
+            self.textboxes(('Fields', ', '.join(self.index.fields))),
+            self.textboxes(('Search', '')),
+            self.textboxes(('Field', ''), ('Minimum', ''), ('Maximum', ''),
+                           layout='horizontal'),
+            self.table,
+            self.action_buttons(('Open Files', self.open_files)),
+            self.close_layout(close=True, progress=True))
+        self.textbox['Fields'].setToolTip(
+            "Comma-separated paths of scalar fields within each entry, "
+            "e.g., 'sample/temperature'")
+        for label in ['Search', 'Field', 'Minimum', 'Maximum']:
+            self.textbox[label].textChanged.connect(self.search)
+        self.set_directories()
+        self.search()
+        self.resize(800, 600)
+        self.set_title('Search Files')
+
+    def set_directories(self):
+        """Update the list of indexed directories."""
+        self.directory_combo.clear()
+        self.directory_combo.add('All Directories', *self.index.directories)
+
+    def add_directory(self):
+        """Choose a directory to add to the index and update it."""
+        directory = QtWidgets.QFileDialog.getExistingDirectory(
+            self, 'Choose Directory', str(self.mainwindow.default_directory))
+        if not directory:
+            return
+        try:
+            self.index.add_directory(directory)
+        except NeXusError as error:
+            report_error("Adding Directory", error)
+            return
+        self.set_directories()
+        self.update_index()
+
+    def remove_directory(self):
+        """Remove the selected directory from the index."""
+        if self.directory_combo.currentIndex() > 0:
+            self.stop_update()
+            self.index.remove_directory(self.directory_combo.selected)
+            self.set_directories()
+            self.search()
+
+    def update_index(self):
+        """
+        Read files that have been added or modified in a background thread.
+
+        If the index is already being updated, the update is cancelled.
+        """
+        if self.thread is not None:
+            self.stop_update()
+            return
+        self.index.set_fields(self.textbox['Fields'].text().split(','))
+        self.thread = QtCore.QThread()
+        self.worker = NXIndexWorker(self.index)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.finished.connect(self.finish_update)
+        self.pushbutton['Update Index'].setText('Cancel Update')
+        self.start_progress((0, 100))
+        self.thread.start()
+
+    def finish_update(self, result):
+        """Report the number of files read and refresh the results."""
+        self.stop_update()
+        self.search()
+        if isinstance(result, Exception):
+            report_error("Updating Index", result)
+        else:
+            self.status_message.setText(f"{result} files read")
+
+    def stop_update(self):
+        """Stop any update of the index."""
+        if self.worker is not None:
+            self.worker.cancelled = True
+        if self.thread is not None:
+            self.thread.quit()
+            self.thread.wait()
+        self.thread = self.worker = None
+        self.stop_progress()
+        self.pushbutton['Update Index'].setText('Update Index')
+
+    def search(self):
+        """Display the entries that match the search criteria."""
+        def number(label):
+            try:
+                return float(self.textbox[label].text())
+            except ValueError:
+                return None
+        if self.directory_combo.currentIndex() > 0:
+            directory = self.directory_combo.selected
+        else:
+            directory = None
+        results = self.index.search(
+            text=self.textbox['Search'].text().strip(),
+            field=self.textbox['Field'].text().strip().strip('/'),
+            minimum=number('Minimum'), maximum=number('Maximum'),
+            directory=directory, limit=self.limit)
+        fields = self.index.fields
+        headers = ['File', 'Entry', 'Title', 'Start Time', 'Sample'] + fields
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            items = [Path(result['filename']).name, result['entry'],
+                     result['title'], result['start_time'], result['sample']]
+            for column, value in enumerate(items):
+                item = QtWidgets.QTableWidgetItem(value or '')
+                if column == 0:
+                    item.setData(QtCore.Qt.UserRole, result['filename'])
+                    item.setToolTip(result['filename'])
+                self.table.setItem(row, column, item)
+            for column, field in enumerate(fields, start=len(items)):
+                if field in result['values']:
+                    item = QtWidgets.QTableWidgetItem()
+                    item.setData(QtCore.Qt.DisplayRole,
+                                 result['values'][field])
+                    self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        if len(results) == self.limit:
+            self.status_message.setText(
+                f"Showing the first {self.limit} entries")
+        else:
+            self.status_message.setText(f"{len(results)} entries")
+
+    def open_files(self):
+        """Open the files containing the selected entries."""
+        rows = sorted({index.row() for index in
+                       self.table.selectionModel().selectedRows()})
+        filenames = []
+        for row in rows:
+            filename = self.table.item(row, 0).data(QtCore.Qt.UserRole)
+            if filename not in filenames:
+                filenames.append(filename)
+        tree_files = [self.tree[root].nxfilename for root in self.tree]
+        for i, filename in enumerate(filenames):
+            if filename not in tree_files:
+                self.mainwindow.load_file(filename, wait=1, recent=(i == 0))
+        if filenames:
+            self.treeview.select_top()
+
+    def closeEvent(self, event):
+        """Stop any update of the index before closing."""
+        self.stop_update()
+        super().closeEvent(event)
+
+
 class PlotDialog(NXDialog):
 
     def __init__(self, node, lines=False, parent=None):
@@ -473,18 +708,21 @@ class PlotScalarDialog(NXDialog):
 
         self.set_layout(
             self.make_layout(self.signal_combo),
-            self.textboxes(('Scan', '')),
+            self.textboxes(('Scan', ''), ('Files', '')),
             self.action_buttons(
                 ('Select Scan', self.select_scan),
                 ('Select Files', self.select_files)),
             self.checkboxes(
                 ('lines', 'Plot Lines', False),
-                ('over', 'Plot Over', False)),
+                ('over', 'Plot Over', False),
+                ('virtual', 'Virtual Dataset', False)),
             self.action_buttons(
                 ('Plot', self.plot_scan),
                 ('Copy', self.copy_scan),
                 ('Save', self.save_scan)),
-            self.close_layout())
+            self.close_layout(progress=True))
+        self.textbox['Files'].setToolTip(
+            "Glob pattern of files on disk, e.g., '/data/run_*.nxs'")
 
         self.set_title("Plot NeXus Field")
         self.kwargs = kwargs
@@ -591,6 +829,11 @@ class PlotScalarDialog(NXDialog):
         else:
             return None
 
+    @property
+    def file_pattern(self):
+        """The glob pattern of the files on disk, if entered."""
+        return self.textbox['Files'].text().strip()
+
     @property
     def scan_header(self):
         """The name of the scan axis."""
@@ -653,7 +896,14 @@ class PlotScalarDialog(NXDialog):
         The scan data is constructed from the selected files and the
         selected signal. The scan values are used to create a new axis
         and the signal values are read from each file and stored in the
-        new field.
+        new field. If 'Virtual Dataset' is checked, the field is an
+        HDF5 virtual dataset that maps the signal in each file, so that
+        no values are copied.
+
+        If a glob pattern is entered in the 'Files' box, the values and
+        the scan variable are read from all the matching files on disk,
+        which do not need to be opened in the tree, and the data are
+        sorted by the scan values.
 
         Returns
         -------
@@ -665,8 +915,28 @@ class PlotScalarDialog(NXDialog):
         NeXusError
             If the files have not been selected.
         """
+        if self.file_pattern:
+            return self.harvest(self.file_pattern,
+                                scan_path=self.scan_path or None)
         signal = self.group[self.data_path]
         axis = self.scan_axis()
+        if self.checkbox['virtual'].isChecked():
+            files = [f.nxfilename for f in self.scan_files]
+            if None in files:
+                raise NeXusError(
+                    "Virtual datasets require all files to be saved")
+            field = NXvirtualfield(signal.nxfilepath, files,
+                                   shape=signal.shape, dtype=signal.dtype,
+                                   abspath=True, name=signal.nxname)
+            return NXdata(field, axis, title=self.data_path)
+        files = [f.nxfilename for f in self.scan_files]
+        if None not in files:
+            values = self.harvest(files).nxsignal.nxdata
+            if np.isnan(values).any():
+                missing = files[int(np.argmax(np.isnan(values)))]
+                raise NeXusError(f"Cannot read '{missing}'")
+            field = NXfield(values, dtype=signal.dtype, name=signal.nxname)
+            return NXdata(field, axis, title=self.data_path)
         shape = [len(axis)]
         field = NXfield(shape=shape, dtype=signal.dtype, name=signal.nxname)
         for i, f in enumerate(self.scan_files):
@@ -677,6 +947,16 @@ class PlotScalarDialog(NXDialog):
             field[i] = f[self.data_path]
         return NXdata(field, axis, title=self.data_path)
 
+    def harvest(self, files, scan_path=None):
+        """Read the selected signal from files, showing the progress."""
+        self.start_progress((0, 100))
+        try:
+            return harvest_scalars(
+                files, self.data_path, scan_path=scan_path,
+                callback=lambda f: self.update_progress(int(100 * f)))
+        finally:
+            self.stop_progress()
+
     def plot_scan(self):
         """
         Plot the scan data.
@@ -962,6 +1242,149 @@ class ExportDialog(NXDialog):
         super().accept()
 
 
+class MovieDialog(NXDialog):
+
+    def __init__(self, plotview, parent=None):
+        """
+        Initialize the dialog to export the slices of a plot as a movie.
+
+        The frames are rendered by a pool of worker processes, using the
+        limits, norm, colormap and skew angle of the current plot, and
+        then encoded as an MP4 or GIF file.
+
+        Parameters
+        ----------
+        plotview : NXPlotView
+            The plotting window containing the 3D data.
+        parent : QWidget, optional
+            The parent window of the dialog, by default None
+        """
+        super().__init__(parent=parent)
+
+        self.plotview = plotview
+        self.values = self.plotview.zaxis.centers
+        self.running = False
+        self.cancelled = False
+
+        if shutil.which(mpl.rcParams['animation.ffmpeg_path']):
+            formats = ['MP4', 'GIF']
+        else:
+            formats = ['GIF', 'MP4']
+        self.parameters = GridParameters()
+        self.parameters.add('start', float(self.values[0]),
+                            f'First {self.plotview.zaxis.name} Value')
+        self.parameters.add('stop', float(self.values[-1]),
+                            f'Last {self.plotview.zaxis.name} Value')
+        self.parameters.add('step', 1, 'Slice Stride')
+        self.parameters.add('fps', 10, 'Frames per Second')
+        self.parameters.add('dpi', 100, 'Resolution (DPI)')
+        self.parameters.add('workers', os.cpu_count() or 1, 'Worker Processes')
+        self.parameters.add('format', formats, 'Movie Format')
+
+        self.set_layout(self.parameters.grid(header=False),
+                        self.close_layout(save=True, progress=True))
+        self.set_title('Exporting Movie')
+
+    def index(self, name):
+        """Return the index of the z-axis value closest to a parameter."""
+        return int(np.argmin(np.abs(self.values -
+                                    self.parameters[name].value)))
+
+    def accept(self):
+        """
+        Render the selected slices and encode them as a movie.
+
+        The frames are saved to a temporary directory, which is removed
+        after the movie has been encoded or the export is cancelled.
+        """
+        if self.running:
+            return
+        try:
+            start, stop = sorted((self.index('start'), self.index('stop')))
+            step = max(int(self.parameters['step'].value), 1)
+            movie_format = self.parameters['format'].value
+            extension = movie_format.lower()
+            fname = getSaveFileName(
+                self, "Choose a Filename",
+                f"{self.plotview.data.nxname}.{extension}",
+                f"{movie_format} Files (*.{extension})")
+            if fname:
+                self.set_default_directory(Path(fname).parent)
+            else:
+                return
+            if not self.export(fname, start, stop, step):
+                return
+        except NeXusError as error:
+            report_error("Exporting Movie", error)
+            return
+        logging.info(f"Movie saved as '{fname}'")
+        super().accept()
+
+    def export(self, fname, start, stop, step):
+        """
+        Export the slices to a movie file.
+
+        Parameters
+        ----------
+        fname : str
+            Path of the movie file.
+        start, stop, step : int
+            Indices of the first and last slices and the stride.
+
+        Returns
+        -------
+        bool
+            True if the movie was saved, or False if it was cancelled.
+        """
+        from .render import encode_movie, iter_render
+        frames = len(range(start, stop+1, step))
+        options = self.plotview.render_options()
+        options['dpi'] = self.parameters['dpi'].value
+        options['figsize'] = tuple(self.plotview.figure.get_size_inches())
+        title = options.pop('title')
+        name = self.plotview.zaxis.name
+        workers = int(self.parameters['workers'].value)
+
+        def jobs():
+            for value, data in self.plotview.movie_frames(start, stop, step):
+                yield data, {'title': f"{title}\n{name} = {value:.6g}"}
+
+        self.running = True
+        self.cancelled = False
+        self.start_progress((0, frames))
+        with tempfile.TemporaryDirectory() as directory:
+            template = os.path.join(directory, 'frame_{:06d}.png')
+            results = iter_render(jobs(), filename=template,
+                                  workers=workers, **options)
+            try:
+                for i, (index, _, error) in enumerate(results, start=1):
+                    if error:
+                        raise NeXusError(
+                            f"Unable to render frame {index}\n{error}")
+                    self.update_progress(i)
+                    if self.cancelled:
+                        return False
+            finally:
+                results.close()
+                self.running = False
+                self.stop_progress()
+            self.status_message.setText("Encoding movie...")
+            self.update_progress()
+            try:
+                encode_movie([template.format(i) for i in range(frames)],
+                             fname, fps=self.parameters['fps'].value)
+            finally:
+                self.status_message.setText("")
+        return True
+
+    def reject(self):
+        """Cancel the export if it is running or close the dialog."""
+        if self.running:
+            self.cancelled = True
+        else:
+            super().reject()
+
+
 class LockDialog(NXDialog):
     """Dialog to display file-based locks on NeXus files"""
 
@@ -1128,6 +1551,10 @@ class SettingsDialog(NXDialog):
         self.parameters.add('style', styles, 'Plot Style')
         self.parameters['style'].value = self.mainwindow.settings.get(
             'settings', 'style')
+        self.parameters.add('slicecache',
+                            self.mainwindow.settings.get('settings',
+                                                         'slicecache'),
+                            'Slice Cache (MB)')
         self.set_layout(self.parameters.grid(),
                         self.action_buttons(('Save As Default',
                                             self.save_default)),
@@ -1165,6 +1592,8 @@ class SettingsDialog(NXDialog):
                                      cfg['recursive'])
         self.mainwindow.settings.set('settings', 'style',
                                      self.parameters['style'].value)
+        self.mainwindow.settings.set('settings', 'slicecache',
+                                     self.parameters['slicecache'].value)
         self.mainwindow.settings.save()
 
     def set_nexpy_settings(self):
@@ -1174,7 +1603,8 @@ class SettingsDialog(NXDialog):
         This method is called when the 'Save As Default' button is
         clicked. It sets the default NeXpy settings to the current
         values in the dialog and saves them in the configuration file.
-        The default settings are used when NeXpy is started.
+        The default settings are used when NeXpy is started. An invalid
+        slice cache size is replaced by the default of 256 MB.
         """
         def check_value(value):
             if not value.strip():
@@ -1192,6 +1622,13 @@ class SettingsDialog(NXDialog):
                         self.parameters['definitions'].value),
                     recursive=self.parameters['recursive'].value)
         set_style(self.parameters['style'].value)
+        try:
+            cache_size = max(float(self.parameters['slicecache'].value), 0.0)
+        except (TypeError, ValueError):
+            cache_size = 256.0
+        self.parameters['slicecache'].value = cache_size
+        for plotview in self.plotviews.values():
+            plotview.cache_size = cache_size
 
     def accept(self):
         """
@@ -1249,8 +1686,9 @@ class CustomizeTab(NXTab):
         """
         super().__init__(label, parent=parent)
 
-        from .plotview import linestyles, markers
+        from .plotview import cmaps, linestyles, markers
         self.markers, self.linestyles = markers, linestyles
+        self.cmaps = cmaps
 
         self.plotview = self.active_plotview
 
@@ -1364,9 +1802,10 @@ class CustomizeTab(NXTab):
         GridParameters
             A GridParameters object containing parameters for image plots.
             The parameters include aspect ratio, skew angle, grid, grid color,
-            grid style, grid alpha, minor ticks, and color bar minor ticks.
-            If the image has a colormap with a bad color, there is also a
-            bad color parameter.
+            grid style, grid alpha, minor ticks, color bar minor ticks, the
+            level-of-detail method, and the autoscale percentiles. If the
+            image has a colormap with a bad color, there is also a bad color
+            parameter.
         """
         parameters = GridParameters()
         parameters.add('aspect', self.plotview._aspect, 'Aspect Ratio')
@@ -1378,6 +1817,8 @@ class CustomizeTab(NXTab):
         parameters.add('gridalpha', self.plotview._gridalpha, 'Grid Alpha')
         parameters.add('minorticks', ['On', 'Off'], 'Minor Ticks')
         parameters.add('cb_minorticks', ['On', 'Off'], 'Color Bar Minor Ticks')
+        parameters.add('lod', ['Off', 'Mean', 'Max'], 'Level of Detail')
+        parameters.add('percentiles', '', 'Autoscale Percentiles')
         try:
             parameters.add('badcolor',
                            get_color(self.plotview.image.cmap.get_bad()),
@@ -1417,6 +1858,15 @@ class CustomizeTab(NXTab):
             p['cb_minorticks'].value = 'On'
         else:
             p['cb_minorticks'].value = 'Off'
+        if self.plotview.lod:
+            p['lod'].value = self.plotview.lod.capitalize()
+        else:
+            p['lod'].value = 'Off'
+        if self.plotview.percentiles:
+            p['percentiles'].value = ', '.join(
+                f'{v:g}' for v in self.plotview.percentiles)
+        else:
+            p['percentiles'].value = ''
         try:
             p['badcolor'].value = get_color(self.plotview.image.cmap.get_bad())
         except AttributeError:
@@ -1518,7 +1968,9 @@ class CustomizeTab(NXTab):
         -------
         GridParameters
             A GridParameters object containing parameters for the plot legend,
-            label, grid, grid color, grid style, grid alpha, and minor ticks.
+            label, grid, grid color, grid style, grid alpha, minor ticks, and
+            line decimation, as well as the line offset and color map of
+            multiplots.
         """
         parameters = GridParameters()
         parameters.add('legend', ['None']+[key.title()
@@ -1531,6 +1983,11 @@ class CustomizeTab(NXTab):
         parameters.add('gridstyle', list(self.linestyles), 'Grid Style')
         parameters.add('gridalpha', self.plotview._gridalpha, 'Grid Alpha')
         parameters.add('minorticks', ['On', 'Off'], 'Minor Ticks')
+        parameters.add('decimate', ['On', 'Off'], 'Decimation')
+        if self.plotview.multilines is not None:
+            parameters.add('lineoffset', 0.0, 'Line Offset')
+            parameters.add('linecolors', ['Default'] + self.cmaps,
+                           'Line Colors')
         parameters.grid(title='Plot Attributes', header=False, width=125)
         return parameters
 
@@ -1561,6 +2018,14 @@ class CustomizeTab(NXTab):
             p['minorticks'].value = 'On'
         else:
             p['minorticks'].value = 'Off'
+        if self.plotview.decimate:
+            p['decimate'].value = 'On'
+        else:
+            p['decimate'].value = 'Off'
+        m = self.plotview.multilines
+        if 'lineoffset' in p and m is not None:
+            p['lineoffset'].value = m['offset']
+            p['linecolors'].value = m['cmap'] or 'Default'
 
     def is_empty_legend(self):
         """True if the legend is empty."""
@@ -1721,6 +2186,8 @@ class CustomizeTab(NXTab):
         self.parameters[label]['offset'].box.setSingleStep(
             max(abs(offset)/100.0, 1))
         y = self.plotview.plots[plot]['y']
+        if self.plotview.plots[plot].get('decimation') is not None:
+            y = y[self.plotview.plots[plot]['decimation']]
         self.plotview.plots[plot]['plot'].set_ydata((y * scale) + offset)
         self.plotview.draw()
 
@@ -1783,6 +2250,11 @@ class CustomizeTab(NXTab):
                 self.plotview.cb_minorticks_on()
             else:
                 self.plotview.cb_minorticks_off()
+            self.plotview.lod = pi['lod'].value
+            try:
+                self.plotview.percentiles = pi['percentiles'].value
+            except NeXusError as error:
+                report_error("Customizing Plot", error)
         else:
             for plot in self.plots:
                 label = self.plot_label(plot)
@@ -1825,6 +2297,10 @@ class CustomizeTab(NXTab):
                 else:
                     p['linestyle'] = linestyle
             self.set_legend()
+            self.plotview.decimate = (
+                self.parameters['grid']['decimate'].value == 'On')
+            self.plotview.update_decimation(force=True)
+            self.apply_multilines()
             for plot in self.plots:
                 p = self.plots[plot]
                 if p['smooth_line']:
@@ -1834,6 +2310,30 @@ class CustomizeTab(NXTab):
         self.update()
         self.plotview.draw()
 
+    def apply_multilines(self):
+        """
+        Apply the multiplot parameters to the plotview.
+
+        The other lines of a multiplot share the line style and width of
+        the first line. Their colors are only reset if a different color
+        map has been selected, so that the color of the first line can
+        still be customized.
+        """
+        m = self.plotview.multilines
+        pg = self.parameters['grid']
+        if m is None or 'lineoffset' not in pg:
+            return
+        line = self.plots[m['num']]['plot']
+        m['collection'].set_linewidth(line.get_linewidth())
+        m['collection'].set_linestyle(line.get_linestyle())
+        cmap = pg['linecolors'].value
+        if cmap == 'Default':
+            cmap = None
+        if cmap != m['cmap']:
+            self.plotview.set_line_colors(cmap=cmap, draw=False)
+        if pg['lineoffset'].value != m['offset']:
+            self.plotview.set_line_offset(pg['lineoffset'].value)
+
 
 class StyleDialog(NXPanel):
 
@@ -2166,6 +2666,8 @@ class ProjectionTab(NXTab):
 
         self.initialize()
         self._rectangle = None
+        self.running = False
+        self.cancelled = False
         self.xbox.setFocus()
 
     def initialize(self):
@@ -2451,10 +2953,15 @@ class ProjectionTab(NXTab):
         Returns
         -------
         data : NXdata
-            The projected data.
+            The projected data, or None if the projection was cancelled.
 
         Notes
         -----
+        Large slabs are read and summed in blocks by worker threads, so
+        that they do not need to fit in memory. The progress is shown
+        on the 'Save' and 'Plot' buttons, which can be clicked again to
+        cancel the projection.
+
         If the 'Select' checkbox is checked, the data is selected
         according to the parameters in the 'Select' tab before
         projection.
@@ -2474,7 +2981,20 @@ class ProjectionTab(NXTab):
             raise NeXusError("One of the projection axes has zero range")
         if self.plotview.rgb_image:
             limits.append((None, None))
-        data = self.plotview.data.project(axes, limits, summed=self.summed)
+            data = self.plotview.data.project(axes, limits,
+                                              summed=self.summed)
+        else:
+            self.running = True
+            self.cancelled = False
+            try:
+                data = project_data(self.plotview.data, axes, limits,
+                                    summed=self.summed,
+                                    callback=self.projection_progress)
+            finally:
+                self.running = False
+                self.projection_progress(None)
+            if data is None:
+                return None
         if self.select:
             divisor = self.select_parameters['divisor'].value
             offset = self.select_parameters['offset'].value
@@ -2498,11 +3018,44 @@ class ProjectionTab(NXTab):
         group is created with the projected data. If the data does
         exist, the projected data replace the existing data.
         """
+        if self.running:
+            self.cancelled = True
+            return
         try:
-            keep_data(self.get_projection())
+            projection = self.get_projection()
+            if projection is not None:
+                keep_data(projection)
         except NeXusError as error:
             report_error("Saving Projection", error)
 
+    def projection_progress(self, fraction):
+        """
+        Show the progress of a projection on the 'Save' and 'Plot' buttons.
+
+        Parameters
+        ----------
+        fraction : float or None
+            Fraction of the projection that has been completed, or None
+            if the projection has ended.
+
+        Returns
+        -------
+        bool
+            True if the projection has been cancelled.
+        """
+        if fraction is None:
+            self.save_button.setText("Save")
+            self.plot_button.setText("Plot")
+            self.save_button.setToolTip("")
+            self.plot_button.setToolTip("")
+        else:
+            text = f"{int(100 * fraction)}%"
+            for button in (self.save_button, self.plot_button):
+                button.setText(text)
+                button.setToolTip("Cancel the projection")
+            self.mainwindow._app.processEvents()
+        return self.cancelled
+
     def plot_projection(self):
         """
         Plot the projected data.
@@ -2518,8 +3071,13 @@ class ProjectionTab(NXTab):
         by those values. If the 'Lines' parameter is set to True, the
         projected data are plotted with lines.
         """
+        if self.running:
+            self.cancelled = True
+            return
         try:
             projection = self.get_projection()
+            if projection is None:
+                return
             if self.plot:
                 plotview = self.plot
             else:
@@ -2561,6 +3119,7 @@ class ProjectionTab(NXTab):
         try:
             limits = tuple(slice(x, y) for x, y in self.get_limits())
             self.plotview.data.nxsignal[limits] = np.ma.masked
+            self.plotview.clear_cache()
             self.plotview.replot_data()
         except NeXusError as error:
             report_error("Masking Data", error)
@@ -2584,6 +3143,7 @@ class ProjectionTab(NXTab):
             self.plotview.data.nxsignal.mask[limits] = np.ma.nomask
             if not self.plotview.data.nxsignal.mask.any():
                 self.plotview.data.mask = np.ma.nomask
+            self.plotview.clear_cache()
             self.plotview.replot_data()
         except NeXusError as error:
             report_error("Masking Data", error)
@@ -3401,7 +3961,8 @@ class ScanTab(NXTab):
             grid.addWidget(self.maxbox[axis], row, 2)
 
         self.set_layout(
-            grid, self.checkboxes(("hide", "Hide Limits", False)),
+            grid, self.checkboxes(("hide", "Hide Limits", False),
+                                  ("virtual", "Virtual Dataset", False)),
             self.textboxes(('Scan', '')),
             self.action_buttons(('Select Scan', self.select_scan),
                                 ('Select Files', self.select_files)),
@@ -3409,11 +3970,15 @@ class ScanTab(NXTab):
                                 ('Copy', self.copy_scan),
                                 ('Save', self.save_scan)))
         self.checkbox["hide"].stateChanged.connect(self.hide_rectangle)
+        self.checkbox["virtual"].stateChanged.connect(self.set_virtual)
         self.file_box = None
         self.scan_files = None
         self.scan_values = None
         self.scan_data = None
         self.scan_root = None
+        self.scan_builder = None
+        self.running = False
+        self.cancelled = False
         self.files = None
         self.initialize()
         self._rectangle = None
@@ -3550,7 +4115,7 @@ class ScanTab(NXTab):
 
     def set_limits(self):
         """Plot the limits rectangle when the axis limits change."""
-        self.scan_data = None
+        self.cancel_scan()
         self.draw_rectangle()
 
     def get_limits(self, axis=None):
@@ -3637,23 +4202,99 @@ class ScanTab(NXTab):
                                for f in self.files if self.files[f].vary]
             self.scan_values = [self.files[f].value for f in self.files
                                 if self.files[f].vary]
-            self.create_scan_data()
+            if self.running:
+                self.cancel_scan()
+            else:
+                self.create_scan_data()
+        except NeXusError as error:
+            report_error("Choosing Scan Files", error)
         except Exception:
             report_error("Choosing Scan Files", "Files not selected")
 
+    def set_virtual(self):
+        """Recreate the scan data when 'Virtual Dataset' is toggled."""
+        self.cancel_scan()
+
+    def cancel_scan(self):
+        """
+        Discard the scan data, so that it is recreated when required.
+
+        If the scan is being consolidated, the consolidation is
+        cancelled, since it no longer matches the selected options.
+        """
+        if self.running:
+            self.cancelled = True
+        self.scan_data = None
+
     def create_scan_data(self):
-        """Create the consolidated scan data."""
-        self.scan_data = nxconsolidate(self.scan_files, self.data_path,
-                                       self.scan_path, idx=self.get_slice())
+        """
+        Create or update the consolidated scan data.
+
+        The selected slab of each file is read by a pool of worker
+        processes into a temporary file. If files are added to the
+        selection, only the new files are read. The progress is shown
+        on the 'Plot' button, which can be clicked again to cancel the
+        consolidation. If 'Virtual Dataset' is checked, the temporary
+        file contains HDF5 virtual datasets that map the slab in each
+        file, so that no data are copied.
+
+        Since events are processed while the files are read, this must
+        not be called if the scan is already being consolidated. All
+        the selected trees must have been saved to files.
+        """
+        if self.running:
+            raise NeXusError("The scan is already being consolidated")
+        unsaved = [root.nxname for root in self.scan_files
+                   if not root.nxfilename]
+        if unsaved:
+            raise NeXusError("Save these trees before creating the scan: "
+                             + ", ".join(unsaved))
+        if self.scan_builder is None:
+            import tempfile
+            self.scan_builder = NXScanBuilder(
+                tempfile.mkstemp(suffix='.nxs')[1], self.data_path)
+        self.scan_builder.configure(
+            self.data_path, self.scan_path, idx=self.get_slice(),
+            virtual=self.checkbox["virtual"].isChecked())
+        files = [root.nxfilename for root in self.scan_files]
+        self.running = True
+        self.cancelled = False
         try:
-            if Path(self.scan_root.nxfilename).exists():
-                Path(self.scan_root.nxfilename).unlink()
-        except Exception:
-            pass
-        import tempfile
-        with nxload(tempfile.mkstemp(suffix='.nxs')[1], mode='w') as root:
-            root['data'] = self.scan_data
-        self.scan_root = root
+            self.scan_data = self.scan_builder.build(
+                files, callback=self.scan_progress)
+        except NeXusError:
+            raise
+        except Exception as error:
+            raise NeXusError(f"Unable to consolidate the scan: {error}")
+        finally:
+            self.running = False
+            self.scan_progress(None)
+        self.scan_root = self.scan_builder.root
+
+    def scan_progress(self, fraction):
+        """
+        Show the progress of the consolidation on the 'Plot' button.
+
+        Parameters
+        ----------
+        fraction : float or None
+            Fraction of the files that have been read, or None if the
+            consolidation has ended.
+
+        Returns
+        -------
+        bool
+            True if the consolidation has been cancelled.
+        """
+        button = self.pushbutton['Plot']
+        if fraction is None:
+            button.setText('Plot')
+            button.setToolTip('')
+        else:
+            button.setText(f"{int(100 * fraction)}%")
+            button.setToolTip('Cancel the consolidation')
+            self.mainwindow._app.processEvents()
+        return self.cancelled
 
     def plot_scan(self):
         """
@@ -3667,9 +4308,14 @@ class ScanTab(NXTab):
         NeXusError
             If the data cannot be plotted.
         """
-        if self.scan_data is None:
-            self.create_scan_data()
+        if self.running:
+            self.cancelled = True
+            return
         try:
+            if self.scan_data is None:
+                self.create_scan_data()
+            if self.scan_data is None:
+                return
             self.scanview.plot(self.scan_data)
             self.scanview.make_active()
             self.scanview.raise_()
@@ -3688,9 +4334,13 @@ class ScanTab(NXTab):
         NeXusError
             If the data cannot be copied.
         """
-        if self.scan_data is None:
-            self.create_scan_data()
+        if self.running:
+            return
         try:
+            if self.scan_data is None:
+                self.create_scan_data()
+            if self.scan_data is None:
+                return
             self.mainwindow.copied_node = self.mainwindow.copy_node(
                 self.scan_data)
         except NeXusError as error:
@@ -3708,9 +4358,13 @@ class ScanTab(NXTab):
         NeXusError
             If the data cannot be saved.
         """
-        if self.scan_data is None:
-            self.create_scan_data()
+        if self.running:
+            return
         try:
+            if self.scan_data is None:
+                self.create_scan_data()
+            if self.scan_data is None:
+                return
             keep_data(self.scan_data)
         except NeXusError as error:
             report_error("Saving Scan", error)
@@ -3859,6 +4513,111 @@ class ScanTab(NXTab):
         super().close()
 
 
+class TimingDialog(NXPanel):
+
+    def __init__(self, parent=None):
+        """
+        Initialize the dialog to display the time taken to plot data.
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            The parent window of the dialog, by default None
+        """
+        super().__init__('Timing', title='Timing Panel', apply=False,
+                         reset=False, parent=parent)
+        self.tab_class = TimingTab
+        self.plotview_sort = True
+
+
+class TimingTab(NXTab):
+
+    def __init__(self, label, parent=None):
+        """
+        Initialize a tab displaying the plot timings of a plotview.
+
+        Timing is switched on and off by a checkbox. While it is on, the
+        time taken by each stage of a plot update, e.g., reading and
+        smoothing the data, setting the color norm and drawing the
+        canvas, is recorded by the plotview's NXTimings instance. The
+        last, mean and maximum times of each stage over the most recent
+        updates are refreshed every half second while the tab is
+        visible.
+
+        Parameters
+        ----------
+        label : str
+            The label of the tab, i.e., the plotview label.
+        parent : QWidget, optional
+            The parent of the tab
+        """
+        super().__init__(label, parent=parent)
+
+        self.plotview = self.active_plotview
+        self.timings = self.plotview.timings
+
+        self.text_box = NXPlainTextEdit(wrap=False)
+        self.text_box.setReadOnly(True)
+        self.text_box.setMinimumWidth(400)
+        self.set_layout(
+            self.checkboxes(('enable', 'Enable Timing',
+                             self.timings.enabled)),
+            self.text_box,
+            self.action_buttons(('Clear', self.clear_timings),
+                                ('Export', self.export_timings)))
+        self.checkbox['enable'].stateChanged.connect(self.enable_timings)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.update_timings)
+        self.update_timings()
+
+    def enable_timings(self):
+        """Switch the recording of plot timings on or off."""
+        self.timings.enabled = self.checkbox['enable'].isChecked()
+
+    def showEvent(self, event):
+        """Start refreshing the timings when the tab is shown."""
+        self.update_timings()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Stop refreshing the timings when the tab is hidden."""
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def update_timings(self):
+        """Display the current timing statistics in milliseconds."""
+        lines = [f"{'Stage':<10}{'Last':>10}{'Mean':>10}{'Max':>10}"
+                 f"{'Count':>8}"]
+        for name, last, mean, maximum, count in self.timings.summary():
+            lines.append(f"{name:<10}{last*1000:>10.2f}{mean*1000:>10.2f}"
+                         f"{maximum*1000:>10.2f}{count:>8d}")
+        if len(lines) == 1 and not self.timings.enabled:
+            lines.append('Timing is disabled')
+        text = '\n'.join(lines)
+        if text != self.text_box.toPlainText():
+            self.text_box.setPlainText(text)
+
+    def clear_timings(self):
+        """Remove all the recorded timings."""
+        self.timings.clear()
+        self.update_timings()
+
+    def export_timings(self):
+        """Save the timings to a CSV or JSON file."""
+        name = self.plotview.label.replace(' ', '_') + '_timings.csv'
+        fname = getSaveFileName(self, "Choose a Filename", name,
+                                "CSV Files (*.csv);;JSON Files (*.json)")
+        if fname:
+            self.set_default_directory(Path(fname).parent)
+            try:
+                self.timings.export(fname)
+            except Exception as error:
+                report_error("Exporting Timings", error)
+
+
 class ViewDialog(NXPanel):
 
     def __init__(self, parent=None):
@@ -0,0 +1,382 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2026, NeXpy Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file COPYING, distributed with this software.
+# -----------------------------------------------------------------------------
+
+"""
+Maintain a searchable index of the metadata in directories of NeXus files.
+
+The index records the entries of every NeXus file in a set of
+directories, with their titles, start times, sample names and the
+values of selected scalar fields, in a local SQLite database. Files are
+only read when they are added to a directory or modified, so the index
+can be refreshed quickly, and searches never need to open the files::
+
+    from nexpy.gui.index import NXIndex
+
+    index = NXIndex('index.db')
+    index.add_directory('/data/experiment')
+    index.set_fields(['sample/temperature', 'monitor/integral'])
+    index.update()
+    runs = index.search('LaB6', field='sample/temperature',
+                        minimum=100.0, maximum=200.0)
+"""
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import numpy as np
+from nexusformat.nexus import NeXusError, NXFile
+
+nexus_suffixes = ('.nxs', '.nx5', '.h5', '.hdf5', '.hdf', '.cxi', '.nxspe')
+
+schema = """
+CREATE TABLE IF NOT EXISTS directories (directory TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS fields (field TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS files (
+    filename TEXT PRIMARY KEY, directory TEXT, mtime REAL, size INTEGER);
+CREATE TABLE IF NOT EXISTS entries (
+    filename TEXT, entry TEXT, title TEXT, start_time TEXT, sample TEXT,
+    PRIMARY KEY (filename, entry));
+CREATE TABLE IF NOT EXISTS scalars (
+    filename TEXT, entry TEXT, field TEXT, value REAL,
+    PRIMARY KEY (filename, entry, field));
+CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+CREATE INDEX IF NOT EXISTS entries_start_time ON entries (start_time);
+CREATE INDEX IF NOT EXISTS scalars_value ON scalars (field, value);
+"""
+
+
+def read_text(group, path):
+    """Return the string stored at a path in an HDF5 group, if any."""
+    try:
+        value = group[path][()]
+    except Exception:
+        return None
+    if isinstance(value, np.ndarray):
+        if value.size == 0:
+            return None
+        value = value.ravel()[0]
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    return str(value).strip()
+
+
+def read_scalar(group, path):
+    """Return the numeric scalar stored at a path in an HDF5 group."""
+    try:
+        value = np.asarray(group[path][()])
+    except Exception:
+        return None
+    if value.dtype.kind not in 'biuf' or value.size == 0:
+        return None
+    return float(value.ravel()[0])
+
+
+def read_metadata(filename, fields=()):
+    """
+    Return the metadata of each entry in a NeXus file.
+
+    The file is opened directly with h5py, without loading the NeXus
+    tree.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NeXus file.
+    fields : list of str, optional
+        Paths to scalar fields, relative to each entry, whose values
+        are recorded.
+
+    Returns
+    -------
+    list of tuples
+        The name, title, start time and sample name of each entry, and
+        a dictionary of the values of the scalar fields that exist.
+    """
+    entries = []
+    with NXFile(filename, 'r') as f:
+        root = f['/']
+        for name in root:
+            group = root[name]
+            nxclass = group.attrs.get('NX_class', b'')
+            if isinstance(nxclass, bytes):
+                nxclass = nxclass.decode('utf-8', errors='replace')
+            if nxclass not in ('NXentry', 'NXsubentry'):
+                continue
+            sample = (read_text(group, 'sample/name') or
+                      read_text(group, 'sample/chemical_formula'))
+            values = {}
+            for field in fields:
+                value = read_scalar(group, field)
+                if value is not None:
+                    values[field] = value
+            entries.append((name, read_text(group, 'title'),
+                            read_text(group, 'start_time'), sample, values))
+    return entries
+
+
+class NXIndex:
+    """
+    Index of the metadata stored in directories of NeXus files.
+
+    The index is stored in a SQLite database, which is opened for each
+    operation, so that the index can be updated in a background thread
+    while it is searched in another.
+
+    Parameters
+    ----------
+    database : str
+        Path to the SQLite database, which is created if necessary.
+    """
+
+    def __init__(self, database):
+        self.database = str(database)
+        with self.connect() as db:
+            db.executescript(schema)
+
+    def __repr__(self):
+        return f"NXIndex('{self.database}')"
+
+    def __len__(self):
+        with self.connect() as db:
+            return db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @contextmanager
+    def connect(self):
+        """Yield a connection to the database within a transaction."""
+        with closing(sqlite3.connect(self.database, timeout=30)) as db:
+            with db:
+                yield db
+
+    @property
+    def directories(self):
+        """The list of indexed directories."""
+        with self.connect() as db:
+            return [row[0] for row in db.execute(
+                "SELECT directory FROM directories ORDER BY directory")]
+
+    def add_directory(self, directory):
+        """Add a directory to be indexed by the next update."""
+        directory = str(Path(directory).resolve())
+        if not Path(directory).is_dir():
+            raise NeXusError(f"'{directory}' is not a directory")
+        with self.connect() as db:
+            db.execute("INSERT OR IGNORE INTO directories VALUES (?)",
+                       (directory,))
+
+    def remove_directory(self, directory):
+        """Remove a directory and the metadata of its files."""
+        directory = str(Path(directory).resolve())
+        with self.connect() as db:
+            db.execute("DELETE FROM directories WHERE directory = ?",
+                       (directory,))
+            filenames = [(row[0],) for row in db.execute(
+                "SELECT filename FROM files WHERE directory = ?",
+                (directory,))]
+            self._delete(db, filenames)
+
+    @property
+    def fields(self):
+        """The list of scalar fields recorded for each entry."""
+        with self.connect() as db:
+            return [row[0] for row in db.execute(
+                "SELECT field FROM fields ORDER BY field")]
+
+    def set_fields(self, fields):
+        """
+        Define the scalar fields recorded for each entry.
+
+        If new fields are added, all the files are read again by the
+        next update.
+
+        Parameters
+        ----------
+        fields : list of str
+            Paths to the scalar fields, relative to each entry, e.g.,
+            'sample/temperature'.
+        """
+        fields = [f.strip().strip('/') for f in fields if f.strip()]
+        with self.connect() as db:
+            current = {row[0] for row in db.execute(
+                "SELECT field FROM fields")}
+            db.execute("DELETE FROM fields")
+            db.executemany("INSERT OR IGNORE INTO fields VALUES (?)",
+                           [(f,) for f in fields])
+            db.execute("DELETE FROM scalars WHERE field NOT IN "
+                       f"({','.join('?' * len(fields))})", fields)
+            if set(fields) - current:
+                db.execute("UPDATE files SET mtime = NULL")
+
+    def scan(self):
+        """
+        Return the NeXus files that have been added or modified.
+
+        Files that have been deleted are removed from the index.
+
+        Returns
+        -------
+        list of tuples
+            The path, directory, modification time and size of each
+            file that needs to be read.
+        """
+        changed = []
+        with self.connect() as db:
+            for directory in self.directories:
+                stored = dict(db.execute(
+                    "SELECT filename, mtime FROM files WHERE directory = ?",
+                    (directory,)))
+                try:
+                    paths = [p for p in Path(directory).iterdir()
+                             if p.suffix.lower() in nexus_suffixes
+                             and p.is_file()]
+                except OSError:
+                    paths = []
+                found = set()
+                for path in paths:
+                    filename = str(path)
+                    found.add(filename)
+                    stat = path.stat()
+                    if stored.get(filename) != stat.st_mtime:
+                        changed.append((filename, directory, stat.st_mtime,
+                                        stat.st_size))
+                self._delete(db, [(f,) for f in stored if f not in found])
+        return changed
+
+    def update(self, callback=None, batch=100):
+        """
+        Read the metadata of files that have been added or modified.
+
+        Parameters
+        ----------
+        callback : function, optional
+            Function called after each file is read with the fraction
+            of the files that have been read. If it returns True, the
+            update is abandoned, but the files that have already been
+            read are retained.
+        batch : int, optional
+            Number of files read before the results are committed to
+            the database. The default is 100.
+
+        Returns
+        -------
+        int
+            The number of files that were read.
+        """
+        fields = self.fields
+        changed = self.scan()
+        rows = []
+        for i, (filename, directory, mtime, size) in enumerate(changed):
+            try:
+                entries = read_metadata(filename, fields)
+            except Exception:
+                entries = []
+            rows.append((filename, directory, mtime, size, entries))
+            if len(rows) >= batch or i == len(changed) - 1:
+                self._store(rows)
+                rows = []
+            if callback and callback((i+1) / len(changed)):
+                self._store(rows)
+                return i + 1
+        return len(changed)
+
+    def _store(self, rows):
+        with self.connect() as db:
+            self._delete(db, [(row[0],) for row in rows])
+            for filename, directory, mtime, size, entries in rows:
+                db.execute("INSERT INTO files VALUES (?, ?, ?, ?)",
+                           (filename, directory, mtime, size))
+                for entry, title, start_time, sample, values in entries:
+                    db.execute("INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                               (filename, entry, title, start_time, sample))
+                    db.executemany(
+                        "INSERT INTO scalars VALUES (?, ?, ?, ?)",
+                        [(filename, entry, field, value)
+                         for field, value in values.items()])
+
+    @staticmethod
+    def _delete(db, filenames):
+        for table in ('files', 'entries', 'scalars'):
+            db.executemany(f"DELETE FROM {table} WHERE filename = ?",
+                           filenames)
+
+    def search(self, text=None, field=None, minimum=None, maximum=None,
+               after=None, before=None, directory=None, limit=None):
+        """
+        Return the entries that match the search criteria.
+
+        Parameters
+        ----------
+        text : str, optional
+            Text contained in the file name, title or sample name. The
+            comparison is case-insensitive, and wildcard characters
+            are matched literally.
+        field : str, optional
+            Scalar field whose value must lie within the given range.
+        minimum, maximum : float, optional
+            Limits of the scalar field values.
+        after, before : str, optional
+            Limits of the start times in ISO 8601 format.
+        directory : str, optional
+            Directory containing the files.
+        limit : int, optional
+            Maximum number of entries returned.
+
+        Returns
+        -------
+        list of dict
+            The file name, entry name, title, start time and sample
+            name of each matching entry, and a dictionary of the values
+            of its scalar fields, sorted by file name and entry.
+        """
+        conditions, parameters = [], []
+        if text:
+            text = (text.replace('\\', '\\\\').replace('%', '\\%')
+                    .replace('_', '\\_'))
+            conditions.append("(e.filename LIKE ? ESCAPE '\\' "
+                              "OR e.title LIKE ? ESCAPE '\\' "
+                              "OR e.sample LIKE ? ESCAPE '\\')")
+            parameters.extend([f"%{text}%"] * 3)
+        if field:
+            condition = ("EXISTS (SELECT 1 FROM scalars s WHERE "
+                         "s.filename = e.filename AND s.entry = e.entry "
+                         "AND s.field = ?")
+            parameters.append(field)
+            if minimum is not None:
+                condition += " AND s.value >= ?"
+                parameters.append(minimum)
+            if maximum is not None:
+                condition += " AND s.value <= ?"
+                parameters.append(maximum)
+            conditions.append(condition + ")")
+        if after:
+            conditions.append("e.start_time >= ?")
+            parameters.append(after)
+        if before:
+            conditions.append("e.start_time <= ?")
+            parameters.append(before)
+        if directory:
+            conditions.append("f.directory = ?")
+            parameters.append(str(Path(directory).resolve()))
+        query = ("SELECT e.filename, e.entry, e.title, e.start_time, "
+                 "e.sample FROM entries e JOIN files f "
+                 "ON e.filename = f.filename")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY e.filename, e.entry"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        keys = ('filename', 'entry', 'title', 'start_time', 'sample')
+        with self.connect() as db:
+            results = {row[:2]: dict(zip(keys, row), values={})
+                       for row in db.execute(query, parameters)}
+            values = db.execute(
+                "SELECT v.filename, v.entry, v.field, v.value FROM scalars v "
+                f"JOIN ({query}) e ON v.filename = e.filename "
+                "AND v.entry = e.entry", parameters)
+            for filename, entry, field, value in values:
+                results[(filename, entry)]['values'][field] = value
+        return list(results.values())
@@ -32,8 +32,8 @@ from .dialogs import (AttributeDialog, CustomizeDialog, DirectoryDialog,
                       LockDialog, LogDialog, ManageBackupsDialog,
                       ManagePluginsDialog, NewDialog, PasteDialog, PlotDialog,
                       PlotScalarDialog, ProjectionDialog, RenameDialog,
-                      ScanDialog, SettingsDialog, SignalDialog, UnlockDialog,
-                      ValidateDialog, ViewDialog)
+                      ScanDialog, SearchDialog, SettingsDialog, SignalDialog,
+                      UnlockDialog, ValidateDialog, ViewDialog)
 from .plotview import NXPlotView
 from .pyqt import QtCore, QtGui, QtWidgets, getOpenFileName, getSaveFileName
 from .scripteditor import NXScriptWindow
@@ -279,6 +279,10 @@ class MainWindow(QtWidgets.QMainWindow):
             "Open Directory...", self, triggered=self.open_directory)
         self.add_menu_action(self.file_menu, self.opendirectory_action)
 
+        self.searchfiles_action = QtWidgets.QAction(
+            "Search Files...", self, triggered=self.search_files)
+        self.add_menu_action(self.file_menu, self.searchfiles_action)
+
         self.savefile_action = QtWidgets.QAction(
             "&Save as...", self, shortcut=QtGui.QKeySequence.Save,
             triggered=self.save_file)
@@ -488,6 +492,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.multiplot_lines_action = QtWidgets.QAction(
             "Plot All Signals as Lines", self, triggered=self.multiplot_lines)
 
+        self.waterfall_action = QtWidgets.QAction(
+            "Plot Waterfall", self, triggered=self.plot_waterfall)
+
         self.plot_weighted_data_action = QtWidgets.QAction(
             "Plot Weighted Data", self, triggered=self.plot_weighted_data)
         self.add_menu_action(self.data_menu, self.plot_weighted_data_action)
@@ -1066,6 +1073,14 @@ class MainWindow(QtWidgets.QMainWindow):
         except NeXusError as error:
             report_error("Opening Directory", error)
 
+    def search_files(self):
+        """Search the metadata of indexed directories of NeXus files."""
+        try:
+            dialog = SearchDialog(parent=self)
+            dialog.show()
+        except NeXusError as error:
+            report_error("Searching Files", error)
+
     def hover_recent_menu(self, action):
         """Show the tooltip for a recent file menu action."""
         position = QtGui.QCursor.pos()
@@ -1615,25 +1630,29 @@ class MainWindow(QtWidgets.QMainWindow):
                     raise NeXusError(
                         "Group must have the 'auxiliary_signals' attribute.")
                 self.treeview.status_message(node)
-                signals = [node.nxsignal]
-                signals.extend([node[signal] for signal
-                                in node.attrs['auxiliary_signals']
-                                if signal != node.nxsignal.nxname])
-                colors = get_colors(len(signals))
-                for i, signal in enumerate(signals):
-                    if i == 0:
-                        signal.plot(marker='None', linestyle='-',
-                                    color=colors[i])
-                    else:
-                        signal.oplot(marker='None', linestyle='-',
-                                     color=colors[i])
+                self.plotview.multiplot(node)
                 self.plotview.ax.set_title(node.nxroot.nxname + node.nxpath)
-                self.plotview.otab.home()
                 self.plotview.legend(signal=True)
                 self.plotview.make_active()
         except NeXusError as error:
             report_error("Plotting Data", error)
 
+    def plot_waterfall(self):
+        """Plot each row of the selected 2D data as an offset line"""
+        try:
+            node = self.treeview.get_node()
+            if node is not None:
+                if not node.exists():
+                    raise NeXusError(f"{node.nxfullpath} does not exist")
+                data = node.plottable_data
+                if data is None:
+                    raise NeXusError("No plottable data found.")
+                self.treeview.status_message(node)
+                self.plotview.waterfall(data)
+                self.plotview.make_active()
+        except NeXusError as error:
+            report_error("Plotting Waterfall", error)
+
     def plot_weighted_data(self):
         """Plot the selected data with weights."""
         try:
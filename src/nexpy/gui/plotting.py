@@ -0,0 +1,1003 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2026, NeXpy Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file COPYING, distributed with this software.
+# -----------------------------------------------------------------------------
+
+"""
+Plotting functions and classes that do not depend on Qt.
+
+These define how NeXus data are plotted, i.e., the axis values and
+limits, color maps and norms, skew transforms, aspect ratios, signal
+statistics and image smoothing. They are shared by the plotting windows
+in ``nexpy.gui.plotview`` and the headless renderer in
+``nexpy.gui.render``, so that both draw figures in the same way.
+"""
+import copy
+import os
+from functools import lru_cache
+from threading import RLock
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.colors import LogNorm, Normalize, SymLogNorm
+from matplotlib.ticker import AutoLocator, LogLocator, ScalarFormatter
+from matplotlib.transforms import Affine2D
+from mpl_toolkits.axisartist.grid_finder import MaxNLocator
+from mpl_toolkits.axisartist.grid_helper_curvelinear import \
+    GridHelperCurveLinear
+from nexusformat.nexus import NeXusError
+from packaging.version import Version
+
+try:
+    from matplotlib.ticker import LogFormatterSciNotation as LogFormatter
+except ImportError:
+    from matplotlib.ticker import LogFormatter
+
+
+def centers(axis, dimlen):
+    """
+    Return the centers of the axis bins.
+
+    This works regardless if the axis contains bin boundaries or
+    centers.
+
+    Parameters
+    ----------
+    dimlen : int
+        Size of the signal dimension. If this one more than the axis
+        size, it is assumed the axis contains bin boundaries.
+    """
+    ax = axis.astype(np.float64)
+    if ax.shape[0] == dimlen+1:
+        return (ax[:-1] + ax[1:])/2
+    else:
+        assert ax.shape[0] == dimlen
+        return ax
+
+
+def boundaries(axis, dimlen):
+    """
+    Return the boundaries of the axis bins.
+
+    This works regardless if the axis contains bin boundaries or
+    centers.
+
+    Parameters
+    ----------
+    dimlen : int
+        Size of the signal dimension. If this one more than the axis
+        size, it is assumed the axis contains bin boundaries.
+    """
+    ax = axis.astype(np.float64)
+    if ax.shape[0] == 1:
+        return ax
+    elif ax.shape[0] == dimlen:
+        start = ax[0] - (ax[1] - ax[0])/2
+        end = ax[-1] + (ax[-1] - ax[-2])/2
+        return np.concatenate((np.atleast_1d(start),
+                               (ax[:-1] + ax[1:])/2,
+                               np.atleast_1d(end)))
+    else:
+        assert ax.shape[0] == dimlen + 1
+        return ax
+
+
+def parula_map():
+    """
+    Generate a color map similar to Matlab's Parula for use in NeXpy.
+
+    The color map data are from the 'fake_parula' function provided by
+    Ander Biguri, "Perceptually uniform colormaps"
+    MATLAB Central File Exchange (2020).
+    """
+    from matplotlib.colors import LinearSegmentedColormap
+    cm_data = [[0.2081, 0.1663, 0.5292],
+               [0.2116238095, 0.1897809524, 0.5776761905],
+               [0.212252381, 0.2137714286, 0.6269714286],
+               [0.2081, 0.2386, 0.6770857143],
+               [0.1959047619, 0.2644571429, 0.7279],
+               [0.1707285714, 0.2919380952, 0.779247619],
+               [0.1252714286, 0.3242428571, 0.8302714286],
+               [0.0591333333, 0.3598333333, 0.8683333333],
+               [0.0116952381, 0.3875095238, 0.8819571429],
+               [0.0059571429, 0.4086142857, 0.8828428571],
+               [0.0165142857, 0.4266, 0.8786333333],
+               [0.032852381, 0.4430428571, 0.8719571429],
+               [0.0498142857, 0.4585714286, 0.8640571429],
+               [0.0629333333, 0.4736904762, 0.8554380952],
+               [0.0722666667, 0.4886666667,  0.8467],
+               [0.0779428571, 0.5039857143, 0.8383714286],
+               [0.079347619, 0.5200238095, 0.8311809524],
+               [0.0749428571, 0.5375428571, 0.8262714286],
+               [0.0640571429, 0.5569857143, 0.8239571429],
+               [0.0487714286, 0.5772238095, 0.8228285714],
+               [0.0343428571, 0.5965809524, 0.819852381],
+               [0.0265, 0.6137, 0.8135],
+               [0.0238904762, 0.6286619048, 0.8037619048],
+               [0.0230904762, 0.6417857143, 0.7912666667],
+               [0.0227714286, 0.6534857143, 0.7767571429],
+               [0.0266619048, 0.6641952381, 0.7607190476],
+               [0.0383714286, 0.6742714286, 0.743552381],
+               [0.0589714286, 0.6837571429, 0.7253857143],
+               [0.0843, 0.6928333333, 0.7061666667],
+               [0.1132952381, 0.7015, 0.6858571429],
+               [0.1452714286, 0.7097571429, 0.6646285714],
+               [0.1801333333, 0.7176571429,  0.6424333333],
+               [0.2178285714, 0.7250428571, 0.6192619048],
+               [0.2586428571, 0.7317142857, 0.5954285714],
+               [0.3021714286, 0.7376047619, 0.5711857143],
+               [0.3481666667, 0.7424333333, 0.5472666667],
+               [0.3952571429, 0.7459, 0.5244428571],
+               [0.4420095238, 0.7480809524,  0.5033142857],
+               [0.4871238095, 0.7490619048, 0.4839761905],
+               [0.5300285714, 0.7491142857, 0.4661142857],
+               [0.5708571429, 0.7485190476, 0.4493904762],
+               [0.609852381, 0.7473142857, 0.4336857143],
+               [0.6473, 0.7456, 0.4188],
+               [0.6834190476, 0.7434761905, 0.4044333333],
+               [0.7184095238, 0.7411333333, 0.3904761905],
+               [0.7524857143, 0.7384, 0.3768142857],
+               [0.7858428571, 0.7355666667,  0.3632714286],
+               [0.8185047619, 0.7327333333, 0.3497904762],
+               [0.8506571429, 0.7299, 0.3360285714],
+               [0.8824333333, 0.7274333333, 0.3217],
+               [0.9139333333, 0.7257857143, 0.3062761905],
+               [0.9449571429, 0.7261142857,  0.2886428571],
+               [0.9738952381, 0.7313952381, 0.266647619],
+               [0.9937714286, 0.7454571429, 0.240347619],
+               [0.9990428571, 0.7653142857,  0.2164142857],
+               [0.9955333333, 0.7860571429, 0.196652381],
+               [0.988, 0.8066, 0.1793666667],
+               [0.9788571429, 0.8271428571, 0.1633142857],
+               [0.9697, 0.8481380952, 0.147452381],
+               [0.9625857143, 0.8705142857, 0.1309],
+               [0.9588714286, 0.8949, 0.1132428571],
+               [0.9598238095, 0.9218333333,  0.0948380952],
+               [0.9661, 0.9514428571, 0.0755333333],
+               [0.9763, 0.9831, 0.0538]]
+    return LinearSegmentedColormap.from_list('parula', cm_data)
+
+
+def xtec_map():
+    """
+    Generate a color map for use with the XTEC package.
+
+    The color map data is the same as the 'tab10' map, but with the
+    lowest value set to 'white'.
+    """
+    from matplotlib import colormaps
+    from matplotlib.colors import ListedColormap
+    cm_data = list(colormaps['tab10'].colors)
+    cm_data.insert(0, [1.0, 1.0, 1.0])
+    return ListedColormap(cm_data, name='xtec')
+
+
+def divgray_map():
+    """New divergent color map copied from the registered 'gray' map."""
+    if Version(mpl.__version__) >= Version('3.5.0'):
+        from matplotlib import colormaps
+        cm = copy.copy(colormaps['gray'])
+    else:
+        from matplotlib.cm import get_cmap
+        cm = copy.copy(get_cmap('gray'))
+    cm.name = 'divgray'
+    return cm
+
+
+cmaps = ['viridis', 'inferno', 'magma', 'plasma',  # perceptually uniform
+         'cividis', 'parula',
+         'spring', 'summer', 'autumn', 'winter', 'cool', 'hot',  # sequential
+         'bone', 'copper', 'gray', 'pink',
+         'turbo', 'jet', 'spectral', 'rainbow', 'hsv',  # miscellaneous
+         'tab10', 'tab20', 'xtec',  # qualitative
+         'seismic', 'coolwarm', 'twilight', 'divgray',  # diverging
+         'RdBu', 'RdYlBu', 'RdYlGn']
+
+if Version(mpl.__version__) >= Version('3.5.0'):
+    mpl.colormaps.register(parula_map())
+    mpl.colormaps.register(xtec_map())
+    mpl.colormaps.register(divgray_map())
+    cmaps = [cm for cm in cmaps if cm in mpl.colormaps]
+else:
+    from matplotlib.cm import cmap_d, register_cmap
+    register_cmap('parula', parula_map())
+    register_cmap('xtec', xtec_map())
+    register_cmap('divgray', divgray_map())
+    cmaps = [cm for cm in cmaps if cm in cmap_d]
+
+if 'viridis' in cmaps:
+    default_cmap = 'viridis'
+else:
+    default_cmap = 'jet'
+divergent_cmaps = ['seismic', 'coolwarm', 'twilight', 'divgray',
+                   'RdBu', 'RdYlBu', 'RdYlGn',
+                   'PiYG', 'PRGn', 'BrBG', 'PuOr', 'RdGy', 'Spectral', 'bwr']
+qualitative_cmaps = ['tab10', 'tab20', 'xtec']
+interpolations = [
+    'nearest', 'convolve', 'bilinear', 'bicubic', 'spline16', 'spline36',
+    'hanning', 'hamming', 'hermite', 'kaiser', 'quadric', 'catrom',
+    'gaussian', 'bessel', 'mitchell', 'sinc', 'lanczos']
+default_interpolation = 'nearest'
+
+
+def data_norm(lo, hi, log=False, symmetric=False, linthresh=None,
+              linscale=None):
+    """Return the norm, tick locator, and formatter for a signal.
+
+    Parameters
+    ----------
+    lo, hi : float
+        Lower and upper limits of the signal.
+    log : bool, optional
+        True if the signal is plotted on a log scale.
+    symmetric : bool, optional
+        True if the limits are symmetric about zero. On a log scale,
+        this uses a SymLogNorm.
+    linthresh, linscale : float, optional
+        Parameters of the SymLogNorm. By default, these are set to the
+        upper limit divided by 10 and 0.1, respectively.
+
+    Returns
+    -------
+    tuple
+        Matplotlib norm, tick locator, and tick formatter.
+    """
+    if log:
+        if symmetric:
+            if not linthresh:
+                linthresh = hi / 10.0
+            if not linscale:
+                linscale = 0.1
+            return (SymLogNorm(linthresh, linscale=linscale, vmin=lo, vmax=hi),
+                    AutoLocator(), ScalarFormatter())
+        else:
+            return LogNorm(lo, hi), LogLocator(), LogFormatter()
+    else:
+        return Normalize(lo, hi), AutoLocator(), ScalarFormatter()
+
+
+def skew_transform(angle):
+    """Return the affine transform that skews the y-axis by an angle.
+
+    Parameters
+    ----------
+    angle : float
+        Angle between the x and y axes in degrees.
+    """
+    angle = np.radians(angle)
+    return Affine2D.from_values(1.0, 0.0, np.cos(angle), np.sin(angle),
+                                0.0, 0.0)
+
+
+def colormap(name, bad=None):
+    """
+    Return a copy of a registered color map.
+
+    Parameters
+    ----------
+    name : str
+        Name of the color map.
+    bad : str, optional
+        Color of NaNs and masked values.
+    """
+    if Version(mpl.__version__) >= Version('3.5.0'):
+        cm = copy.copy(mpl.colormaps[name])
+    else:
+        from matplotlib.cm import get_cmap
+        cm = copy.copy(get_cmap(name))
+    if bad is not None:
+        cm.set_bad(bad)
+    return cm
+
+
+def skew_coordinates(x, y, angle):
+    """
+    Return the x and y values transformed by a skew angle.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Coordinates in the frame of the x and y axes.
+    angle : float
+        Angle between the x and y axes in degrees. If None, the
+        values are returned unchanged.
+    """
+    if x is None or y is None or angle is None:
+        return x, y
+    else:
+        x, y = np.asarray(x), np.asarray(y)
+        angle = np.radians(angle)
+        return 1.*x+np.cos(angle)*y, np.sin(angle)*y
+
+
+def unskew_coordinates(x, y, angle):
+    """Return the inverse of the transform in 'skew_coordinates'."""
+    if x is None or y is None or angle is None:
+        return x, y
+    else:
+        x, y = np.asarray(x), np.asarray(y)
+        angle = np.radians(angle)
+        return 1.*x-y/np.tan(angle), y/np.sin(angle)
+
+
+def skew_grid_helper(transform, inverse_transform):
+    """
+    Return the grid helper used to draw skewed axes.
+
+    Parameters
+    ----------
+    transform, inverse_transform : function
+        Functions of the x and y values that apply and invert the
+        skew transform.
+    """
+    locator = MaxNLocator(nbins=9, steps=[1, 2, 2.5, 5, 10])
+    return GridHelperCurveLinear((transform, inverse_transform),
+                                 grid_locator1=locator,
+                                 grid_locator2=locator)
+
+
+def image_extent(xaxis, yaxis):
+    """
+    Return the extent of an image on a regular grid.
+
+    Parameters
+    ----------
+    xaxis, yaxis : NXPlotAxis
+        The plotted x and y axes.
+
+    Returns
+    -------
+    tuple of floats
+        The left, right, bottom and top edges of the image, as required
+        by the Matplotlib 'imshow' function.
+    """
+    if xaxis.reversed:
+        left, right = xaxis.max_data, xaxis.min_data
+    else:
+        left, right = xaxis.min_data, xaxis.max_data
+    if yaxis.reversed:
+        bottom, top = yaxis.max_data, yaxis.min_data
+    else:
+        bottom, top = yaxis.min_data, yaxis.max_data
+    return left, right, bottom, top
+
+
+def image_limits(xaxis, yaxis, skew=None):
+    """
+    Return the limits of the plotting axes of an image.
+
+    Parameters
+    ----------
+    xaxis, yaxis : NXPlotAxis
+        The plotted x and y axes, whose limits have been set.
+    skew : float, optional
+        Angle between the x and y axes in degrees if the axes are
+        skewed.
+
+    Returns
+    -------
+    tuple of floats
+        The lower and upper x limits and the lower and upper y limits,
+        with the skew transform applied.
+    """
+    if skew is None:
+        return xaxis.lo, xaxis.hi, yaxis.lo, yaxis.hi
+    elif skew < 90.0:
+        xlo, ylo = skew_coordinates(xaxis.lo, yaxis.lo, skew)
+        xhi, yhi = skew_coordinates(xaxis.hi, yaxis.hi, skew)
+    else:
+        xlo, yhi = skew_coordinates(xaxis.lo, yaxis.hi, skew)
+        xhi, ylo = skew_coordinates(xaxis.hi, yaxis.lo, skew)
+    return xlo, xhi, ylo, yhi
+
+
+def scaled_aspect(axes):
+    """
+    Return the aspect ratio defined by the axis scaling factors.
+
+    Parameters
+    ----------
+    axes : list of NXfield
+        The plotted axes. The last two are the y and x axes.
+
+    Returns
+    -------
+    float or str
+        The ratio of the y and x scaling factors, or 'equal' if they
+        are not defined.
+    """
+    try:
+        if ('scaling_factor' in axes[-1].attrs and
+                'scaling_factor' in axes[-2].attrs):
+            _xscale = axes[-1].attrs['scaling_factor']
+            _yscale = axes[-2].attrs['scaling_factor']
+            return float(_yscale / _xscale)
+        elif 'scaling_factor' in axes[-1].attrs:
+            return 1.0 / axes[-1].attrs['scaling_factor']
+        elif 'scaling_factor' in axes[-2].attrs:
+            return axes[-2].attrs['scaling_factor']
+        else:
+            return 'equal'
+    except Exception:
+        return 'equal'
+
+
+@lru_cache(maxsize=32)
+def gaussian_kernel(sigma, truncate=4.0):
+    """
+    Return a normalized one-dimensional Gaussian kernel.
+
+    Kernels are cached, so they are only computed once for each value
+    of the standard deviation.
+
+    Parameters
+    ----------
+    sigma : float
+        Standard deviation of the Gaussian in pixels.
+    truncate : float, optional
+        Half-width of the kernel in units of the standard deviation.
+        The default is 4.
+
+    Returns
+    -------
+    ndarray
+        Read-only kernel with an odd number of elements.
+    """
+    radius = max(int(truncate * float(sigma) + 0.5), 1)
+    x = np.arange(-radius, radius+1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (x / float(sigma))**2)
+    kernel /= kernel.sum()
+    kernel.setflags(write=False)
+    return kernel
+
+
+def smooth_image(image, sigma, method=None):
+    """
+    Smooth a 2D image by convolution with a Gaussian.
+
+    The Gaussian is applied as two one-dimensional passes, either by
+    direct convolution or, for wide kernels, by FFT convolution. NaNs,
+    infinities and masked pixels are excluded using normalized
+    convolution, i.e., the smoothed values are divided by the smoothed
+    weights of the valid pixels, so that they are replaced by a weighted
+    average of their neighbors. The same normalization prevents the
+    edges of the image from being darkened.
+
+    Parameters
+    ----------
+    image : ndarray
+        Two-dimensional array to be smoothed.
+    sigma : float
+        Standard deviation of the Gaussian in pixels.
+    method : str, optional
+        Either 'direct' or 'fft'. By default, FFT convolution is used if
+        the kernel has more than 64 elements.
+
+    Returns
+    -------
+    ndarray
+        Smoothed image. Pixels that are too far from any valid pixels
+        are set to NaN.
+    """
+    from scipy.ndimage import correlate1d
+    from scipy.signal import fftconvolve
+    if sigma is None or float(sigma) <= 0.0:
+        return image
+    if np.ndim(image) != 2:
+        raise NeXusError("Only two-dimensional images can be smoothed")
+    kernel = gaussian_kernel(float(sigma))
+    if method is None:
+        method = 'fft' if kernel.size > 64 else 'direct'
+    elif method not in ('direct', 'fft'):
+        raise NeXusError(f"Invalid smoothing method '{method}'")
+    if np.ma.isMaskedArray(image):
+        values = image.astype(np.float64).filled(np.nan)
+    elif np.issubdtype(image.dtype, np.floating):
+        values = np.asarray(image)
+    else:
+        values = np.asarray(image, dtype=np.float64)
+
+    def convolve(array, axes=(0, 1)):
+        for axis in axes:
+            if method == 'fft':
+                shape = [1, 1]
+                shape[axis] = kernel.size
+                array = fftconvolve(array, kernel.reshape(shape),
+                                    mode='same', axes=axis)
+            else:
+                array = correlate1d(array, kernel, axis=axis,
+                                    mode='constant', cval=0.0)
+        return array
+
+    valid = np.isfinite(values)
+    if valid.all():
+        smoothed = convolve(values)
+        weights = np.outer(correlate1d(np.ones(values.shape[0]), kernel,
+                                       mode='constant'),
+                           correlate1d(np.ones(values.shape[1]), kernel,
+                                       mode='constant'))
+    else:
+        smoothed = convolve(np.where(valid, values, 0.0))
+        weights = convolve(valid.astype(values.dtype))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        smoothed = smoothed / weights
+    smoothed[weights < 1e-6] = np.nan
+    return smoothed
+
+
+file_locks = {}
+file_locks_lock = RLock()
+
+
+def file_lock(node):
+    """
+    Return the lock shared by all threads that read a NeXus file.
+
+    Opening and closing NeXus files, and reading HDF5 datasets, are not
+    thread-safe, so every background read of a file, e.g., by slice
+    prefetching, projections or the calculation of global statistics,
+    must be made while holding the same lock. Locks are keyed by the
+    absolute path of the file containing the node, so separate trees
+    loaded from the same file share it. Nodes that are not stored in a
+    file share a single lock.
+
+    Parameters
+    ----------
+    node : NXobject
+        NeXus object to be read.
+
+    Returns
+    -------
+    threading.RLock
+        Reentrant lock for the file containing the node.
+    """
+    filename = node.nxfilename
+    if filename is not None:
+        filename = os.path.realpath(filename)
+    with file_locks_lock:
+        if filename not in file_locks:
+            file_locks[filename] = RLock()
+        return file_locks[filename]
+
+
+class NXStatistics:
+    """
+    Summary statistics of an array of plotted values.
+
+    The minimum and maximum finite values and the minimum positive
+    value are computed when the object is created, using a single mask
+    of the finite values. A coarse histogram of the finite values, which
+    is used to locate percentiles, is computed with them if requested,
+    or otherwise when it is first needed. All results are cached, so
+    the statistics of an array that is plotted repeatedly are only
+    computed once. The statistics of fields that are too large to be
+    loaded into memory are returned by the 'from_field' class method.
+
+    Parameters
+    ----------
+    data : ndarray
+        Array of values. Masked values, NaNs and infinities are ignored.
+        If None, the statistics are undefined until they are set by
+        'from_field'.
+    bins : int, optional
+        Number of bins in the coarse histogram. The default is 1024.
+    histogram : bool, optional
+        If True, the histogram is computed immediately. The default is
+        False.
+
+    Attributes
+    ----------
+    data : ndarray
+        The original array of values, or None if it is not stored.
+    count : int
+        Number of finite values.
+    min, max : float
+        Minimum and maximum finite values, or None if there are none.
+    minpos : float
+        Minimum positive value, or None if there are none.
+    """
+
+    def __init__(self, data, bins=1024, histogram=False):
+        self.data = data
+        self.bins = bins
+        self._histogram = None
+        self._percentiles = {}
+        self._finite_values = None
+        values = self.finite_values()
+        self.count = values.size
+        if self.count == 0:
+            self.min = self.max = self.minpos = None
+        else:
+            self.min = float(np.min(values))
+            self.max = float(np.max(values))
+            if self.min > 0.0:
+                self.minpos = self.min
+            elif self.max <= 0.0:
+                self.minpos = None
+            else:
+                self.minpos = float(np.min(values[values > 0.0]))
+            if histogram:
+                self._histogram = self._compute_histogram(values)
+
+    def __repr__(self):
+        return (f'NXStatistics(count={self.count}, min={self.min}, '
+                f'max={self.max})')
+
+    @classmethod
+    def from_field(cls, field, bins=1024, blocksize=64, callback=None,
+                   lock=None):
+        """
+        Return the statistics of all the values in a field.
+
+        The field is read in blocks of rows along its first dimension,
+        aligned with its HDF5 chunks if possible, so that the whole
+        field never needs to be loaded into memory. The minimum,
+        maximum and minimum positive values are accumulated in a first
+        pass, and the histogram of the finite values in a second pass.
+        Since the values are not retained, percentiles are interpolated
+        within the histogram bins.
+
+        Parameters
+        ----------
+        field : NXfield
+            Field containing the values, which may be stored in a file.
+        bins : int, optional
+            Number of bins in the histogram. The default is 1024.
+        blocksize : float, optional
+            Approximate size of each block in MB. The default is 64.
+        callback : function, optional
+            Function called after each block is read with the fraction
+            of the calculation that has been completed. If it returns
+            True, the calculation is abandoned.
+        lock : threading.Lock, optional
+            Lock acquired while each block is read. The default is the
+            lock shared by all readers of the file containing the
+            field.
+
+        Returns
+        -------
+        NXStatistics
+            The field statistics, or None if the calculation was
+            abandoned.
+        """
+        statistics = cls(None, bins=bins)
+        shape = field.shape
+        if len(shape) == 0:
+            blocks = [None]
+        else:
+            rowsize = max(int(np.prod(shape[1:])) * field.dtype.itemsize, 1)
+            step = max(int(blocksize * 1e6 // rowsize), 1)
+            chunks = field.chunks
+            if isinstance(chunks, tuple) and step > chunks[0]:
+                step = step // chunks[0] * chunks[0]
+            blocks = [slice(i, min(i+step, shape[0]))
+                      for i in range(0, shape[0], step)]
+        if lock is None:
+            lock = file_lock(field)
+
+        def read_blocks():
+            for block in blocks:
+                with lock:
+                    if block is None:
+                        values = field.nxdata
+                    else:
+                        values = field[block].nxdata
+                if np.ma.isMaskedArray(values):
+                    values = values.compressed()
+                values = np.asarray(values).ravel()
+                yield values[np.isfinite(values)]
+
+        total = 2 * len(blocks)
+        minimum, maximum, minpos, count = np.inf, -np.inf, np.inf, 0
+        for i, values in enumerate(read_blocks()):
+            if values.size > 0:
+                count += values.size
+                minimum = min(minimum, float(np.min(values)))
+                maximum = max(maximum, float(np.max(values)))
+                positive = values[values > 0.0]
+                if positive.size > 0:
+                    minpos = min(minpos, float(np.min(positive)))
+            if callback and callback((i+1) / total):
+                return None
+        if count == 0:
+            return statistics
+        statistics.count = count
+        statistics.min, statistics.max = minimum, maximum
+        statistics.minpos = minpos if np.isfinite(minpos) else None
+        counts = np.zeros(bins, dtype=np.int64)
+        edges = None
+        for i, values in enumerate(read_blocks()):
+            block_counts, edges = statistics._compute_histogram(values)
+            counts += block_counts
+            if callback and callback((len(blocks)+i+1) / total):
+                return None
+        statistics._histogram = (counts, edges)
+        return statistics
+
+    def finite_values(self):
+        """
+        Return the finite values as an array.
+
+        The array is computed when first needed and then retained, so
+        the values are only filtered once.
+        """
+        if self._finite_values is None:
+            if self.data is None:
+                values = np.array([])
+            elif np.ma.isMaskedArray(self.data):
+                values = self.data.compressed()
+            else:
+                values = np.asarray(self.data)
+            finite = np.isfinite(values)
+            if finite.all():
+                self._finite_values = values.ravel()
+            else:
+                self._finite_values = values[finite]
+        return self._finite_values
+
+    def _compute_histogram(self, values, limits=None):
+        if limits is None:
+            limits = (self.min, self.max)
+        return np.histogram(values, bins=self.bins, range=limits)
+
+    @property
+    def histogram(self):
+        """Tuple of the histogram counts and bin edges."""
+        if self._histogram is None and self.count > 0:
+            self._histogram = self._compute_histogram(self.finite_values())
+        return self._histogram
+
+    def percentile(self, q):
+        """
+        Return the q-th percentile of the finite values.
+
+        The histogram bin containing the values on either side of the
+        percentile is located from the cumulative counts, so only the
+        values within that bin need to be partially sorted. The
+        percentile is linearly interpolated between these values, as in
+        the default method of the NumPy 'percentile' function. If the
+        values are not stored, the percentile is interpolated within
+        the histogram bin.
+
+        Parameters
+        ----------
+        q : float
+            Percentile, between 0 and 100.
+
+        Returns
+        -------
+        float
+            Percentile, or None if there are no finite values.
+        """
+        q = float(q)
+        if self.count == 0:
+            return None
+        elif q <= 0.0:
+            return self.min
+        elif q >= 100.0 or self.min == self.max:
+            return self.max
+        elif q in self._percentiles:
+            return self._percentiles[q]
+        rank = q * (self.count - 1) / 100.0
+        k = int(rank)
+        lower, upper = self._select(k, min(k+1, self.count-1))
+        result = lower + (upper - lower) * (rank - k)
+        self._percentiles[q] = result
+        return result
+
+    def _select(self, *ranks):
+        """Return the finite values with the given ranks in sorted order."""
+        counts, edges = self.histogram
+        cumulative = np.cumsum(counts)
+        bins = {}
+        for k in ranks:
+            i = min(int(np.searchsorted(cumulative, k, side='right')),
+                    len(counts) - 1)
+            bins.setdefault(i, []).append(k)
+        finite_values = self.finite_values()
+        results = {}
+        for i, bin_ranks in bins.items():
+            lo, hi = edges[i], edges[i+1]
+            offset = int(cumulative[i] - counts[i])
+            if self.data is None:
+                for k in bin_ranks:
+                    fraction = (k - offset + 0.5) / max(counts[i], 1)
+                    results[k] = float(lo + (hi - lo) * min(fraction, 1.0))
+                continue
+            if i == len(counts) - 1:
+                values = finite_values[(finite_values >= lo) &
+                                       (finite_values <= hi)]
+            else:
+                values = finite_values[(finite_values >= lo) &
+                                       (finite_values < hi)]
+            for k in bin_ranks:
+                if values.size == 0:
+                    results[k] = float(lo)
+                else:
+                    j = min(max(k - offset, 0), values.size - 1)
+                    results[k] = float(np.partition(values, j)[j])
+        return [results[k] for k in ranks]
+
+
+class NXPlotAxis:
+    """Class containing plotted axis values and limits.
+
+    Parameters
+    ----------
+    axis : NXfield
+        Field containing the axis values and metadata.
+    name : str
+        The axis field name.
+    data : ndarray
+        The axis values.
+    dim : int
+        Dimension value
+    dimlen : int
+        Length of equivalent dimension in the signal array. This is used
+        to determine if the axis values are bin centers or boundaries.
+
+    Attributes
+    ----------
+    name : str
+        Axis name.
+    data : ndarray
+        Array of axis values.
+    dim : int
+        No. of the axis dimensions (not currently used).
+    reversed : bool
+        True if the axis values fall with increasing array index.
+    equally_spaced : bool
+        True if the axis values are regularly spaced.
+    statistics : NXStatistics
+        Cached statistics of the data values, if available.
+    """
+
+    def __init__(self, axis, dim=None, dimlen=None):
+        """
+        Initialize a plotted axis.
+
+        Parameters
+        ----------
+        axis : NXfield
+            Field containing the axis values and metadata.
+        dim : int
+            No. of the axis dimensions (not currently used).
+        dimlen : int
+            Length of equivalent dimension in the signal array. This is
+            used to determine if the axis values are bin centers or
+            boundaries.
+        """
+        self.name = axis.nxname
+        self.data = axis.nxdata
+        self.dim = dim
+        self.reversed = False
+        self.equally_spaced = True
+        self.qualitative_data = False
+        if self.data is not None:
+            if dimlen is None:
+                self.centers = None
+                self.boundaries = None
+                try:
+                    self.min = float(np.min(self.data[np.isfinite(self.data)]))
+                    self.max = float(np.max(self.data[np.isfinite(self.data)]))
+                except Exception:
+                    self.min = 0.0
+                    self.max = 0.1
+                if ((self.min >= 0 and self.max <= 20) and
+                    (np.issubdtype(self.data.dtype, np.integer) or
+                     np.all(np.equal(np.mod(self.data, 1.0), 0)))):
+                    self.qualitative_data = True
+            else:
+                if self.data[0] > self.data[-1]:
+                    self.reversed = True
+                _spacing = self.data[1:] - self.data[:-1]
+                _range = self.data.max() - self.data.min()
+                if _spacing.size > 0:
+                    if max(_spacing) - min(_spacing) > _range/1000:
+                        self.equally_spaced = False
+                self.centers = centers(self.data, dimlen)
+                self.boundaries = boundaries(self.data, dimlen)
+                try:
+                    self.min = float(np.min(
+                        self.boundaries[np.isfinite(self.boundaries)]))
+                    self.max = float(np.max(
+                        self.boundaries[np.isfinite(self.boundaries)]))
+                except Exception:
+                    self.min = 0.0
+                    self.max = 0.1
+        else:
+            self.centers = None
+            self.boundaries = None
+            self.min = None
+            self.max = None
+        self.min_data = self.min
+        self.max_data = self.max
+        self.lo = None
+        self.hi = None
+        self.diff = 0.0
+        self.locked = True
+        self.statistics = None
+        if 'long_name' in axis.attrs:
+            self.label = axis.attrs['long_name']
+        elif 'units' in axis.attrs:
+            self.label = f"{axis.nxname} ({axis.units})"
+        else:
+            self.label = axis.nxname
+
+    def __repr__(self):
+        return f'NXPlotAxis("{self.name}")'
+
+    def set_data(self, axis, dimlen=None):
+        """
+        Initialize the axis data values.
+
+        This also determines if the values are all equally spaced,
+        which is used to determine the Matplotlib image function, and
+        stores the bin centers and boundaries of the axis values,
+        whether stored as histograms or not.
+        """
+        self.data = axis.nxdata
+        self.reversed = False
+        if dimlen is not None:
+            if self.data[0] > self.data[-1]:
+                self.reversed = True
+            _spacing = self.data[1:] - self.data[:-1]
+            _range = self.data.max() - self.data.min()
+            if _spacing.size > 0:
+                if max(_spacing) - min(_spacing) > _range/1000:
+                    self.equally_spaced = False
+            self.centers = centers(self.data, dimlen)
+            self.boundaries = boundaries(self.data, dimlen)
+
+    def set_limits(self, lo, hi):
+        """Set the low and high values for the axis."""
+        if lo > hi:
+            lo, hi = hi, lo
+        self.lo, self.hi = lo, hi
+        self.diff = float(hi) - float(lo)
+
+    def get_limits(self):
+        """Return the low and high values for the axis."""
+        return float(self.lo), float(self.hi)
+
+    def index(self, value):
+        """
+        Return the index of the bin containing the given value.
+
+        The bin boundaries are monotonic, so this is a binary search
+        that does not create any temporary arrays. Values outside the
+        boundaries return -1 or the number of bins.
+        """
+        if self.reversed:
+            return (len(self.boundaries) -
+                    int(np.searchsorted(self.boundaries[::-1], value,
+                                        side='right')) - 1)
+        else:
+            return int(np.searchsorted(self.boundaries, value)) - 1
+
+    def log_limits(self):
+        """Return limits with positive values."""
+        if self.statistics is not None and self.statistics.data is self.data:
+            minpos = self.statistics.minpos
+        else:
+            try:
+                minpos = min(self.data[self.data > 0.0])
+            except ValueError:
+                minpos = None
+        if minpos is None:
+            minpos = 0.01
+        return (minpos if self.lo <= 0 else self.lo,
+                minpos if self.hi <= 0 else self.hi)
+
+    @property
+    def min_range(self):
+        """The minimum range for the axis."""
+        return self.max_range*1e-6
+
+    @property
+    def max_range(self):
+        """The maximum range for the axis."""
+        return self.max - self.min
@@ -20,10 +20,17 @@ plotview : NXPlotView
 plotviews : dict
     A dictionary containing all the existing NXPlotView windows. The
     keys are defined by the plot window labels.
+global_statistics : dict
+    A dictionary containing the statistics of all the values of
+    previously plotted signals, which are used to set global color
+    limits. The keys are defined by the file name, field path, and file
+    modification time.
 
 """
-import copy
 import numbers
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
 from posixpath import basename, dirname
 
 import matplotlib as mpl
@@ -32,26 +39,18 @@ from matplotlib.backend_bases import FigureManagerBase, NavigationToolbar2
 from matplotlib.backends.backend_qt import FigureManagerQT as FigureManager
 from matplotlib.backends.backend_qt import NavigationToolbar2QT
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.colors import LogNorm, Normalize, SymLogNorm
+from matplotlib.colors import LogNorm, SymLogNorm
 from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
-from matplotlib.ticker import AutoLocator, LogLocator, ScalarFormatter
+from matplotlib.ticker import AutoLocator, ScalarFormatter
 from packaging.version import Version
 
-from .pyqt import QtCore, QtWidgets
-
-try:
-    from matplotlib.ticker import LogFormatterSciNotation as LogFormatter
-except ImportError:
-    from matplotlib.ticker import LogFormatter
-
 from matplotlib.transforms import nonsingular
 from mpl_toolkits.axisartist import Subplot
-from mpl_toolkits.axisartist.grid_finder import MaxNLocator
-from mpl_toolkits.axisartist.grid_helper_curvelinear import \
-    GridHelperCurveLinear
 from scipy.interpolate import interp1d
 
+from .pyqt import QtCore, QtWidgets
+
 try:
     import mplcursors
 except ImportError:
@@ -60,12 +59,20 @@ except ImportError:
 from nexusformat.nexus import NeXusError, NXdata, NXfield
 
 from .dialogs import (CustomizeDialog, ExportDialog, LimitDialog,
-                      ProjectionDialog, ScanDialog, StyleDialog)
-from .utils import (boundaries, centers, display_message, divgray_map,
-                    find_nearest, fix_projection, get_color, get_mainwindow,
-                    in_dark_mode, iterable, keep_data, load_image, parula_map,
-                    report_error, report_exception, resource_file,
-                    resource_icon, rotate_data, rotate_point, xtec_map)
+                      MovieDialog, ProjectionDialog, ScanDialog, StyleDialog,
+                      TimingDialog)
+from .plotting import (NXPlotAxis, NXStatistics, cmaps, colormap, data_norm,
+                       default_cmap, default_interpolation, divergent_cmaps,
+                       file_lock, image_extent, image_limits, interpolations,
+                       qualitative_cmaps, scaled_aspect, skew_coordinates,
+                       skew_grid_helper, skew_transform, smooth_image,
+                       unskew_coordinates)
+from .utils import (NXTimings, centers, decimate_line, display_message,
+                    find_nearest, fix_projection, get_color, get_colors,
+                    get_mainwindow, in_dark_mode, iterable, keep_data,
+                    line_profile, load_image, reduce_image, report_error,
+                    report_exception, resource_file, resource_icon,
+                    rotate_data, rotate_point)
 from .widgets import (NXCheckBox, NXcircle, NXComboBox, NXDoubleSpinBox,
                       NXellipse, NXLabel, NXline, NXLineEdit, NXpolygon,
                       NXPushButton, NXrectangle, NXSlider, NXSpinBox,
@@ -74,46 +81,8 @@ from .widgets import (NXCheckBox, NXcircle, NXComboBox, NXDoubleSpinBox,
 active_plotview = None
 plotview = None
 plotviews = {}
+global_statistics = {}
 
-cmaps = ['viridis', 'inferno', 'magma', 'plasma',  # perceptually uniform
-         'cividis', 'parula',
-         'spring', 'summer', 'autumn', 'winter', 'cool', 'hot',  # sequential
-         'bone', 'copper', 'gray', 'pink',
-         'turbo', 'jet', 'spectral', 'rainbow', 'hsv',  # miscellaneous
-         'tab10', 'tab20', 'xtec',  # qualitative
-         'seismic', 'coolwarm', 'twilight', 'divgray',  # diverging
-         'RdBu', 'RdYlBu', 'RdYlGn']
-
-if Version(mpl.__version__) >= Version('3.5.0'):
-    mpl.colormaps.register(parula_map())
-    mpl.colormaps.register(xtec_map())
-    mpl.colormaps.register(divgray_map())
-    cmaps = [cm for cm in cmaps if cm in mpl.colormaps]
-else:
-    from matplotlib.cm import cmap_d, get_cmap, register_cmap
-    register_cmap('parula', parula_map())
-    register_cmap('xtec', xtec_map())
-    register_cmap('divgray', divgray_map())
-    cmaps = [cm for cm in cmaps if cm in cmap_d]
-
-if 'viridis' in cmaps:
-    default_cmap = 'viridis'
-else:
-    default_cmap = 'jet'
-divergent_cmaps = ['seismic', 'coolwarm', 'twilight', 'divgray',
-                   'RdBu', 'RdYlBu', 'RdYlGn',
-                   'PiYG', 'PRGn', 'BrBG', 'PuOr', 'RdGy', 'Spectral', 'bwr']
-qualitative_cmaps = ['tab10', 'tab20', 'xtec']
-interpolations = [
-    'nearest', 'bilinear', 'bicubic', 'spline16', 'spline36', 'hanning',
-    'hamming', 'hermite', 'kaiser', 'quadric', 'catrom', 'gaussian', 'bessel',
-    'mitchell', 'sinc', 'lanczos']
-default_interpolation = 'nearest'
-try:
-    from astropy.convolution import Gaussian2DKernel, convolve
-    interpolations.insert(1, 'convolve')
-except ImportError:
-    pass
 linestyles = {'Solid': '-', 'Dashed': '--', 'DashDot': '-.', 'Dotted': ':',
               'LongDashed': (0, (8, 2)),
               'DenselyDotted': (0, (1, 1)),
@@ -194,6 +163,16 @@ def get_plotview():
 class NXCanvas(FigureCanvas):
     """Subclass of Matplotlib's FigureCanvas."""
 
+    timings = None
+
+    def draw(self):
+        """Render the figure, recording the time taken if requested."""
+        if self.timings is None:
+            super().draw()
+        else:
+            with self.timings.stage('draw'):
+                super().draw()
+
     def get_default_filename(self):
         """Return a string suitable for use as a default filename."""
         basename = (self.manager.get_window_title().replace('NeXpy: ', '')
@@ -356,6 +335,7 @@ class NXPlotView(QtWidgets.QDialog):
                                                  self.on_button_press)
         self.key_press_cid = self.mpl_connect('key_press_event',
                                               self.on_key_press)
+        self.draw_cid = self.mpl_connect('draw_event', self.on_draw)
         self.canvas.figure.show = lambda *args: self.show()
         self.figuremanager._cidgcf = self.button_press_cid
         self.figuremanager.window = self
@@ -431,6 +411,27 @@ class NXPlotView(QtWidgets.QDialog):
         self._linscale = None
         self._stddev = 2.0
         self._primary_signal_group = None
+        self._extent = None
+        self._lod = None
+        self._lod_levels = {}
+        self._lod_factor = 1
+        self.blit = True
+        self._statistics = None
+        self._percentiles = None
+        self._decimate = False
+        self._decimation_view = None
+        self._multilines = None
+        self.decimation_threshold = 10000
+        self._global_thread = None
+        self._global_worker = None
+        self._skewed_mesh = None
+        self._smooth_cache = OrderedDict()
+        self.timings = NXTimings()
+        self.canvas.timings = self.timings
+        self._background = None
+        self._blit_state = None
+        self._blitting = False
+        self.prefetcher = NXPrefetcher(cache_size=self.cache_size)
 
         # Remove some key default Matplotlib key mappings
         for key in [key for key in mpl.rcParams if key.startswith('keymap')]:
@@ -497,6 +498,11 @@ class NXPlotView(QtWidgets.QDialog):
         if 'shift' in event.modifiers:
             self.ptab.draw_rotated_line(event)
 
+    def on_draw(self, event):
+        """Invalidate the blitting background after a full redraw."""
+        if not self._blitting:
+            self._background = None
+
     def on_key_press(self, event):
         """
         Handle key press events in the Matplotlib canvas.
@@ -514,7 +520,7 @@ class NXPlotView(QtWidgets.QDialog):
         'f', 'b'
             Play the current z-axis values forward or backward, respectively.
         'r'
-            Replot the image
+            Clear cached slices and replot the image.
         'g'
             Toggle display of the minor grid.
         'A'
@@ -559,6 +565,7 @@ class NXPlotView(QtWidgets.QDialog):
             self.tab_widget.setCurrentIndex(self.tab_widget.indexOf(self.ztab))
             self.ztab.axiscombo.setFocus()
         elif event.key == 'r' and self.ndim > 2:
+            self.clear_cache()
             self.replot_data()
         elif event.key == 'g':
             self.grid(minor=True)
@@ -756,6 +763,7 @@ class NXPlotView(QtWidgets.QDialog):
         self._bad = opts.pop("bad", self.bad)
 
         self.data = data
+        self.clear_cache()
         if not over:
             self.title = data.nxtitle
 
@@ -769,9 +777,11 @@ class NXPlotView(QtWidgets.QDialog):
         else:
             self.rgb_image = False
 
-        self.plotdata = self.get_plotdata(over=over)
+        with self.timings.stage('read'):
+            self.plotdata = self.get_plotdata(over=over)
         if not over:
             self.init_tabs()
+            self._multilines = None
 
         # One-dimensional Plot
         if self.ndim == 1:
@@ -790,9 +800,12 @@ class NXPlotView(QtWidgets.QDialog):
                 if log:
                     logy = True
 
-            self.x, self.y, self.e = self.get_points()
-            self.plot_points(fmt=fmt, over=over, **opts)
+            with self.timings.stage('points'):
+                self.x, self.y, self.e = self.get_points()
+            with self.timings.stage('plot'):
+                self.plot_points(fmt=fmt, over=over, **opts)
             self.add_plot()
+            self.update_decimation(force=True)
 
         # Higher-dimensional plot
         else:
@@ -817,8 +830,10 @@ class NXPlotView(QtWidgets.QDialog):
             if vmax is not None:
                 self.vaxis.hi = vmax
             self.reset_log()
-            self.x, self.y, self.v = self.get_image()
-            self.plot_image(over, **opts)
+            with self.timings.stage('image'):
+                self.x, self.y, self.v = self.get_image()
+            with self.timings.stage('plot'):
+                self.plot_image(over, **opts)
 
         self.limits = (self.xaxis.min, self.xaxis.max,
                        self.yaxis.min, self.yaxis.max)
@@ -1076,10 +1091,41 @@ class NXPlotView(QtWidgets.QDialog):
         y = self.yaxis.boundaries
         v = self.plotdata.nxsignal.nxdata
         if self.interpolation == 'convolve':
-            return x, y, convolve(v, Gaussian2DKernel(self.smooth))
+            return x, y, self.smoothed_image(v)
         else:
             return x, y, v
 
+    def smoothed_image(self, v):
+        """Return the signal array convolved with a Gaussian.
+
+        The results are cached for the most recently viewed slices, so
+        that returning to a slice, e.g., when stepping back and forth
+        through a 3D array, does not require the convolution to be
+        repeated.
+
+        Parameters
+        ----------
+        v : ndarray
+            Signal array to be smoothed.
+
+        Returns
+        -------
+        ndarray
+            Smoothed array.
+        """
+        key = (id(v), self.smooth)
+        if key in self._smooth_cache:
+            array, smoothed = self._smooth_cache[key]
+            if array is v:
+                self._smooth_cache.move_to_end(key)
+                return smoothed
+        with self.timings.stage('smooth'):
+            smoothed = smooth_image(v, self.smooth)
+        self._smooth_cache[key] = (v, smoothed)
+        while len(self._smooth_cache) > 8:
+            self._smooth_cache.popitem(last=False)
+        return smoothed
+
     def plot_image(self, over=False, **opts):
         """Plot a two-dimensional plot.
 
@@ -1106,15 +1152,7 @@ class NXPlotView(QtWidgets.QDialog):
         else:
             ax = self.ax
 
-        if self.xaxis.reversed:
-            left, right = self.xaxis.max_data, self.xaxis.min_data
-        else:
-            left, right = self.xaxis.min_data, self.xaxis.max_data
-        if self.yaxis.reversed:
-            bottom, top = self.yaxis.max_data, self.yaxis.min_data
-        else:
-            bottom, top = self.yaxis.min_data, self.yaxis.max_data
-        extent = (left, right, bottom, top)
+        extent = image_extent(self.xaxis, self.yaxis)
 
         if self.regular_grid:
             if self.interpolation == 'convolve':
@@ -1122,19 +1160,20 @@ class NXPlotView(QtWidgets.QDialog):
             else:
                 opts['interpolation'] = self.interpolation
 
-        if Version(mpl.__version__) >= Version('3.5.0'):
-            cm = copy.copy(mpl.colormaps[self.cmap])
-        else:
-            cm = copy.copy(get_cmap(self.cmap))
-        cm.set_bad(self.bad)
+        cm = colormap(self.cmap, self.bad)
         if self.rgb_image or self.regular_grid:
             opts['origin'] = 'lower'
+            self._extent = extent
+            self._lod_factor = 1
             self.image = ax.imshow(self.v, extent=extent, cmap=cm,
                                    norm=self.norm, **opts)
+            if self.skewed:
+                self.image.set_transform(self.skew_transform() +
+                                         ax.transData)
         else:
+            self._extent = None
             if self.skewed:
-                xx, yy = np.meshgrid(self.x, self.y)
-                x, y = self.transform(xx, yy)
+                x, y = self.skewed_mesh()
             else:
                 x, y = self.x, self.y
             self.image = ax.pcolormesh(x, y, self.v, cmap=cm, **opts)
@@ -1147,19 +1186,11 @@ class NXPlotView(QtWidgets.QDialog):
             self.colorbar.formatter = self.formatter
             self.update_colorbar()
 
-        if self.skewed:
-            if self._skew_angle < 90.0:
-                xlo, ylo = self.transform(self.xaxis.lo, self.yaxis.lo)
-                xhi, yhi = self.transform(self.xaxis.hi, self.yaxis.hi)
-            else:
-                xlo, yhi = self.transform(self.xaxis.lo, self.yaxis.hi)
-                xhi, ylo = self.transform(self.xaxis.hi, self.yaxis.lo)
-        else:
-            xlo, ylo = self.xaxis.lo, self.yaxis.lo
-            xhi, yhi = self.xaxis.hi, self.yaxis.hi
-
+        xlo, xhi, ylo, yhi = image_limits(
+            self.xaxis, self.yaxis, self.skew if self.skewed else None)
         ax.set_xlim(xlo, xhi)
         ax.set_ylim(ylo, yhi)
+        self.update_lod()
 
         if not over:
             ax.set_xlabel(self.xaxis.label)
@@ -1198,11 +1229,11 @@ class NXPlotView(QtWidgets.QDialog):
         p['zorder'] = p['plot'].get_zorder()
         p['scale'] = 1.0
         p['offset'] = 0.0
-        try:
-            p['smooth_function'] = interp1d(self.x, self.y, kind='cubic')
-        except Exception:
-            p['smooth_function'] = None
+        if self.e is None:
+            p['decimation'] = None
+        p['smooth_function'] = None
         p['smooth_line'] = None
+        p['smooth_window'] = None
         p['smooth_linestyle'] = 'None'
         p['smoothing'] = False
         if mplcursors and p['marker'] != 'None':
@@ -1214,6 +1245,235 @@ class NXPlotView(QtWidgets.QDialog):
         self.ytab.plotcombo.select(self.num)
         self.ytab.reset_smoothing()
 
+    def multiplot(self, data, signals=None, offset=0.0, colors=None,
+                  cmap=None, **opts):
+        """
+        Plot several one-dimensional signals sharing the same axis.
+
+        The first signal is plotted as a normal line plot, so that it
+        can be customized, fitted and smoothed as usual. The remaining
+        signals are drawn as a single Matplotlib LineCollection, so that
+        the cost of plotting and redrawing them is small, even when
+        there are hundreds of them. Their colors and offsets are updated
+        in place using 'set_line_colors' and 'set_line_offset'.
+
+        Parameters
+        ----------
+        data : NXdata
+            Group containing the signals and their common axis.
+        signals : list of str or NXfield, optional
+            Signals to be plotted. By default, these are the group's
+            signal followed by its auxiliary signals.
+        offset : float, optional
+            Vertical offset between successive signals, by default 0.0.
+        colors : list of str, optional
+            Colors of each line, which are cycled if there are fewer
+            colors than signals. By default, the colors are interpolated
+            between the first and fourth colors of the default cycle, or
+            taken from the color map if one is given.
+        cmap : str, optional
+            Name of the color map used to color the lines.
+        opts : dict
+            Matplotlib line options, e.g., linewidth, applied to every
+            line.
+        """
+        if signals is None:
+            signals = [data.nxsignal]
+            if 'auxiliary_signals' in data.attrs:
+                signals.extend([data[signal] for signal
+                                in data.attrs['auxiliary_signals']
+                                if signal != data.nxsignal.nxname])
+        else:
+            signals = [data[signal] if isinstance(signal, str) else signal
+                       for signal in signals]
+        shape = data.plot_shape
+        if len(shape) != 1:
+            raise NeXusError("Multiplots require one-dimensional signals")
+        for signal in signals:
+            if signal.size != shape[0]:
+                raise NeXusError(
+                    f"'{signal.nxname}' does not match the plotted axis")
+        if signals[0].nxname == data.nxsignal.nxname:
+            first = data
+        else:
+            first = NXdata(signals[0], data.plot_axes, title=data.nxtitle)
+        y = np.array([np.asarray(signal.nxdata, dtype=float).reshape(shape)
+                      for signal in signals[1:]])
+        labels = [signal.nxname for signal in signals]
+        self.plot_lines(first, y, labels, offset=offset, colors=colors,
+                        cmap=cmap, **opts)
+
+    def waterfall(self, data, offset=None, colors=None, cmap=None, **opts):
+        """
+        Plot each row of a two-dimensional signal as a separate line.
+
+        The rows are plotted against the last axis with successive
+        vertical offsets, using a single LineCollection for all but the
+        first row, as described in 'multiplot'. Each line is labeled by
+        the corresponding value of the first axis, e.g., a temperature.
+
+        Parameters
+        ----------
+        data : NXdata
+            Group containing a two-dimensional signal.
+        offset : float, optional
+            Vertical offset between successive rows. By default, this
+            is the median range of the values in each row.
+        colors : list of str, optional
+            Colors of each line.
+        cmap : str, optional
+            Name of the color map used to color the lines.
+        opts : dict
+            Matplotlib line options applied to every line.
+        """
+        signal = data.nxsignal
+        shape = data.plot_shape
+        if signal is None or len(shape) != 2:
+            raise NeXusError("Waterfall plots require a two-dimensional "
+                             "signal")
+        v = np.asarray(signal.nxdata, dtype=float).reshape(shape)
+        axes = data.plot_axes
+        values = centers(axes[0], shape[0])
+        labels = [f"{axes[0].nxname}={value:.6g}" for value in values]
+        if offset is None:
+            with np.errstate(invalid='ignore'):
+                ranges = np.nanmax(v, axis=1) - np.nanmin(v, axis=1)
+            offset = float(np.nanmedian(ranges)) if shape[0] > 1 else 0.0
+            if not np.isfinite(offset):
+                offset = 0.0
+        attrs = {key: signal.attrs[key] for key in ('long_name', 'units')
+                 if key in signal.attrs}
+        first = NXdata(NXfield(v[0], name=signal.nxname, attrs=attrs),
+                       axes[1], title=data.nxtitle)
+        self.plot_lines(first, v[1:], labels, offset=offset, colors=colors,
+                        cmap=cmap, **opts)
+
+    def plot_lines(self, data, y, labels, offset=0.0, colors=None,
+                   cmap=None, **opts):
+        """
+        Plot the first line normally and the others as a LineCollection.
+
+        This is called by 'multiplot' and 'waterfall'.
+
+        Parameters
+        ----------
+        data : NXdata
+            Group containing the first line to be plotted.
+        y : ndarray
+            Two-dimensional array containing the y-values of the other
+            lines, each of which shares the x-values of the first line.
+        labels : list of str
+            Legend labels of every line, including the first.
+        offset : float, optional
+            Vertical offset between successive lines.
+        colors : list of str, optional
+            Colors of each line.
+        cmap : str, optional
+            Name of the color map used to color the lines.
+        opts : dict
+            Matplotlib line options applied to every line.
+        """
+        from matplotlib.collections import LineCollection
+        opts.setdefault('marker', 'None')
+        opts.setdefault('linestyle', '-')
+        self.plot(data, **opts)
+        p = self.plots[self.num]
+        p['legend_label'] = labels[0]
+        collection = LineCollection([], linewidths=p['linewidth'],
+                                    linestyles=p['linestyle'],
+                                    zorder=p['zorder'])
+        self.ax.add_collection(collection, autolim=False)
+        self._multilines = {'collection': collection, 'num': self.num,
+                            'x': self.x,
+                            'y': np.asarray(y, dtype=float).reshape(
+                                -1, self.x.size),
+                            'labels': labels, 'offset': 0.0,
+                            'colors': None, 'cmap': None}
+        self.set_line_colors(colors=colors, cmap=cmap, draw=False)
+        self.set_line_offset(offset)
+
+    @property
+    def multilines(self):
+        """
+        Dictionary describing the lines plotted by 'plot_lines'.
+
+        This contains the LineCollection, the number of the plot
+        containing the first line, the shared x-values, the y-values of
+        the other lines, their legend labels, the current offset, and
+        the line colors. It is None if no multiplot is displayed.
+        """
+        return self._multilines
+
+    def set_line_offset(self, offset):
+        """
+        Set the vertical offset between the lines of a multiplot.
+
+        The LineCollection segments are updated in place and the plot
+        limits are reset to include all the lines.
+
+        Parameters
+        ----------
+        offset : float
+            Vertical offset between successive lines.
+        """
+        m = self._multilines
+        if m is None:
+            raise NeXusError("No multiplot has been displayed")
+        m['offset'] = float(offset)
+        x, y = m['x'], m['y']
+        shifts = m['offset'] * np.arange(1, y.shape[0]+1)[:, np.newaxis]
+        y = y + shifts
+        m['collection'].set_segments(
+            np.stack(np.broadcast_arrays(x, y), axis=-1))
+        y = np.concatenate((self.plots[m['num']]['plot'].get_ydata(),
+                            y.ravel()))
+        xlo, xhi = float(np.nanmin(x)), float(np.nanmax(x))
+        ylo, yhi = float(np.nanmin(y)), float(np.nanmax(y))
+        dx = (xhi - xlo) * mpl.rcParams['axes.xmargin']
+        dy = (yhi - ylo) * mpl.rcParams['axes.ymargin']
+        self.limits = (xlo - dx, xhi + dx, ylo - dy, yhi + dy)
+        self.reset_plot_limits()
+
+    def set_line_colors(self, colors=None, cmap=None, draw=True):
+        """
+        Set the colors of the lines of a multiplot.
+
+        Parameters
+        ----------
+        colors : list of str, optional
+            Colors of each line, which are cycled if there are fewer
+            colors than lines.
+        cmap : str, optional
+            Name of a color map used to color the lines if no colors are
+            given. If neither is given, the colors are interpolated
+            between two colors of the default cycle.
+        draw : bool, optional
+            If True, the plot is redrawn, by default True.
+        """
+        m = self._multilines
+        if m is None:
+            raise NeXusError("No multiplot has been displayed")
+        n = m['y'].shape[0] + 1
+        if colors:
+            colors = [get_color(colors[i % len(colors)]) for i in range(n)]
+        elif cmap:
+            colors = [get_color(c) for c
+                      in mpl.colormaps[cmap](np.linspace(0.0, 1.0, n))]
+        elif n > 1:
+            colors = get_colors(n)
+        else:
+            colors = [self.plots[m['num']]['color']]
+        m['colors'], m['cmap'] = colors, cmap
+        p = self.plots[m['num']]
+        p['color'] = colors[0]
+        p['plot'].set_color(p['color'])
+        if p['smooth_line']:
+            p['smooth_line'].set_color(p['color'])
+        m['collection'].set_color(colors[1:])
+        if draw:
+            self.draw()
+            self.update_panels()
+
     @property
     def signal_group(self):
         """The path of the signal group."""
@@ -1259,9 +1519,177 @@ class NXPlotView(QtWidgets.QDialog):
     @property
     def finite_v(self):
         """Plotted signal array excluding NaNs and infinities."""
-        if np.isnan(self.v).all() or np.isinf(self.v).all():
+        if self.statistics.count == 0:
             raise NeXusError('Data only contains NaNs or infinities')
-        return self.v[np.isfinite(self.v)]
+        return self.statistics.finite_values()
+
+    @property
+    def statistics(self):
+        """
+        Statistics of the plotted signal array.
+
+        These are computed once for each plotted array, and include the
+        finite minimum and maximum values, the minimum positive value,
+        and, if autoscaling uses percentiles, a coarse histogram.
+        """
+        if self._statistics is None or self._statistics.data is not self.v:
+            self._statistics = NXStatistics(
+                self.v, histogram=self._percentiles is not None)
+        return self._statistics
+
+    @property
+    def percentiles(self):
+        """
+        The percentiles of the data used to autoscale the color limits.
+
+        This is a tuple containing the lower and upper percentiles, in
+        the range 0 to 100, e.g., (0.1, 99.9), so that a few outlying
+        values, such as hot pixels, do not determine the color scale.
+        A string containing two comma-separated values is also accepted.
+        The default is None, in which case the minimum and maximum
+        finite values are used.
+        """
+        return self._percentiles
+
+    @percentiles.setter
+    def percentiles(self, value):
+        if isinstance(value, str):
+            value = [v for v in value.replace(',', ' ').split()]
+        if value is None or len(value) == 0:
+            value = None
+        else:
+            try:
+                lo, hi = [float(v) for v in value]
+            except (TypeError, ValueError):
+                raise NeXusError("Percentiles must be a pair of values")
+            if not 0.0 <= lo < hi <= 100.0:
+                raise NeXusError(
+                    "Percentiles must be increasing values from 0 to 100")
+            if lo == 0.0 and hi == 100.0:
+                value = None
+            else:
+                value = (lo, hi)
+        if value == self._percentiles:
+            return
+        self._percentiles = value
+        if self.image is not None and self.autoscale:
+            self.replot_image()
+
+    def global_limits(self):
+        """
+        Set the color limits to the range of the whole signal.
+
+        For data with more than two dimensions, this allows the color
+        limits to be fixed while stepping through the z-axis values.
+        The statistics of the signal are computed in a background
+        thread, which reads the signal in blocks so that it does not
+        need to fit in memory. The progress is shown on the 'Global'
+        button in the signal tab, which can be clicked again to cancel
+        the calculation. The statistics of fields stored in files are
+        cached until the file is modified. If percentiles have been set,
+        they are applied to the global statistics.
+        """
+        if self._global_thread is not None:
+            self.stop_global_limits()
+            return
+        field = self.data.nxsignal
+        key = self.global_key(field)
+        if key is not None and key in global_statistics:
+            self.set_global_limits(global_statistics[key])
+            return
+        self._global_thread = QtCore.QThread()
+        self._global_worker = NXStatisticsWorker(field, key)
+        self._global_worker.moveToThread(self._global_thread)
+        self._global_thread.started.connect(self._global_worker.run)
+        self._global_worker.progress.connect(self.vtab.global_progress)
+        self._global_worker.finished.connect(self.finish_global_limits)
+        self._global_thread.start()
+        self.vtab.global_progress(0)
+
+    @staticmethod
+    def global_key(field):
+        """
+        Return the key used to cache the statistics of a field.
+
+        Statistics are only cached for fields stored in files, since
+        changes to fields in memory cannot be detected.
+        """
+        root = field.nxroot
+        if field.nxfilemode is None or root.nxfilename is None:
+            return None
+        return (root.nxfilename, field.nxpath, getattr(root, 'mtime', None))
+
+    def finish_global_limits(self, key, statistics):
+        """Store the statistics of the signal and apply the limits."""
+        self.stop_global_limits()
+        try:
+            if isinstance(statistics, Exception):
+                raise statistics
+            elif statistics is None:
+                return
+            if key is not None:
+                global_statistics[key] = statistics
+            self.set_global_limits(statistics)
+        except NeXusError as error:
+            report_error("Setting Global Limits", error)
+
+    def stop_global_limits(self):
+        """Stop any calculation of the global statistics."""
+        if self._global_worker is not None:
+            self._global_worker.cancelled = True
+        if self._global_thread is not None:
+            self._global_thread.quit()
+            self._global_thread.wait()
+        self._global_thread = self._global_worker = None
+        try:
+            self.vtab.global_progress(None)
+        except (AttributeError, RuntimeError):
+            pass
+
+    def set_global_limits(self, statistics):
+        """
+        Set the color limits using the statistics of the whole signal.
+
+        Autoscaling is turned off, so the limits are retained when other
+        slices are plotted.
+
+        Parameters
+        ----------
+        statistics : NXStatistics
+            Statistics of all the signal values.
+        """
+        if statistics.count == 0:
+            raise NeXusError('Data only contains NaNs or infinities')
+        if self._percentiles is None:
+            lo, hi = statistics.min, statistics.max
+        else:
+            lo, hi = [statistics.percentile(p) for p in self._percentiles]
+        if self.ndim > 2:
+            self.autoscale = False
+        self.vaxis.min, self.vaxis.max = statistics.min, statistics.max
+        self.vaxis.lo, self.vaxis.hi = lo, hi
+        self.vtab.set_range()
+        self.vtab.set_limits(lo, hi)
+        self.replot_image()
+        self.draw()
+
+    def data_limits(self):
+        """
+        Return the autoscaled limits of the plotted signal array.
+
+        Returns
+        -------
+        tuple of floats
+            Minimum and maximum finite values, or the values of the
+            lower and upper percentiles if these have been set.
+        """
+        statistics = self.statistics
+        if statistics.count == 0:
+            raise NeXusError('Data only contains NaNs or infinities')
+        elif self._percentiles is None:
+            return statistics.min, statistics.max
+        else:
+            return tuple(statistics.percentile(p) for p in self._percentiles)
 
     def set_data_limits(self):
         """
@@ -1282,8 +1710,10 @@ class NXPlotView(QtWidgets.QDialog):
         limits.
         """
         self.vaxis.data = self.v
+        self.vaxis.statistics = self.statistics
         if self.vaxis.hi is None or self.autoscale:
-            self.vaxis.hi = self.vaxis.max = np.max(self.finite_v)
+            self.vaxis.max = self.statistics.max
+            self.vaxis.hi = self.data_limits()[1]
         if self.vtab.symmetric:
             self.vaxis.lo = -self.vaxis.hi
         elif self.vtab.qualitative:
@@ -1291,13 +1721,10 @@ class NXPlotView(QtWidgets.QDialog):
                 self.vaxis.lo = 0.5
             else:
                 self.vaxis.lo = -0.5
-            if Version(mpl.__version__) >= Version('3.5.0'):
-                nc = len(mpl.colormaps[self.cmap].colors)
-            else:
-                nc = len(get_cmap(self.cmap).colors)
+            nc = len(colormap(self.cmap).colors)
             self.vaxis.hi = self.vaxis.lo + nc
         elif self.vaxis.lo is None or self.autoscale:
-            self.vaxis.lo = np.min(self.finite_v)
+            self.vaxis.lo = self.data_limits()[0]
         if self.vtab.log and not self.vtab.symmetric:
             self.vtab.set_limits(*self.vaxis.log_limits())
 
@@ -1311,28 +1738,10 @@ class NXPlotView(QtWidgets.QDialog):
         the linthresh and linscale parameters set to the hi value divided by 10
         and 0.1, respectively.
         """
-        if self.vtab.log:
-            if self.vtab.symmetric:
-                if self._linthresh:
-                    linthresh = self._linthresh
-                else:
-                    linthresh = self.vaxis.hi / 10.0
-                if self._linscale:
-                    linscale = self._linscale
-                else:
-                    linscale = 0.1
-                self.norm = SymLogNorm(linthresh, linscale=linscale,
-                                       vmin=self.vaxis.lo, vmax=self.vaxis.hi)
-                self.locator = AutoLocator()
-                self.formatter = ScalarFormatter()
-            else:
-                self.norm = LogNorm(self.vaxis.lo, self.vaxis.hi)
-                self.locator = LogLocator()
-                self.formatter = LogFormatter()
-        else:
-            self.norm = Normalize(self.vaxis.lo, self.vaxis.hi)
-            self.locator = AutoLocator()
-            self.formatter = ScalarFormatter()
+        self.norm, self.locator, self.formatter = data_norm(
+            self.vaxis.lo, self.vaxis.hi, log=self.vtab.log,
+            symmetric=self.vtab.symmetric, linthresh=self._linthresh,
+            linscale=self._linscale)
 
     def replot_data(self, newaxis=False):
         """Replot the data with new axes if necessary.
@@ -1346,24 +1755,12 @@ class NXPlotView(QtWidgets.QDialog):
         newaxis : bool
             If True, a new set of axes is drawn by calling plot_image.
         """
-        axes = [self.yaxis.dim, self.xaxis.dim]
-        limits = []
+        axes, limits = self.slice_limits()
         xmin, xmax, ymin, ymax = [float(value) for value in self.limits]
-        for i in range(self.ndim):
-            if i in axes:
-                if i == self.xaxis.dim:
-                    limits.append((xmin, xmax))
-                else:
-                    limits.append((ymin, ymax))
-            else:
-                limits.append((float(self.axis[i].lo), float(self.axis[i].hi)))
-        if self.data.nxsignal.shape != self.data.plot_shape:
-            axes, limits = fix_projection(self.data.nxsignal.shape, axes,
-                                          limits)
         try:
-            self.plotdata = self.data.project(axes, limits)
-            if self.weighted:
-                self.plotdata = self.plotdata.weighted_data()
+            with self.timings.stage('read'):
+                self.plotdata = self.prefetcher.get(self.data, axes, limits,
+                                                    weighted=self.weighted)
             if self.ndim == 3 and not self._skew_angle:
                 self._skew_angle = self.get_skew_angle(*axes)
                 if self._skew_angle is not None:
@@ -1372,23 +1769,186 @@ class NXPlotView(QtWidgets.QDialog):
             self.ztab.pause()
             raise e
         self.plotdata.title = self.title
-        self.x, self.y, self.v = self.get_image()
+        with self.timings.stage('image'):
+            self.x, self.y, self.v = self.get_image()
         if newaxis:
-            self.plot_image()
+            with self.timings.stage('plot'):
+                self.plot_image()
             self.draw()
         elif self.regular_grid:
-            self.image.set_data(self.v)
             if self.xaxis.reversed:
                 xmin, xmax = xmax, xmin
             if self.yaxis.reversed:
                 ymin, ymax = ymax, ymin
-            self.image.set_extent((xmin, xmax, ymin, ymax))
+            self._extent = (xmin, xmax, ymin, ymax)
+            self.update_lod(force=True)
+            if self.blit_image():
+                return
             self.replot_image()
         else:
             self.image.set_array(self.v.ravel())
             self.replot_image()
         self.grid(self._grid, self._minorgrid)
 
+    def slice_limits(self, zlimits=None):
+        """
+        Return the axes and limits defining the currently plotted slice.
+
+        Parameters
+        ----------
+        zlimits : tuple of floats, optional
+            Limits to be used for the currently selected z-axis instead
+            of its current values. This is used to define neighboring
+            slices.
+
+        Returns
+        -------
+        axes : list of int
+            Dimensions of the projection axes.
+        limits : list of tuples
+            Minimum and maximum values of each dimension.
+        """
+        axes = [self.yaxis.dim, self.xaxis.dim]
+        limits = []
+        xmin, xmax, ymin, ymax = [float(value) for value in self.limits]
+        for i in range(self.ndim):
+            if i in axes:
+                if i == self.xaxis.dim:
+                    limits.append((xmin, xmax))
+                else:
+                    limits.append((ymin, ymax))
+            elif zlimits is not None and self.axis[i] is self.zaxis:
+                limits.append((float(zlimits[0]), float(zlimits[1])))
+            else:
+                limits.append((float(self.axis[i].lo), float(self.axis[i].hi)))
+        if self.data.nxsignal.shape != self.data.plot_shape:
+            axes, limits = fix_projection(self.data.nxsignal.shape, axes,
+                                          limits)
+        return axes, limits
+
+    @property
+    def cache_size(self):
+        """
+        The maximum size in MB of the cache of plotted slices.
+
+        Slices of higher-dimensional data that have already been plotted
+        are stored in a least-recently-used cache, so that returning to
+        them does not require the data to be read and projected again.
+        The default is defined by the 'slicecache' option in the NeXpy
+        settings file.
+        """
+        try:
+            return self.prefetcher.cache.maxsize
+        except AttributeError:
+            try:
+                return float(self.mainwindow.settings.get('settings',
+                                                          'slicecache'))
+            except Exception:
+                return 256.0
+
+    @cache_size.setter
+    def cache_size(self, value):
+        self.prefetcher.cache.maxsize = value
+
+    def prefetch(self, steps=1):
+        """
+        Load the adjacent slices along the z-axis in a background thread.
+
+        The slices are those that will be plotted when the z-axis
+        values are stepped forwards or backwards from the current
+        slice. Slices in the current playback direction are queued
+        first. They are stored in a bounded buffer, so that playback
+        and manual stepping do not have to wait for the data to be read
+        from disk.
+
+        Parameters
+        ----------
+        steps : int, optional
+            Number of spin box steps between successive slices. A
+            negative value gives priority to the slices in the reverse
+            direction. The default is 1.
+        """
+        if self.ndim < 3 or not steps or not self.prefetcher.slices:
+            return
+        box = self.ztab.maxbox
+        hi, diff = float(self.zaxis.hi), self.zaxis.diff
+
+        def slice_requests(steps):
+            requests = []
+            for i in range(1, self.prefetcher.slices+1):
+                if diff:
+                    value = hi + i * steps * diff
+                    if (value > box.centers[-1] + box.tolerance or
+                            value - diff < box.centers[0] - box.tolerance):
+                        break
+                    idx = box.indexFromValue(value)
+                else:
+                    idx = box.index + i * steps
+                    if idx < 0 or idx > box.maximum():
+                        break
+                zhi = float(box.centers[idx])
+                requests.append(self.slice_limits((zhi - diff, zhi)))
+            return requests
+
+        forward, backward = slice_requests(steps), slice_requests(-steps)
+        requests = [r for pair in zip_longest(forward, backward) for r in pair
+                    if r is not None]
+        self.prefetcher.prefetch(self.data, requests, weighted=self.weighted)
+
+    def movie_frames(self, start=0, stop=None, step=1):
+        """
+        Yield the slices of the current 3D plot along the z-axis.
+
+        The slices have the same x and y axes and the same z-axis width
+        as the current plot, but they are not cached.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            Indices of the first and last z-axis values. By default,
+            all the values are included.
+        step : int, optional
+            Stride between successive z-axis indices. The default is 1.
+
+        Yields
+        ------
+        tuple
+            The z-axis value and the NXdata group of each slice.
+        """
+        if self.ndim < 3:
+            raise NeXusError("Movies require data with at least three "
+                             "dimensions")
+        values = self.zaxis.centers
+        if stop is None:
+            stop = len(values) - 1
+        for idx in range(start, stop+1, step):
+            value = float(values[idx])
+            axes, limits = self.slice_limits((value - self.zaxis.diff, value))
+            yield value, self.prefetcher.load(self.data, axes, limits,
+                                              weighted=self.weighted)
+
+    def render_options(self):
+        """
+        Return the options that reproduce the current 2D plot.
+
+        These are the limits, norm, colormap, interpolation, aspect
+        ratio and skew angle, as used by the functions of the render
+        module, which plot without any Qt widgets.
+        """
+        return {'xmin': self.xaxis.lo, 'xmax': self.xaxis.hi,
+                'ymin': self.yaxis.lo, 'ymax': self.yaxis.hi,
+                'vmin': self.vaxis.lo, 'vmax': self.vaxis.hi,
+                'log': self.logv, 'symmetric': self.vtab.symmetric,
+                'linthresh': self._linthresh, 'linscale': self._linscale,
+                'cmap': self.cmap, 'interpolation': self.interpolation,
+                'smooth': self.smooth, 'aspect': self._aspect,
+                'skew': self.skew, 'bad': self.bad, 'title': self.title}
+
+    def clear_cache(self):
+        """Discard the cached slices and smoothed images."""
+        self.prefetcher.clear()
+        self._smooth_cache.clear()
+
     def replot_image(self):
         """
         Replot the image data.
@@ -1398,14 +1958,17 @@ class NXPlotView(QtWidgets.QDialog):
         redraws the colorbar and axes. Finally, it redraws the image.
         """
         try:
-            self.set_data_limits()
-            self.set_data_norm()
-            self.image.set_norm(self.norm)
+            with self.timings.stage('limits'):
+                self.set_data_limits()
+            with self.timings.stage('norm'):
+                self.set_data_norm()
+                self.image.set_norm(self.norm)
             if self.colorbar:
-                self.colorbar.locator = self.locator
-                self.colorbar.formatter = self.formatter
-                self.update_colorbar()
-                self.set_minorticks()
+                with self.timings.stage('colorbar'):
+                    self.colorbar.locator = self.locator
+                    self.colorbar.formatter = self.formatter
+                    self.update_colorbar()
+                    self.set_minorticks()
             self.image.set_clim(self.vaxis.lo, self.vaxis.hi)
             self.vtab.set_limits(self.vaxis.lo, self.vaxis.hi)
             if self.regular_grid:
@@ -1442,6 +2005,8 @@ class NXPlotView(QtWidgets.QDialog):
             ax.set_ylim(ymax, ymin)
         else:
             ax.set_ylim(ymin, ymax)
+        self.update_lod()
+        self.update_decimation()
         ax.set_xlabel(self.xaxis.label)
         ax.set_ylabel(self.yaxis.label)
         self.otab.push_current()
@@ -1485,30 +2050,49 @@ class NXPlotView(QtWidgets.QDialog):
 
     def grid_helper(self):
         """Define the locator used in skew transforms."""
-        locator = MaxNLocator(nbins=9, steps=[1, 2, 2.5, 5, 10])
-        self._grid_helper = GridHelperCurveLinear((self.transform,
-                                                   self.inverse_transform),
-                                                  grid_locator1=locator,
-                                                  grid_locator2=locator)
+        self._grid_helper = skew_grid_helper(self.transform,
+                                             self.inverse_transform)
         return self._grid_helper
 
     def transform(self, x, y):
         """Return the x and y values transformed by the skew angle."""
-        if x is None or y is None or not self.skewed:
+        if not self.skewed:
             return x, y
         else:
-            x, y = np.asarray(x), np.asarray(y)
-            angle = np.radians(self.skew)
-            return 1.*x+np.cos(angle)*y,  np.sin(angle)*y
+            return skew_coordinates(x, y, self.skew)
+
+    def skew_transform(self):
+        """
+        Return the affine transform that applies the skew angle.
+
+        This is used to plot skewed images on a regular grid with
+        'imshow', rather than converting them to a quadrilateral mesh.
+        """
+        return skew_transform(self.skew)
+
+    def skewed_mesh(self):
+        """
+        Return the skewed mesh of the bin boundaries.
+
+        This is used to plot skewed images with 'pcolormesh' when the
+        axes are not equally spaced. The mesh is cached until the
+        axes, skew angle, or aspect ratio are changed.
+        """
+        key = (self.skew, self._aspect)
+        if self._skewed_mesh is not None:
+            x, y, cached_key, mesh = self._skewed_mesh
+            if x is self.x and y is self.y and cached_key == key:
+                return mesh
+        mesh = self.transform(*np.meshgrid(self.x, self.y))
+        self._skewed_mesh = (self.x, self.y, key, mesh)
+        return mesh
 
     def inverse_transform(self, x, y):
         """Return the inverse transform of the x and y values."""
-        if x is None or y is None or not self.skewed:
+        if not self.skewed:
             return x, y
         else:
-            x, y = np.asarray(x), np.asarray(y)
-            angle = np.radians(self.skew)
-            return 1.*x-y/np.tan(angle),  y/np.sin(angle)
+            return unskew_coordinates(x, y, self.skew)
 
     def set_log_axis(self, name):
         """Set x and y axis scales when the log option is on or off."""
@@ -1533,40 +2117,93 @@ class NXPlotView(QtWidgets.QDialog):
             self.update_panels()
             self.draw()
 
+    def smooth_function(self, num):
+        """
+        Return the cubic interpolant used to smooth a 1D plot.
+
+        The interpolant is only constructed when smoothing is first
+        requested and is then stored with the plot.
+
+        Parameters
+        ----------
+        num : int
+            Number of the plot.
+
+        Returns
+        -------
+        scipy.interpolate.interp1d
+            Cubic interpolant of the plotted data, or None if the data
+            cannot be interpolated.
+        """
+        p = self.plots[num]
+        if p['smooth_function'] is None:
+            try:
+                p['smooth_function'] = interp1d(p['x'], p['y'], kind='cubic')
+            except Exception:
+                p['smooth_function'] = False
+        return p['smooth_function'] or None
+
     def plot_smooth(self):
-        """Add smooth line to 1D plot."""
+        """
+        Add smooth line to 1D plot.
+
+        Each smooth line is evaluated over the visible x-range, extended
+        by its width on either side, with a number of points set by the
+        width of the canvas. The line is only recomputed if the plot is
+        panned outside that range or zoomed by more than a factor of 2.
+        """
         num = self.num
-        if self.plots[num]['smooth_function']:
+        if self.smooth_function(num):
             self.plots[num]['smoothing'] = self.ytab.smoothing
         else:
             raise NeXusError("Unable to smooth this data")
+        xs_min, xs_max = self.ax.get_xlim()
+        ys_min, ys_max = self.ax.get_ylim()
+        lo, hi = min(xs_min, xs_max), max(xs_min, xs_max)
+        try:
+            columns = max(int(self.ax.bbox.width), 100)
+        except Exception:
+            columns = 500
+        step = (hi - lo) / (2 * columns)
         for num in self.plots:
             p = self.plots[num]
-            if p['smooth_line']:
-                p['smooth_line'].remove()
-            xs_min, xs_max = self.ax.get_xlim()
-            ys_min, ys_max = self.ax.get_ylim()
-            if (p['smoothing'] and p['smooth_function'] and
-                    xs_min < p['x'].max() and xs_max > p['x'].min()):
+            x_min, x_max = p['x'].min(), p['x'].max()
+            if (p['smoothing'] and lo < x_max and hi > x_min and
+                    self.smooth_function(num)):
                 p['plot'].set_linestyle('None')
-                xs = np.linspace(max(xs_min, p['x'].min()),
-                                 min(xs_max, p['x'].max()), 1000)
                 if p['linestyle'] == 'None':
                     p['smooth_linestyle'] = '-'
                 elif p['linestyle'].startswith('steps'):
                     p['smooth_linestyle'] = '-'
                 else:
                     p['smooth_linestyle'] = p['linestyle']
-                p['smooth_line'] = self.ax.plot(xs,
-                                                p['smooth_function'](xs),
-                                                p['smooth_linestyle'])[0]
-                self.ax.set_xlim(xs_min, xs_max)
-                self.ax.set_ylim(ys_min, ys_max)
+                window = p['smooth_window']
+                if (p['smooth_line'] is None or window is None or
+                        window[0] > max(lo, x_min) or
+                        window[1] < min(hi, x_max) or
+                        not 0.5 * step <= window[2] <= 2 * step):
+                    if p['smooth_line']:
+                        p['smooth_line'].remove()
+                    w_min = max(lo - (hi - lo), x_min)
+                    w_max = min(hi + (hi - lo), x_max)
+                    xs = np.linspace(w_min, w_max,
+                                     int((w_max - w_min) / step) + 2)
+                    p['smooth_line'] = self.ax.plot(
+                        xs, p['smooth_function'](xs),
+                        p['smooth_linestyle'])[0]
+                    p['smooth_window'] = (w_min, w_max, xs[1] - xs[0])
+                    self.ax.set_xlim(xs_min, xs_max)
+                    self.ax.set_ylim(ys_min, ys_max)
+                else:
+                    p['smooth_line'].set_linestyle(p['smooth_linestyle'])
                 p['smooth_line'].set_color(p['color'])
                 p['smooth_line'].set_label('_smooth_line_' + str(num))
             else:
+                if p['smooth_line']:
+                    p['smooth_line'].remove()
                 p['plot'].set_linestyle(p['linestyle'])
                 p['smooth_line'] = None
+                p['smooth_window'] = None
         self.draw()
 
     def fit_data(self):
@@ -1686,8 +2323,9 @@ class NXPlotView(QtWidgets.QDialog):
             if autoscale:
                 logv = self.logv
                 try:
-                    self.vaxis.min = self.vaxis.lo = np.min(self.finite_v)
-                    self.vaxis.max = self.vaxis.hi = np.max(self.finite_v)
+                    self.vaxis.lo, self.vaxis.hi = self.data_limits()
+                    self.vaxis.min = self.statistics.min
+                    self.vaxis.max = self.statistics.max
                 except Exception:
                     self.vaxis.min = self.vaxis.lo = 0.0
                     self.vaxis.max = self.vaxis.hi = 0.1
@@ -1742,21 +2380,7 @@ class NXPlotView(QtWidgets.QDialog):
         """
         if self.image and self._aspect == 'equal':
             self.otab._actions['set_aspect'].setChecked(True)
-            _axes = self.plotdata.nxaxes
-            try:
-                if ('scaling_factor' in _axes[-1].attrs and
-                        'scaling_factor' in _axes[-2].attrs):
-                    _xscale = _axes[-1].attrs['scaling_factor']
-                    _yscale = _axes[-2].attrs['scaling_factor']
-                    return float(_yscale / _xscale)
-                elif 'scaling_factor' in _axes[-1].attrs:
-                    return 1.0 / _axes[-1].attrs['scaling_factor']
-                elif 'scaling_factor' in _axes[-2].attrs:
-                    return _axes[-2].attrs['scaling_factor']
-                else:
-                    return 'equal'
-            except Exception:
-                return 'equal'
+            return scaled_aspect(self.plotdata.nxaxes)
         elif self._aspect == 'auto':
             self.otab._actions['set_aspect'].setChecked(False)
         else:
@@ -2007,10 +2631,8 @@ class NXPlotView(QtWidgets.QDialog):
         """
         if self.regular_grid:
             return interpolations
-        elif "convolve" in interpolations:
-            return interpolations[:2]
         else:
-            return interpolations[:1]
+            return interpolations[:2]
 
     @property
     def interpolation(self):
@@ -2028,7 +2650,7 @@ class NXPlotView(QtWidgets.QDialog):
             if self.interpolation == 'convolve':
                 self.plot_image()
             elif self.regular_grid:
-                self.image.set_data(self.plotdata.nxsignal.nxdata)
+                self.update_lod(force=True)
                 self.image.set_interpolation(self.interpolation)
             self.draw()
             self.update_panels()
@@ -2129,17 +2751,313 @@ class NXPlotView(QtWidgets.QDialog):
     def regular_grid(self):
         """Return whether it is possible to use 'imshow'.
 
-        If both the x and y axes are equally spaced and there is no skew
-        angle, the Matplotlib imshow function is used for 2D plots.
-        Otherwise, pcolormesh is used.
+        If both the x and y axes are equally spaced, the Matplotlib
+        imshow function is used for 2D plots. If there is a skew angle,
+        the image is drawn with an affine transform. Otherwise,
+        pcolormesh is used.
         """
         try:
             return (self.xaxis.equally_spaced and
-                    self.yaxis.equally_spaced
-                    and not self.skewed)
+                    self.yaxis.equally_spaced)
         except Exception:
             return False
 
+    @property
+    def lod(self):
+        """
+        The method used to reduce large images to the screen resolution.
+
+        If set to 'mean' or 'max', images plotted on a regular grid are
+        replaced by reduced copies, in which each pixel combines a block
+        of data pixels, whenever the visible range contains more data
+        pixels than there are screen pixels. The reduced images form a
+        pyramid of power-of-two levels, which are computed when first
+        needed and retained until the data change. The full-resolution
+        image is only displayed when zoomed in far enough. A value of
+        True is equivalent to 'mean'. The default is None, which turns
+        level-of-detail rendering off.
+        """
+        return self._lod
+
+    @lod.setter
+    def lod(self, value):
+        if value is True:
+            value = 'mean'
+        elif not value or str(value).lower() in ['off', 'none']:
+            value = None
+        else:
+            value = str(value).lower()
+            if value not in ['mean', 'max']:
+                raise NeXusError(
+                    "Level-of-detail method must be 'mean' or 'max'")
+        if value == self._lod:
+            return
+        self._lod = value
+        self._lod_levels = {}
+        if self.update_lod(force=True):
+            self.draw()
+
+    def lod_factor(self):
+        """
+        Return the image reduction factor for the current view.
+
+        The factor is the largest power of two that does not exceed the
+        number of visible data pixels per screen pixel along the more
+        finely resolved image dimension. A value of 1 means that the
+        full-resolution image should be displayed.
+        """
+        try:
+            ny, nx = self.v.shape
+            bbox = self.ax.get_window_extent()
+            xlo, xhi = self.xaxis.get_limits()
+            ylo, yhi = self.yaxis.get_limits()
+            left, right, bottom, top = self._extent
+            fx = nx * abs(xhi - xlo) / abs(right - left) / bbox.width
+            fy = ny * abs(yhi - ylo) / abs(top - bottom) / bbox.height
+            factor = min(fx, fy)
+        except Exception:
+            return 1
+        if not np.isfinite(factor) or factor < 2.0:
+            return 1
+        else:
+            return 2 ** int(np.log2(factor))
+
+    def lod_image(self, factor):
+        """
+        Return the plotted signal reduced by the given factor.
+
+        Parameters
+        ----------
+        factor : int
+            Power of two defining the number of data pixels along each
+            dimension combined into a single image pixel.
+        """
+        if self._lod_levels.get(1) is not self.v:
+            self._lod_levels = {1: self.v}
+        level = max(f for f in self._lod_levels if f <= factor)
+        while level < factor:
+            self._lod_levels[2*level] = reduce_image(
+                self._lod_levels[level], 2, method=self.lod)
+            level *= 2
+        return self._lod_levels[factor]
+
+    def update_lod(self, force=False):
+        """
+        Display the image level that matches the current view.
+
+        This is called whenever the image data or axis limits change.
+        If level-of-detail rendering is off, the full-resolution image
+        is displayed. The reduced images are kept when zooming in to
+        the full resolution, so that they do not have to be recomputed
+        when zooming out again, until the image data change.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the image data are reset even if the reduction
+            factor is unchanged, e.g., because the data have changed.
+
+        Returns
+        -------
+        bool
+            True if the image data were updated.
+        """
+        if (self.image is None or self.rgb_image or self._extent is None
+                or not self.regular_grid):
+            return False
+        if self._lod_levels.get(1) is not self.v:
+            self._lod_levels = {}
+        if self.lod:
+            factor = self.lod_factor()
+        else:
+            factor = 1
+        if factor == self._lod_factor and not force:
+            return False
+        left, right, bottom, top = self._extent
+        if factor > 1:
+            v = self.lod_image(factor)
+            ny, nx = self.v.shape
+            right = left + (right - left) * factor * v.shape[1] / nx
+            top = bottom + (top - bottom) * factor * v.shape[0] / ny
+        else:
+            v = self.v
+        self.image.set_data(v)
+        self.image.set_extent((left, right, bottom, top))
+        self._lod_factor = factor
+        return True
+
+    @property
+    def decimate(self):
+        """
+        Whether dense line plots are decimated to the screen resolution.
+
+        If True, one-dimensional plots without error bars, which contain
+        more than 'decimation_threshold' visible points, are drawn using
+        only the first, last, minimum and maximum points within each
+        pixel column of the visible x-range. The points are selected
+        again whenever the axis limits change, and all the points are
+        drawn when few enough are visible. The default is False.
+        """
+        return self._decimate
+
+    @decimate.setter
+    def decimate(self, value):
+        value = bool(value)
+        if value == self._decimate:
+            return
+        self._decimate = value
+        if self.update_decimation(force=True):
+            self.draw()
+
+    def update_decimation(self, force=False):
+        """
+        Select the points of each line plot that match the current view.
+
+        This is called whenever the x-axis limits change. If decimation
+        is off, or the x-axis is not linear, all the points are plotted.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the points are selected even if the x-axis limits
+            and plot width are unchanged, e.g., because a plot has been
+            added.
+
+        Returns
+        -------
+        bool
+            True if the plotted points of any line were updated.
+        """
+        if self.ndim != 1 or self.image is not None:
+            return False
+        try:
+            xmin, xmax = self.ax.get_xlim()
+            columns = int(self.ax.bbox.width)
+            linear = self.ax.get_xscale() == 'linear'
+        except Exception:
+            return False
+        view = (xmin, xmax, columns, linear)
+        if view == self._decimation_view and not force:
+            return False
+        self._decimation_view = view
+        updated = False
+        for p in self.plots.values():
+            if 'decimation' not in p:
+                continue
+            if self.decimate and linear:
+                index = decimate_line(p['x'], p['y'], xmin, xmax, columns,
+                                      threshold=self.decimation_threshold)
+            else:
+                index = None
+            if index is None and p['decimation'] is None:
+                continue
+            p['decimation'] = index
+            x, y = p['x'], p['y'] * p['scale'] + p['offset']
+            if index is not None:
+                x, y = x[index], y[index]
+            p['plot'].set_data(x, y)
+            updated = True
+        return updated
+
+    def get_blit_state(self):
+        """
+        Return the state of the figure outside the image pixels.
+
+        If this is unchanged since the last update, only the image
+        needs to be redrawn.
+        """
+        ax = self.ax
+        return (self.image, ax.get_xlim(), ax.get_ylim(), self.vaxis.lo,
+                self.vaxis.hi, self.vtab.log, self.vtab.symmetric,
+                self.cmap, self.interpolation, self.image.get_extent(),
+                self.canvas.get_width_height(), self._grid, self._minorgrid)
+
+    def blit_image(self):
+        """
+        Redraw the image without redrawing the rest of the figure.
+
+        This is called by replot_data when only the image pixels have
+        changed, e.g., when stepping through z-axis slices of data on a
+        regular grid with fixed axis and color limits. The figure is
+        drawn once without the image to store the static background,
+        i.e., the axis labels, tick labels and colorbar. Subsequent
+        updates restore the background and only redraw the image and
+        any artists drawn over it. The background is discarded whenever
+        the figure is redrawn in full.
+
+        Returns
+        -------
+        bool
+            True if the image was redrawn, or False if the full figure
+            needs to be redrawn.
+        """
+        if (not self.blit or self.image is None or self.rgb_image
+                or not getattr(self.canvas, 'supports_blit', False)):
+            self._blit_state = None
+            return False
+        previous_state = self._blit_state
+        try:
+            self.set_data_limits()
+            state = self.get_blit_state()
+        except Exception:
+            self._blit_state = None
+            return False
+        self._blit_state = state
+        if state != previous_state:
+            return False
+        ax = self.ax
+        self._blitting = True
+        try:
+            artists = self.foreground_artists()
+            if self._background is None:
+                for artist in artists:
+                    artist.set_visible(False)
+                try:
+                    self.canvas.draw()
+                finally:
+                    for artist in artists:
+                        artist.set_visible(True)
+                self._background = self.canvas.copy_from_bbox(
+                    self.figure.bbox)
+            with self.timings.stage('blit'):
+                self.canvas.restore_region(self._background)
+                for artist in artists:
+                    ax.draw_artist(artist)
+                self.canvas.blit(ax.bbox)
+        except Exception:
+            self._background = self._blit_state = None
+            return False
+        finally:
+            self._blitting = False
+        self.update_panels()
+        return True
+
+    def foreground_artists(self):
+        """
+        Return the artists to be redrawn after blitting the image.
+
+        These are the image itself and any artists that are drawn over
+        it, i.e., lines, patches, collections, text, gridlines, tick
+        marks and the axes frame, sorted by their z-order.
+        """
+        ax = self.ax
+        artists = [self.image]
+        for artist in (ax.lines + ax.patches + ax.collections + ax.texts +
+                       ax.images + list(ax.spines.values())):
+            if artist is not self.image and artist.get_visible():
+                artists.append(artist)
+        for axis in (ax.xaxis, ax.yaxis):
+            if axis.get_visible():
+                lo, hi = sorted(axis.get_view_interval())
+                for tick in axis.get_major_ticks() + axis.get_minor_ticks():
+                    if not lo <= tick.get_loc() <= hi:
+                        continue
+                    for line in (tick.gridline, tick.tick1line,
+                                 tick.tick2line):
+                        if line.get_visible():
+                            artists.append(line)
+        return sorted(artists, key=lambda artist: artist.get_zorder())
+
     def get_size(self):
         """Return the size of the NXPlotView figure."""
         return tuple(self.figure.get_size_inches())
@@ -2189,8 +3107,18 @@ class NXPlotView(QtWidgets.QDialog):
             else:
                 labels = [p['legend_label'] for p in plots]
             order = [int(p['legend_order']) for p in plots]
-            handles = list(zip(*sorted(zip(order, handles))))[1]
-            labels = list(zip(*sorted(zip(order, labels))))[1]
+            if plots:
+                handles = list(zip(*sorted(zip(order, handles))))[1]
+                labels = list(zip(*sorted(zip(order, labels))))[1]
+            m = self._multilines
+            if m is not None:
+                line = self.plots[m['num']]['plot']
+                handles = list(handles) + [
+                    Line2D([], [], color=color,
+                           linewidth=line.get_linewidth(),
+                           linestyle=line.get_linestyle())
+                    for color in m['colors'][1:]]
+                labels = list(labels) + m['labels'][1:]
         elif len(items) == 1:
             handles, _ = self.ax.get_legend_handles_labels()
             labels = items[0]
@@ -2674,15 +3602,24 @@ class NXPlotView(QtWidgets.QDialog):
         """
         Output Voronoi plot based z(x,y) where x and y are bin centers.
 
+        The Voronoi regions are drawn as a single PolyCollection, whose
+        colors are set by the plot's norm and colormap, so that changing
+        the signal limits does not require the regions to be rebuilt.
+
         Parameters
         ----------
         x, y : NXfield
-            x and y values of pixel centers - one-dimensional
+            x and y values of pixel centers - two-dimensional
         z : NXfield
             intensity of pixels - two-dimensional
+        **opts : dict
+            Options for the region boundaries ('line_colors' and
+            'line_width') and for displaying the pixel centers
+            ('show_points' and 'point_size') and the region vertices
+            ('show_vertices').
         """
         self.signal = z
-        self.axes = [y.average(1), x.average(0)]
+        self.axes = [y.average(axis=1), x.average(axis=0)]
         self.x = self.axes[1].nxdata
         self.y = self.axes[0].nxdata
         self.v = self.signal.nxdata
@@ -2693,30 +3630,40 @@ class NXPlotView(QtWidgets.QDialog):
         self.figure.clf()
         x, y, z = x.nxdata, y.nxdata, z.nxdata
 
-        from scipy.spatial import Voronoi, voronoi_plot_2d
-        vor = Voronoi([(x[i, j], y[i, j]) for i in range(z.shape[0])
-                       for j in range(z.shape[1])])
-        if 'show_vertices' not in opts:
-            opts['show_vertices'] = False
-        if 'show_points' not in opts:
-            opts['show_points'] = False
-        if 'line_width' not in opts:
-            opts['line_width'] = 0.2
-        voronoi_plot_2d(vor, ax=self.ax, **opts)
-        z = z.flatten()
+        from matplotlib.collections import PolyCollection
+        from scipy.spatial import Voronoi
+        points = np.column_stack((np.ravel(x), np.ravel(y)))
+        vor = Voronoi(points)
+        z = np.ravel(z)
         self.vaxis.min = self.vaxis.lo = z.min()
         self.vaxis.max = self.vaxis.hi = z.max()
         self.set_data_norm()
-        from matplotlib.cm import ScalarMappable
-        mapper = ScalarMappable(norm=self.norm, cmap=self.cmap)
-        mapper.set_array(z)
-        for r in range(len(vor.point_region)):
-            region = vor.regions[vor.point_region[r]]
-            polygon = [vor.vertices[i] for i in region if i != -1]
-            self.ax.fill(*zip(*polygon), color=mapper.to_rgba(z[r]))
-        self.colorbar = self.figure.colorbar(mapper)
+        regions = [vor.regions[r] for r in vor.point_region]
+        lengths = np.fromiter(map(len, regions), dtype=int,
+                              count=len(regions))
+        indices = np.fromiter(chain.from_iterable(regions), dtype=int,
+                              count=lengths.sum())
+        valid = indices != -1
+        counts = np.bincount(np.repeat(np.arange(len(regions)), lengths),
+                             weights=valid, minlength=len(regions))
+        polygons = np.split(vor.vertices[indices[valid]],
+                            np.cumsum(counts.astype(int))[:-1])
+        self.image = PolyCollection(
+            polygons, array=z, cmap=self.cmap, norm=self.norm,
+            edgecolors=opts.get('line_colors', 'k'),
+            linewidths=opts.get('line_width', 0.2))
+        self.image.set_clim(self.vaxis.lo, self.vaxis.hi)
+        self.ax.add_collection(self.image, autolim=False)
+        if opts.get('show_points', False):
+            self.ax.plot(points[:, 0], points[:, 1], '.',
+                         markersize=opts.get('point_size', None))
+        if opts.get('show_vertices', False):
+            self.ax.plot(vor.vertices[:, 0], vor.vertices[:, 1], 'o')
+        self.colorbar = self.figure.colorbar(self.image, ax=self.ax)
         self.xaxis.lo, self.xaxis.hi = x.min(), x.max()
         self.yaxis.lo, self.yaxis.hi = y.min(), y.max()
+        self.ax.set_xlim(self.xaxis.lo, self.xaxis.hi)
+        self.ax.set_ylim(self.yaxis.lo, self.yaxis.hi)
         self.ax.set_xlabel(self.xaxis.label)
         self.ax.set_ylabel(self.yaxis.label)
         self.ax.set_title('Voronoi Plot')
@@ -2892,6 +3839,7 @@ class NXPlotView(QtWidgets.QDialog):
             self.vtab.set_range()
             self.vtab.set_limits(self.vaxis.lo, self.vaxis.hi)
             self.vtab.set_sliders(self.vaxis.lo, self.vaxis.hi)
+            self.vtab.globalbutton.setVisible(self.ndim > 2)
         self.ptab.update_parameters()
         self.block_signals(False)
 
@@ -2993,21 +3941,21 @@ class NXPlotView(QtWidgets.QDialog):
                 return f'x={x:.4g} y={y:.4g}'
             else:
                 x, y = self.inverse_transform(x, y)
-                if self.xaxis.reversed:
-                    col = np.searchsorted(x-self.xaxis.boundaries, 0.0) - 1
-                else:
-                    col = np.searchsorted(self.xaxis.boundaries-x, 0.0) - 1
-                if self.yaxis.reversed:
-                    row = np.searchsorted(y-self.yaxis.boundaries, 0.0) - 1
+                col = self.xaxis.index(x)
+                row = self.yaxis.index(y)
+                ny, nx = self.v.shape[:2]
+                if 0 <= row < ny and 0 <= col < nx:
+                    z = self.v[row, col]
+                    return f'x={x:.4g} y={y:.4g}\nv={z:.4g}'
                 else:
-                    row = np.searchsorted(self.yaxis.boundaries-y, 0.0) - 1
-                z = self.v[row, col]
-                return f'x={x:.4g} y={y:.4g}\nv={z:.4g}'
+                    return f'x={x:.4g} y={y:.4g}'
         except Exception:
             return ''
 
     def close_view(self):
         """Remove this window from menus and close associated panels."""
+        self.prefetcher.shutdown()
+        self.stop_global_limits()
         self.remove_menu_action()
         if self.label in plotviews:
             del plotviews[self.label]
@@ -3024,162 +3972,265 @@ class NXPlotView(QtWidgets.QDialog):
         super().close()
 
 
-class NXPlotAxis:
-    """Class containing plotted axis values and limits.
+class NXSliceCache:
+    """
+    Least-recently-used cache of projected data slices.
+
+    The size of each slice is estimated from the total number of bytes
+    in its fields. When the total size exceeds the budget, the least
+    recently used slices are discarded.
 
     Parameters
     ----------
-    axis : NXfield
-        Field containing the axis values and metadata.
-    name : str
-        The axis field name.
-    data : ndarray
-        The axis values.
-    dim : int
-        Dimension value
-    dimlen : int
-        Length of equivalent dimension in the signal array. This is used
-        to determine if the axis values are bin centers or boundaries.
+    maxsize : float, optional
+        Maximum total size of the cached slices in MB. A value of 0
+        disables caching. The default is 256.
+    """
 
-    Attributes
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._nbytes = 0
+
+    def __repr__(self):
+        return f'NXSliceCache(maxsize={self.maxsize})'
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    @property
+    def maxsize(self):
+        """The maximum total size of the cached slices in MB."""
+        return self._maxbytes / 1e6
+
+    @maxsize.setter
+    def maxsize(self, value):
+        try:
+            self._maxbytes = max(float(value), 0.0) * 1e6
+        except (ValueError, TypeError):
+            raise NeXusError("Invalid slice cache size")
+        if hasattr(self, '_cache'):
+            self.trim()
+
+    @property
+    def nbytes(self):
+        """The total number of bytes in the cached slices."""
+        return self._nbytes
+
+    @staticmethod
+    def size(data):
+        """Return the number of bytes in the fields of an NXdata group."""
+        return sum(getattr(data[name].nxdata, 'nbytes', 0) for name in data
+                   if isinstance(data[name], NXfield))
+
+    def get(self, key):
+        """Return the cached slice or None if it is not in the cache."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key][0]
+        else:
+            return None
+
+    def put(self, key, data):
+        """Add a slice to the cache, discarding old slices if necessary."""
+        nbytes = self.size(data)
+        if nbytes > self._maxbytes:
+            return
+        if key in self._cache:
+            self._nbytes -= self._cache.pop(key)[1]
+        self._cache[key] = (data, nbytes)
+        self._nbytes += nbytes
+        self.trim()
+
+    def trim(self):
+        """Discard the least recently used slices until within budget."""
+        while self._cache and self._nbytes > self._maxbytes:
+            _, (_, nbytes) = self._cache.popitem(last=False)
+            self._nbytes -= nbytes
+
+    def clear(self):
+        """Empty the cache."""
+        self._cache.clear()
+        self._nbytes = 0
+
+
+class NXPrefetcher:
+    """
+    Loader of data slices with a cache and background prefetching.
+
+    Slices are defined by the projection axes and limits passed to the
+    NXdata 'project' function. Slices that have already been plotted
+    are retrieved from an LRU cache. Slices that are about to be
+    plotted, e.g., during z-axis playback, can be loaded by a worker
+    thread into a bounded buffer. Reads of the same file from the GUI
+    thread and from background threads are serialized by the lock
+    returned by ``file_lock``, since HDF5 file access is not
+    thread-safe.
+
+    Parameters
     ----------
-    name : str
-        Axis name.
-    data : ndarray
-        Array of axis values.
-    dim : int
-        No. of the axis dimensions (not currently used).
-    reversed : bool
-        True if the axis values fall with increasing array index.
-    equally_spaced : bool
-        True if the axis values are regularly spaced.
+    slices : int, optional
+        Number of slices to load on each side of the currently plotted
+        slice. The buffer retains twice this number. A value of 0 disables
+        prefetching. The default is 4.
+    workers : int, optional
+        Number of worker threads. The default is 1.
+    cache_size : float, optional
+        Maximum size of the slice cache in MB. The default is 256.
     """
 
-    def __init__(self, axis, dim=None, dimlen=None):
+    def __init__(self, slices=4, workers=1, cache_size=256):
+        self.slices = slices
+        self.workers = workers
+        self.cache = NXSliceCache(cache_size)
+        self._executor = None
+        self._buffer = OrderedDict()
+
+    def __repr__(self):
+        return f'NXPrefetcher(slices={self.slices})'
+
+    def __len__(self):
+        return len(self._buffer)
+
+    @staticmethod
+    def key(data, axes, limits, weighted=False):
+        """
+        Return the key used to identify a slice.
+
+        The key contains the signal path, the modification time of the
+        file containing the data, if any, the projection axes and
+        limits, and whether the data are weighted. Changes to the file
+        therefore invalidate any slices that were previously stored.
         """
-        Initialize a plotted axis.
+        root = data.nxroot
+        return (root.nxname + data.nxsignal.nxpath,
+                getattr(root, 'mtime', None), tuple(axes),
+                tuple(tuple(lim) for lim in limits), bool(weighted))
+
+    def load(self, data, axes, limits, weighted=False):
+        """
+        Return the projection of the data with the given limits.
+
+        This is called in a worker thread for prefetched slices, and in
+        the GUI thread for slices that are not cached.
+        """
+        with file_lock(data):
+            result = data.project(axes, limits)
+            if weighted:
+                result = result.weighted_data()
+        return result
+
+    def get(self, data, axes, limits, weighted=False):
+        """
+        Return a slice, loading it if it is not already available.
+
+        The slice is retrieved from the cache, the prefetch buffer,
+        waiting for it to be loaded if necessary, or read directly, in
+        that order. It is then stored in the cache.
+        """
+        key = self.key(data, axes, limits, weighted)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        future = self._buffer.pop(key, None)
+        if future is not None and not future.cancelled():
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+        if result is None:
+            result = self.load(data, axes, limits, weighted)
+        self.cache.put(key, result)
+        return result
+
+    def prefetch(self, data, requests, weighted=False):
+        """
+        Queue slices to be loaded in the background.
+
+        Slices that are already cached or queued are skipped.
 
         Parameters
         ----------
-        axis : NXfield
-            Field containing the axis values and metadata.
-        dim : int
-            No. of the axis dimensions (not currently used).
-        dimlen : int
-            Length of equivalent dimension in the signal array. This is
-            used to determine if the axis values are bin centers or
-            boundaries.
-        """
-        self.name = axis.nxname
-        self.data = axis.nxdata
-        self.dim = dim
-        self.reversed = False
-        self.equally_spaced = True
-        self.qualitative_data = False
-        if self.data is not None:
-            if dimlen is None:
-                self.centers = None
-                self.boundaries = None
-                try:
-                    self.min = float(np.min(self.data[np.isfinite(self.data)]))
-                    self.max = float(np.max(self.data[np.isfinite(self.data)]))
-                except Exception:
-                    self.min = 0.0
-                    self.max = 0.1
-                if ((self.min >= 0 and self.max <= 20) and
-                    (np.issubdtype(self.data.dtype, np.integer) or
-                     np.all(np.equal(np.mod(self.data, 1.0), 0)))):
-                    self.qualitative_data = True
+        data : NXdata
+            Data to be projected.
+        requests : list of tuples
+            List of (axes, limits) tuples defining each slice.
+        weighted : bool, optional
+            If True, the slices are divided by the weights.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='nxprefetch')
+        for axes, limits in requests:
+            key = self.key(data, axes, limits, weighted)
+            if key in self.cache:
+                continue
+            elif key in self._buffer:
+                self._buffer.move_to_end(key)
             else:
-                if self.data[0] > self.data[-1]:
-                    self.reversed = True
-                _spacing = self.data[1:] - self.data[:-1]
-                _range = self.data.max() - self.data.min()
-                if _spacing.size > 0:
-                    if max(_spacing) - min(_spacing) > _range/1000:
-                        self.equally_spaced = False
-                self.centers = centers(self.data, dimlen)
-                self.boundaries = boundaries(self.data, dimlen)
-                try:
-                    self.min = float(np.min(
-                        self.boundaries[np.isfinite(self.boundaries)]))
-                    self.max = float(np.max(
-                        self.boundaries[np.isfinite(self.boundaries)]))
-                except Exception:
-                    self.min = 0.0
-                    self.max = 0.1
-        else:
-            self.centers = None
-            self.boundaries = None
-            self.min = None
-            self.max = None
-        self.min_data = self.min
-        self.max_data = self.max
-        self.lo = None
-        self.hi = None
-        self.diff = 0.0
-        self.locked = True
-        if 'long_name' in axis.attrs:
-            self.label = axis.attrs['long_name']
-        elif 'units' in axis.attrs:
-            self.label = f"{axis.nxname} ({axis.units})"
-        else:
-            self.label = axis.nxname
+                self._buffer[key] = self._executor.submit(
+                    self.load, data, axes, limits, weighted)
+        while len(self._buffer) > 2 * self.slices:
+            _, future = self._buffer.popitem(last=False)
+            future.cancel()
 
-    def __repr__(self):
-        return f'NXPlotAxis("{self.name}")'
-
-    def set_data(self, axis, dimlen=None):
-        """
-        Initialize the axis data values.
-
-        This also determines if the values are all equally spaced,
-        which is used to determine the Matplotlib image function, and
-        stores the bin centers and boundaries of the axis values,
-        whether stored as histograms or not.
-        """
-        self.data = axis.nxdata
-        self.reversed = False
-        if dimlen is not None:
-            if self.data[0] > self.data[-1]:
-                self.reversed = True
-            _spacing = self.data[1:] - self.data[:-1]
-            _range = self.data.max() - self.data.min()
-            if _spacing.size > 0:
-                if max(_spacing) - min(_spacing) > _range/1000:
-                    self.equally_spaced = False
-            self.centers = centers(self.data, dimlen)
-            self.boundaries = boundaries(self.data, dimlen)
+    def clear(self):
+        """Cancel pending loads and empty the buffer and cache."""
+        for future in self._buffer.values():
+            future.cancel()
+        self._buffer.clear()
+        self.cache.clear()
 
-    def set_limits(self, lo, hi):
-        """Set the low and high values for the axis."""
-        if lo > hi:
-            lo, hi = hi, lo
-        self.lo, self.hi = lo, hi
-        self.diff = float(hi) - float(lo)
+    def shutdown(self):
+        """Empty the buffer and cache and stop the worker threads."""
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
-    def get_limits(self):
-        """Return the low and high values for the axis."""
-        return float(self.lo), float(self.hi)
 
-    def log_limits(self):
-        """Return limits with positive values."""
-        try:
-            minpos = min(self.data[self.data > 0.0])
-        except ValueError:
-            minpos = 0.01
-        return (minpos if self.lo <= 0 else self.lo,
-                minpos if self.hi <= 0 else self.hi)
+class NXStatisticsWorker(QtCore.QObject):
+    """
+    Worker that computes the statistics of a field in a separate thread.
 
-    @property
-    def min_range(self):
-        """The minimum range for the axis."""
-        return self.max_range*1e-6
+    Parameters
+    ----------
+    field : NXfield
+        Field containing the values.
+    key : tuple
+        Key used to cache the statistics, which is returned with them.
+    """
 
-    @property
-    def max_range(self):
-        """The maximum range for the axis."""
-        return self.max - self.min
+    progress = QtCore.Signal(int)
+    finished = QtCore.Signal(object, object)
+
+    def __init__(self, field, key=None):
+        super().__init__()
+        self.field = field
+        self.key = key
+        self.cancelled = False
+
+    def report(self, fraction):
+        """Emit the percentage completed and return True if cancelled."""
+        self.progress.emit(int(100 * fraction))
+        return self.cancelled
+
+    def run(self):
+        """
+        Compute the statistics and emit them when finished.
+
+        If the calculation fails, the exception is emitted instead.
+        """
+        try:
+            statistics = NXStatistics.from_field(self.field,
+                                                 callback=self.report)
+        except Exception as error:
+            statistics = NeXusError(str(error))
+        if not self.cancelled:
+            self.finished.emit(self.key, statistics)
 
 
 class NXReplotSignal(QtCore.QObject):
@@ -3286,6 +4337,14 @@ class NXPlotTab(QtWidgets.QWidget):
             widgets.append(self.maxbox)
             widgets.append(self.logbox)
             widgets.append(self.flipbox)
+            if self.name == 'v':
+                self.globalbutton = NXPushButton("Global",
+                                                 self.plotview.global_limits)
+                self.globalbutton.setToolTip(
+                    "Set limits to the range of the whole signal")
+                widgets.append(self.globalbutton)
+            else:
+                self.globalbutton = None
             if self.name == 'y':
                 widgets.append(self.smoothbox)
                 widgets.append(self.fitbutton)
@@ -3399,6 +4458,25 @@ class NXPlotTab(QtWidgets.QWidget):
             self._axis = None
         self.block_signals(False)
 
+    def global_progress(self, value):
+        """
+        Show the progress of the global statistics calculation.
+
+        Parameters
+        ----------
+        value : int or None
+            Percentage completed, or None if the calculation has ended.
+        """
+        if self.globalbutton is None:
+            return
+        elif value is None:
+            self.globalbutton.setText("Global")
+            self.globalbutton.setToolTip(
+                "Set limits to the range of the whole signal")
+        else:
+            self.globalbutton.setText(f"{value}%")
+            self.globalbutton.setToolTip("Cancel the calculation")
+
     def select_plot(self):
         """
         Update the current plot selection.
@@ -3825,14 +4903,10 @@ class NXPlotTab(QtWidgets.QWidget):
         If the color map is available but was not included in the
         default list when NeXpy was launched, it is added to the list.
         """
-        global cmaps
         if cmap is None:
             cmap = self._cached_cmap
         try:
-            if Version(mpl.__version__) >= Version('3.5.0'):
-                cm = copy.copy(mpl.colormaps[cmap])
-            else:
-                cm = copy.copy(get_cmap(cmap))
+            cm = colormap(cmap)
         except ValueError:
             raise NeXusError(f"'{cmap}' is not registered as a color map")
         cmap = cm.name
@@ -3987,7 +5061,7 @@ class NXPlotTab(QtWidgets.QWidget):
         _refresh_icon = resource_icon('refresh-icon.png')
         self.toolbar = QtWidgets.QToolBar()
         self.toolbar.setIconSize(QtCore.QSize(16, 16))
-        self.add_action(_refresh_icon, self.plotview.replot_data, "Replot",
+        self.add_action(_refresh_icon, self.replot, "Replot",
                         checkable=False)
         self.toolbar.addSeparator()
         self.playback_action = self.add_action(_backward_icon,
@@ -3997,10 +5071,26 @@ class NXPlotTab(QtWidgets.QWidget):
         self.playforward_action = self.add_action(_forward_icon,
                                                   self.playforward,
                                                   "Play Forward")
+        self.toolbar.addSeparator()
+        self.add_action(resource_icon('export-figure.png'),
+                        self.export_movie, "Export Movie", checkable=False)
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.slideshow)
         self.playsteps = 0
 
+    def replot(self):
+        """Clear cached slices and replot the data."""
+        self.plotview.clear_cache()
+        self.plotview.replot_data()
+
+    def export_movie(self):
+        """Launch the dialog to export the z-axis slices as a movie."""
+        if self.plotview.ndim < 3:
+            return
+        self.pause()
+        dialog = MovieDialog(self.plotview, parent=self.plotview)
+        dialog.show()
+
     def add_action(self, icon, slot, tooltip, checkable=True):
         """
         Add a toolbar action to the toolbar.
@@ -4029,7 +5119,8 @@ class NXPlotTab(QtWidgets.QWidget):
 
         This is used to create a slideshow of the data. The maximum box
         is stepped by playsteps, which can be positive or negative. If
-        the pause button is checked, the slideshow is paused.
+        the pause button is checked, the slideshow is paused. Otherwise,
+        the next slices are prefetched in a background thread.
         """
         if self.plotview.ndim < 3:
             return
@@ -4037,6 +5128,8 @@ class NXPlotTab(QtWidgets.QWidget):
             self.maxbox.stepBy(self.playsteps)
             if self.maxbox.pause:
                 self.pause()
+            else:
+                self.plotview.prefetch(self.playsteps)
         except Exception as e:
             self.pause()
             raise e
@@ -4061,6 +5154,7 @@ class NXPlotTab(QtWidgets.QWidget):
                 self.interval = 1000
             self.timer.setInterval(self.interval)
             self.timer.start(self.interval)
+            self.plotview.prefetch(self.playsteps)
             self.playback_action.setChecked(True)
             self.playforward_action.setChecked(False)
         except Exception as e:
@@ -4099,6 +5193,7 @@ class NXPlotTab(QtWidgets.QWidget):
                 self.interval = 1000
             self.timer.setInterval(self.interval)
             self.timer.start(self.interval)
+            self.plotview.prefetch(self.playsteps)
             self.playforward_action.setChecked(True)
             self.playback_action.setChecked(False)
         except Exception as e:
@@ -4125,13 +5220,16 @@ class NXProjectionTab(QtWidgets.QWidget):
 
         self.panel_button = NXPushButton("Open Panel", self.open_panel, self)
         self.panel_combo = NXComboBox(slot=self.open_panel,
-                                      items=['Projection', 'Limits', 'Scan'])
+                                      items=['Projection', 'Limits', 'Scan',
+                                             'Timing'])
         self.parameter_combo = NXComboBox(slot=self.update_parameters,
                                           items=['Aspect', 'Skew'])
         self.parameter_box = NXLineEdit(slot=self.set_parameters,
                                         width=60, align='right')
         self.rotation_label = NXLabel('Rotation')
         self.rotation_box = NXTextBox(0.0, width=60, align='right')
+        self.width_label = NXLabel('Width')
+        self.width_box = NXTextBox(0.0, width=60, align='right')
         self.plot_button = NXPushButton("Plot", self.plot, self)
 
         self.layout = QtWidgets.QHBoxLayout()
@@ -4144,6 +5242,8 @@ class NXProjectionTab(QtWidgets.QWidget):
         self.layout.addStretch()
         self.layout.addWidget(self.rotation_label)
         self.layout.addWidget(self.rotation_box)
+        self.layout.addWidget(self.width_label)
+        self.layout.addWidget(self.width_box)
         self.layout.addWidget(self.plot_button)
         self.layout.addStretch()
         self.setLayout(self.layout)
@@ -4152,7 +5252,8 @@ class NXProjectionTab(QtWidgets.QWidget):
         self.setTabOrder(self.panel_button, self.parameter_combo)
         self.setTabOrder(self.parameter_combo, self.parameter_box)
         self.setTabOrder(self.parameter_box, self.rotation_box)
-        self.setTabOrder(self.rotation_box, self.plot_button)
+        self.setTabOrder(self.rotation_box, self.width_box)
+        self.setTabOrder(self.width_box, self.plot_button)
 
     def __repr__(self):
         return f'NXProjectionTab("{self.plotview.label}")'
@@ -4162,14 +5263,14 @@ class NXProjectionTab(QtWidgets.QWidget):
         Open a panel for the selected plotview.
 
         The panel is selected with the :attr:`panel_combo` and can be
-        one of 'Projection', 'Limits', or 'Scan'. The selected panel
-        is either created or reused if it is already open. The panel
-        is first activated for the selected plotview and then raised
-        to the top of the screen.
+        one of 'Projection', 'Limits', 'Scan', or 'Timing'. The selected
+        panel is either created or reused if it is already open. The
+        panel is first activated for the selected plotview and then
+        raised to the top of the screen.
         """
         panel = self.panel_combo.selected
         dialogs = {'Projection': ProjectionDialog, 'Limits': LimitDialog,
-                   'Scan': ScanDialog}
+                   'Scan': ScanDialog, 'Timing': TimingDialog}
         self.plotview.make_active()
         if not self.plotview.mainwindow.panel_is_running(panel):
             self.plotview.panels[panel] = dialogs[panel]()
@@ -4286,7 +5387,7 @@ class NXProjectionTab(QtWidgets.QWidget):
 
     def plot_rotated_line(self, start, end):
         """
-        Plot the rotated line on a new plotview.
+        Plot the data along the rotated line on a new plotview.
 
         The line is rotated by the angle in the rotation box, and is
         drawn from the start point to the end point. The angle is in
@@ -4298,9 +5399,12 @@ class NXProjectionTab(QtWidgets.QWidget):
         drawn in the opposite direction, i.e., from the right to the
         left if the angle is negative.
 
-        The rotated line is plotted on a new plotview with the same
-        aspect ratio as the original plotview. The rotated line is also
-        labeled with the angle of rotation.
+        The data are interpolated along the line, without rotating the
+        rest of the image, and averaged over the perpendicular width in
+        the width box, if it is non-zero. The values are plotted against
+        the x-axis of the rotated data, so that the profiles of parallel
+        lines can be compared on the same plotview. The line is labeled
+        with the angle of rotation.
 
         Parameters
         ----------
@@ -4321,27 +5425,61 @@ class NXProjectionTab(QtWidgets.QWidget):
             aspect = self.plotview.aspect
         xmin, ymin = start
         xmax, ymax = end
-        try:
+        with np.errstate(divide='ignore', invalid='ignore'):
             rotation_angle = np.degrees(np.arctan(aspect * (ymax - ymin) /
                                                   (xmax - xmin)))
-            if np.abs(rotation_angle) < 5.0:
-                rotation_angle = 0.0
-            elif np.abs(np.abs(rotation_angle) - 90.0) < 5.0:
-                rotation_angle = 90.0
-            else:
-                rotation_angle = np.round(rotation_angle / 5.0) * 5.0
-        except ZeroDivisionError:
+        if not np.isfinite(rotation_angle):
+            rotation_angle = 90.0
+        elif np.abs(rotation_angle) < 5.0:
+            rotation_angle = 0.0
+        elif np.abs(np.abs(rotation_angle) - 90.0) < 5.0:
             rotation_angle = 90.0
-        rotation_angle = -rotation_angle
+        else:
+            rotation_angle = np.round(rotation_angle / 5.0) * 5.0
+        rotation_angle = 0.0 - rotation_angle  # avoids a negative zero
         self.rotation_box.setValue(rotation_angle)
         self.plotview.tab_widget.setCurrentWidget(self)
         self.rotation_box.setFocus()
-        rotated_data = self.plotview.rotate(rotation_angle)
-        center = rotated_data.attrs['x0'], rotated_data.attrs['y0']
-        rotated_xmin = rotate_point(start, rotation_angle, center, aspect)[0]
+        try:
+            width = max(self.width_box.value(), 0.0)
+        except ValueError:
+            width = 0.0
+
+        data = self.plotview.plotdata
+        x, y = data.nxaxes[1], data.nxaxes[0]
+        center = (float(x[0] + x[-1]) / 2, float(y[0] + y[-1]) / 2)
+        rotated_xmin, rotated_y = rotate_point(start, rotation_angle, center,
+                                               aspect)
         rotated_xmax = rotate_point(end, rotation_angle, center, aspect)[0]
-        rotated_y = rotate_point(start, rotation_angle, center, aspect)[1]
-        rotated_line = rotated_data[rotated_y]
+        if rotated_xmax < rotated_xmin:
+            rotated_xmin, rotated_xmax = rotated_xmax, rotated_xmin
+        line_start = rotate_point((rotated_xmin, rotated_y), -rotation_angle,
+                                  center, aspect)
+        line_end = rotate_point((rotated_xmax, rotated_y), -rotation_angle,
+                                center, aspect)
+        try:
+            profile = line_profile(data, line_start, line_end, width=width,
+                                   aspect=aspect)
+        except NeXusError as error:
+            report_error("Plotting Rotated Line", error)
+            return
+        if rotation_angle == 0.0:
+            lo, hi = line_start[0], line_end[0]
+            name, long_name = x.nxname, self.plotview.xaxis.label
+        elif rotation_angle == -90.0:
+            lo, hi = line_start[1], line_end[1]
+            name, long_name = y.nxname, self.plotview.yaxis.label
+        else:
+            lo, hi = rotated_xmin, rotated_xmax
+            name = 'rotated_x'
+            long_name = (f"{x.nxname} * cos({rotation_angle}°) - "
+                         f"{y.nxname} * sin({rotation_angle}°)")
+        axis = NXfield(np.linspace(lo, hi, profile.nxsignal.size),
+                       name=name, long_name=long_name)
+        rotated_line = NXdata(profile.nxsignal, axis,
+                              errors=profile.nxerrors,
+                              weights=profile.nxweights,
+                              title=profile.nxtitle)
         rotated_line.nxsignal.attrs['long_name'] = 'Rotated Line'
         label = f"Rotation: {self.plotview.label}"
         if label in plotviews:
@@ -4350,10 +5488,12 @@ class NXProjectionTab(QtWidgets.QWidget):
         else:
             plotview = NXPlotView(label)
             plotview.plot(rotated_line)
-        plotviews[label].xtab.minbox.setValue(rotated_xmin)
-        plotviews[label].xtab.maxbox.setValue(rotated_xmax)
+        plotviews[label].xtab.minbox.setValue(lo)
+        plotviews[label].xtab.maxbox.setValue(hi)
         idx = len(plotviews[label].plots)
         legend_label = f"{rotation_angle:.0f}° y = {rotated_y:.2f}"
+        if width > 0.0:
+            legend_label += f" width = {width:g}"
         plotviews[label].plots[idx]['legend_label'] = legend_label
         plotviews[label].legend()
 
@@ -4397,6 +5537,10 @@ class NXNavigationToolbar(NavigationToolbar2QT):
         self.coordinates = coordinates
         self._actions = {}
         self._subplot_dialog = None
+        self._mouse_event = None
+        self._message_timer = QtCore.QTimer(self)
+        self._message_timer.setSingleShot(True)
+        self._message_timer.timeout.connect(self.update_message)
 
         for text, tooltip_text, image_file, callback in self.toolitems:
             if text is None:
@@ -4569,6 +5713,8 @@ class NXNavigationToolbar(NavigationToolbar2QT):
                 pass
         self.plotview.zoom = {'x': (xmin, xmax),
                               'y': (ymin, ymax)}
+        if self.plotview.update_lod() | self.plotview.update_decimation():
+            self.plotview.draw()
         self.plotview.update_panels()
 
     def _update_view(self):
@@ -4613,6 +5759,8 @@ class NXNavigationToolbar(NavigationToolbar2QT):
         self.plotview.ytab.maxbox.setValue(ymax)
         self.plotview.ytab.set_sliders(ymin, ymax)
         self.plotview.ytab.block_signals(False)
+        if self.plotview.update_lod() | self.plotview.update_decimation():
+            self.plotview.draw()
         if self.plotview.image:
             if isinstance(self.plotview.image.norm, LogNorm):
                 self.plotview.vtab.log = True
@@ -4658,15 +5806,41 @@ class NXNavigationToolbar(NavigationToolbar2QT):
 
     def mouse_move(self, event):
         """
-        Handle a mouse move event by updating the message bar.
-        
-        Also set the focus on the canvas.
+        Handle a mouse move event by updating the cursor.
+
+        The message bar is updated after the next screen refresh.
         """
         try:
             self._update_cursor(event)
         except AttributeError:
             self._set_cursor(event)
+        self._mouse_event = event
+        if not self._message_timer.isActive():
+            self._message_timer.start(self.refresh_interval())
+
+    def refresh_interval(self):
+        """Return the screen refresh interval in milliseconds."""
+        try:
+            rate = self.screen().refreshRate()
+        except (AttributeError, TypeError):
+            rate = 60.0
+        if rate > 0:
+            return max(int(1000.0 / rate), 1)
+        else:
+            return 16
+
+    def update_message(self):
+        """
+        Update the message bar with the coordinates of the last event.
+
+        Mouse move events are coalesced, so that the message is updated
+        at most once per screen refresh.
+        """
+        event, self._mouse_event = self._mouse_event, None
+        if event is None:
+            return
         if event.inaxes and event.inaxes.get_navigate():
+            s = ''
             try:
                 s = self.plotview.format_coord(event.xdata, event.ydata)
             except (ValueError, OverflowError):
@@ -0,0 +1,536 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2026, NeXpy Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file COPYING, distributed with this software.
+# -----------------------------------------------------------------------------
+
+"""
+Render NeXus data to image files without creating any Qt widgets.
+
+The figures are drawn with the same defaults as the NeXpy plotting
+windows, i.e., the axis and signal limits, color norms, skew angles,
+aspect ratios and colormaps are chosen in the same way as
+``NXPlotView.plot``. However, they are drawn on a Matplotlib figure
+attached to the Agg canvas, so that no display is required. Batches of
+figures can be rendered in parallel by a pool of worker processes,
+e.g., to generate standard figures for every frame of a scan::
+
+    from nexpy.gui.render import render_batch
+
+    jobs = [(root['entry/data'][i], {'log': True}) for i in range(100)]
+    render_batch(jobs, filename='frame_{:03d}.png')
+
+Since the workers are started with the 'spawn' method, scripts that
+call ``render_batch`` should be protected by an
+``if __name__ == '__main__':`` clause. Rendered frames can be combined
+into GIF or MP4 movies with ``encode_movie``.
+"""
+import multiprocessing
+import os
+import shutil
+import subprocess
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                as_completed, wait)
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from mpl_toolkits.axisartist import Subplot
+from nexusformat.nexus import NeXusError, NXfield
+
+from .plotting import (NXPlotAxis, NXStatistics, colormap, data_norm,
+                       default_cmap, default_interpolation, image_extent,
+                       image_limits, scaled_aspect, skew_coordinates,
+                       skew_grid_helper, skew_transform, smooth_image,
+                       unskew_coordinates)
+
+
+class NXRenderer:
+    """
+    Plot NXdata groups on a Matplotlib figure without a Qt canvas.
+
+    Parameters
+    ----------
+    figsize : tuple of floats, optional
+        Width and height of the figure in inches. The default is the
+        Matplotlib default.
+    dpi : float, optional
+        Resolution of the figure in dots per inch. The default is the
+        Matplotlib default.
+
+    Attributes
+    ----------
+    figure : matplotlib.figure.Figure
+        The figure containing the plot.
+    ax : matplotlib.axes.Axes
+        The axes of the most recent plot.
+    """
+
+    def __init__(self, figsize=None, dpi=None):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = None
+        self.num = 0
+
+    def plot(self, data, fmt='', xmin=None, xmax=None, ymin=None, ymax=None,
+             vmin=None, vmax=None, **opts):
+        """
+        Plot an NXdata group with optional limits.
+
+        The arguments are the same as those of ``NXPlotView.plot``.
+
+        Parameters
+        ----------
+        data : NXdata
+            Group containing the signal and axes to be plotted. After
+            removing dimensions of size 1, the signal must be one- or
+            two-dimensional.
+        fmt : str, optional
+            Matplotlib format string for 1D plots. The default is
+            circular markers without lines.
+        xmin, xmax, ymin, ymax, vmin, vmax : float, optional
+            Axis and signal limits.
+
+        Other Parameters
+        ----------------
+        over : bool
+            If True, 1D data are plotted over the existing plot.
+        log, logx, logy : bool
+            If True, the signal, x-axis, or y-axis is plotted on a log
+            scale.
+        cmap : str
+            Colormap for 2D plots.
+        interpolation : str
+            Interpolation method for 2D plots, including 'convolve'.
+        smooth : float
+            Standard deviation in pixels of the 'convolve' smoothing.
+        aspect : str or float
+            Aspect ratio, i.e., 'auto', 'equal', or a number. The
+            default is 'auto', unless the axes are skewed.
+        skew : float
+            Angle between the x and y axes. By default, this is read
+            from the 'angles' attribute of the NXdata group.
+        bad : str
+            Color of NaNs and masked pixels.
+        symmetric : bool
+            If True, the signal limits are symmetric about zero.
+        linthresh, linscale : float
+            Parameters of the symmetric log norm.
+        percentiles : tuple of floats
+            Lower and upper percentiles used for the default limits.
+        weights : bool
+            If True, the signal is divided by the weights.
+        colorbar : bool
+            If False, no colorbar is added to 2D plots.
+        title : str
+            Plot title. The default is the title of the NXdata group.
+        opts : dict
+            Any other valid Matplotlib options.
+        """
+        over = opts.pop('over', False)
+        log = opts.pop('log', False)
+        logx = opts.pop('logx', False)
+        logy = opts.pop('logy', False)
+        weights = opts.pop('weights', False)
+        title = opts.pop('title', data.nxtitle)
+
+        signal, axes = self.get_plotdata(data, weights=weights)
+        if signal.ndim == 1:
+            self.plot_points(data, signal, axes[0], fmt=fmt, over=over,
+                             **opts)
+            if not over:
+                self.ax.set_xlim(xmin, xmax)
+                self.ax.set_ylim(ymin, ymax)
+                if logx:
+                    self.ax.set_xscale('log')
+                if log or logy:
+                    self.ax.set_yscale('log')
+        else:
+            if over:
+                raise NeXusError("Only 1D data can be plotted over")
+            self.plot_image(data, signal, axes, xmin=xmin, xmax=xmax,
+                            ymin=ymin, ymax=ymax, vmin=vmin, vmax=vmax,
+                            log=log, **opts)
+        if not over:
+            self.ax.set_title(title)
+        return self.ax
+
+    def get_plotdata(self, data, weights=False):
+        """
+        Return the plotted signal array and axes.
+
+        Dimensions of size 1 are removed and default axes are created
+        if none are defined, as in ``NXPlotView.get_plotdata``.
+        """
+        if data.nxsignal is None:
+            raise NeXusError('No plotting signal defined')
+        elif weights and data.nxweights is None:
+            raise NeXusError('Invalid weights in plot data')
+        shape = data.plot_shape
+        if len(shape) > 2:
+            raise NeXusError(
+                "Can only render 1D and 2D data - please select a slice")
+        if weights:
+            signal = data.weighted_data().nxsignal
+        else:
+            signal = data.nxsignal
+        values = signal.nxdata.reshape(shape)
+        if values.dtype == bool:
+            values = values.astype(np.int8)
+        signal = NXfield(values, name=signal.nxname, attrs=signal.safe_attrs)
+        if data.plot_axes is not None:
+            axes = data.plot_axes
+        else:
+            axes = [NXfield(np.arange(shape[i]), name=f'Axis{i}')
+                    for i in range(len(shape))]
+        return signal, axes
+
+    def plot_points(self, data, signal, axis, fmt='', over=False, **opts):
+        """Plot one-dimensional data, as in ``NXPlotView.plot_points``."""
+        if not over or self.ax is None:
+            self.figure.clf()
+            self.ax = self.figure.add_subplot(1, 1, 1)
+            self.num = 0
+        self.num += 1
+        ax = self.ax
+        xaxis = NXPlotAxis(axis, 0, signal.shape[0])
+        if fmt == '':
+            if 'color' not in opts:
+                colors = mpl.rcParams['axes.prop_cycle'].by_key()['color']
+                opts['color'] = colors[(self.num-1) % len(colors)]
+            if 'marker' not in opts:
+                opts['marker'] = 'o'
+            if 'linestyle' not in opts and 'ls' not in opts:
+                opts['linestyle'] = 'None'
+        if data.nxerrors and data.nxerrors is not data.nxsignal:
+            ax.errorbar(xaxis.centers, signal.nxdata,
+                        data.nxerrors.nxdata.reshape(signal.shape),
+                        fmt=fmt, **opts)
+        elif fmt == '':
+            ax.plot(xaxis.centers, signal.nxdata, **opts)
+        else:
+            ax.plot(xaxis.centers, signal.nxdata, fmt, **opts)
+        if not over:
+            ax.set_xlabel(xaxis.label)
+            ax.set_ylabel(NXPlotAxis(signal).label)
+
+    def plot_image(self, data, signal, axes, xmin=None, xmax=None, ymin=None,
+                   ymax=None, vmin=None, vmax=None, log=False, **opts):
+        """Plot two-dimensional data, as in ``NXPlotView.plot_image``."""
+        cmap = opts.pop('cmap', None) or default_cmap
+        interpolation = opts.pop('interpolation', default_interpolation)
+        smooth = opts.pop('smooth', 2.0)
+        bad = opts.pop('bad', 'black')
+        symmetric = opts.pop('symmetric', False)
+        linthresh = opts.pop('linthresh', None)
+        linscale = opts.pop('linscale', None)
+        percentiles = opts.pop('percentiles', None)
+        colorbar = opts.pop('colorbar', True)
+        skew = opts.pop('skew', None)
+        if skew is None and data.nxangles is not None and data.ndim == 2:
+            skew = float(data.nxangles)
+        if skew is not None and np.isclose(skew, 90.0):
+            skew = None
+        aspect = opts.pop('aspect', 'equal' if skew else 'auto')
+
+        xaxis = NXPlotAxis(axes[-1], 1, signal.shape[1])
+        yaxis = NXPlotAxis(axes[-2], 0, signal.shape[0])
+        v = signal.nxdata
+        statistics = NXStatistics(v)
+        if statistics.count == 0:
+            raise NeXusError('Data only contains NaNs or infinities')
+        if percentiles is None:
+            lo, hi = statistics.min, statistics.max
+        else:
+            lo, hi = (statistics.percentile(p) for p in percentiles)
+        if vmax is not None:
+            hi = vmax
+        if symmetric:
+            lo = -hi
+        elif vmin is not None:
+            lo = vmin
+        if log and not symmetric:
+            minpos = statistics.minpos or 0.01
+            lo, hi = (minpos if lo <= 0 else lo, minpos if hi <= 0 else hi)
+        norm, locator, formatter = data_norm(lo, hi, log=log,
+                                             symmetric=symmetric,
+                                             linthresh=linthresh,
+                                             linscale=linscale)
+
+        self.figure.clf()
+        if aspect == 'auto':
+            skew = None
+        if skew is not None:
+            helper = skew_grid_helper(
+                lambda x, y: skew_coordinates(x, y, skew),
+                lambda x, y: unskew_coordinates(x, y, skew))
+            ax = self.figure.add_subplot(Subplot(self.figure, 1, 1, 1,
+                                                 grid_helper=helper))
+        else:
+            ax = self.figure.add_subplot(1, 1, 1)
+        self.ax = ax
+
+        if interpolation == 'convolve':
+            v = smooth_image(v, smooth)
+            interpolation = 'bicubic'
+        cm = colormap(cmap, bad)
+        if xaxis.equally_spaced and yaxis.equally_spaced:
+            image = ax.imshow(v, extent=image_extent(xaxis, yaxis),
+                              origin='lower', cmap=cm, norm=norm,
+                              interpolation=interpolation, **opts)
+            if skew is not None:
+                image.set_transform(skew_transform(skew) + ax.transData)
+        else:
+            x, y = np.meshgrid(xaxis.boundaries, yaxis.boundaries)
+            image = ax.pcolormesh(*skew_coordinates(x, y, skew), v, cmap=cm,
+                                  norm=norm, **opts)
+        ax.set_aspect(self.get_aspect(aspect, axes))
+
+        if colorbar:
+            cb = self.figure.colorbar(image, ax=ax)
+            cb.locator = locator
+            cb.formatter = formatter
+            cb.update_ticks()
+
+        xaxis.set_limits(xaxis.min if xmin is None else xmin,
+                         xaxis.max if xmax is None else xmax)
+        yaxis.set_limits(yaxis.min if ymin is None else ymin,
+                         yaxis.max if ymax is None else ymax)
+        xlo, xhi, ylo, yhi = image_limits(xaxis, yaxis, skew)
+        ax.set_xlim(xlo, xhi)
+        ax.set_ylim(ylo, yhi)
+        ax.set_xlabel(xaxis.label)
+        ax.set_ylabel(yaxis.label)
+
+    def get_aspect(self, aspect, axes):
+        """Return the aspect ratio, as in ``NXPlotView.get_aspect``."""
+        if aspect == 'equal':
+            return scaled_aspect(axes)
+        else:
+            return aspect
+
+    def save(self, filename, **opts):
+        """
+        Save the figure to a file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the output file. The format, e.g., PNG, PDF or SVG,
+            is determined by the file extension.
+        opts : dict
+            Options passed to ``Figure.savefig``.
+        """
+        self.figure.savefig(filename, **opts)
+
+
+def render(data, filename, figsize=None, dpi=None, overlays=None, **opts):
+    """
+    Render an NXdata group to an image file.
+
+    Parameters
+    ----------
+    data : NXdata
+        Group containing the data to be plotted.
+    filename : str
+        Path of the output file, whose extension determines the format.
+    figsize : tuple of floats, optional
+        Width and height of the figure in inches.
+    dpi : float, optional
+        Resolution of the figure in dots per inch.
+    overlays : list of tuples, optional
+        List of (NXdata, dict) tuples defining 1D data, e.g., fits, to
+        be plotted over the first plot with the specified options.
+    opts : dict
+        Plotting options, as defined by ``NXRenderer.plot``.
+
+    Returns
+    -------
+    str
+        Path of the output file.
+    """
+    renderer = NXRenderer(figsize=figsize, dpi=dpi)
+    renderer.plot(data, **opts)
+    for overlay, overlay_opts in (overlays or []):
+        renderer.plot(overlay, over=True, **overlay_opts)
+    renderer.save(filename)
+    return filename
+
+
+def _render_job(job):
+    """Render a single figure in a worker process."""
+    index, data, opts = job
+    try:
+        return index, render(data, **opts), None
+    except Exception as error:
+        return index, None, f"{type(error).__name__}: {error}"
+
+
+def iter_render(jobs, filename=None, workers=None, **opts):
+    """
+    Render NXdata groups to image files, yielding each as it is saved.
+
+    The jobs are consumed lazily, with no more than two jobs per worker
+    waiting to be rendered at any time, so that they can be generated
+    on demand, e.g., by reading successive slices of a large array.
+    If the generator is closed before it is exhausted, the remaining
+    jobs are cancelled.
+
+    Parameters
+    ----------
+    jobs : iterable of tuples
+        (NXdata, dict) tuples, as defined by ``render_batch``.
+    filename : str, optional
+        Template of the output file names, which is formatted with the
+        index of the job, e.g., 'frame_{:03d}.png'.
+    workers : int, optional
+        Number of worker processes. By default, this is the number of
+        processors. If the value is 1, the figures are rendered in the
+        current process.
+    opts : dict
+        Default plotting options, as defined by ``render``.
+
+    Yields
+    ------
+    tuple
+        Index of the job, path of the output file, and an error message,
+        which is None if the figure was saved successfully. The results
+        are not necessarily yielded in the order of the jobs.
+    """
+    def tasks():
+        for i, (data, job_opts) in enumerate(jobs):
+            task_opts = dict(opts, **(job_opts or {}))
+            if 'filename' not in task_opts:
+                if filename is None:
+                    raise NeXusError(
+                        f"No output file name defined for job {i}")
+                task_opts['filename'] = filename.format(i)
+            yield i, data, task_opts
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if hasattr(jobs, '__len__'):
+        workers = min(workers, len(jobs))
+    if workers <= 1:
+        for task in tasks():
+            yield _render_job(task)
+        return
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    pending = set()
+    try:
+        for task in tasks():
+            pending.add(executor.submit(_render_job, task))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+        pending = set()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def render_batch(jobs, filename=None, workers=None, **opts):
+    """
+    Render a list of NXdata groups to image files in parallel.
+
+    Parameters
+    ----------
+    jobs : list of tuples
+        List of (NXdata, dict) tuples, where the dictionary contains the
+        plotting options of each figure, which override the default
+        options given as keyword arguments. If the options do not
+        include the output 'filename', it is generated from the
+        ``filename`` template.
+    filename : str, optional
+        Template of the output file names, which is formatted with the
+        index of the job, e.g., 'frame_{:03d}.png'.
+    workers : int, optional
+        Number of worker processes. By default, this is the number of
+        processors. If the value is 1, the figures are rendered in the
+        current process.
+    opts : dict
+        Default plotting options, as defined by ``render``.
+
+    Returns
+    -------
+    list of str
+        Paths of the output files in the order of the jobs.
+
+    Raises
+    ------
+    NeXusError
+        If any of the figures could not be rendered. The other figures
+        are still saved.
+    """
+    results = sorted(iter_render(jobs, filename=filename, workers=workers,
+                                 **opts))
+    errors = [f"Job {i}: {error}" for i, _, error in results if error]
+    if errors:
+        raise NeXusError("Unable to render all figures\n" +
+                         "\n".join(errors))
+    return [name for _, name, _ in results]
+
+
+def encode_movie(frames, filename, fps=10):
+    """
+    Encode a sequence of image files as a movie.
+
+    GIF files are encoded with Pillow. MP4 files require FFmpeg, whose
+    path is defined by Matplotlib's 'animation.ffmpeg_path' setting.
+
+    Parameters
+    ----------
+    frames : list of str
+        Paths of the image files in the order they are displayed. The
+        images should all have the same size.
+    filename : str
+        Path of the movie file, whose extension, i.e., '.gif' or
+        '.mp4', determines the format.
+    fps : float, optional
+        Number of frames per second. The default is 10.
+    """
+    if not frames:
+        raise NeXusError("No frames to encode")
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.gif':
+        from PIL import Image
+        images = [Image.open(frame) for frame in frames]
+        try:
+            images[0].save(filename, save_all=True,
+                           append_images=images[1:],
+                           duration=int(round(1000.0 / fps)), loop=0)
+        finally:
+            for image in images:
+                image.close()
+    elif extension in ('.mp4', '.m4v', '.mov'):
+        ffmpeg = shutil.which(mpl.rcParams['animation.ffmpeg_path'])
+        if ffmpeg is None:
+            raise NeXusError("FFmpeg is required to encode MP4 movies")
+        command = [ffmpeg, '-y', '-loglevel', 'error',
+                   '-f', 'image2pipe', '-framerate', str(fps),
+                   '-c:v', 'png', '-i', '-',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                   '-c:v', 'libx264', '-pix_fmt', 'yuv420p', filename]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        try:
+            for frame in frames:
+                with open(frame, 'rb') as f:
+                    process.stdin.write(f.read())
+        except BrokenPipeError:
+            pass
+        finally:
+            _, error = process.communicate()
+        if process.returncode != 0:
+            raise NeXusError("Unable to encode movie\n" +
+                             error.decode(errors='replace'))
+    else:
+        raise NeXusError(f"Movie format '{extension}' is not supported")
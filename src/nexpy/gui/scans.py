@@ -0,0 +1,645 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2026, NeXpy Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file COPYING, distributed with this software.
+# -----------------------------------------------------------------------------
+
+"""
+Combine the same data from many NeXus files into a single scan.
+
+Scans are built by reading the same slab of an NXdata group in each
+file, e.g., one run of a temperature scan, and stacking them along a new
+axis defined by a scalar scan variable stored in each file. The slabs
+are read by a pool of worker processes and written into chunked,
+resizable fields of a consolidated file, so that files added to the
+scan later only require the new files to be read::
+
+    from nexpy.gui.scans import NXScanBuilder
+
+    builder = NXScanBuilder('scan.nxs', 'entry/data', 'entry/sample/temp')
+    scan = builder.build(sorted(Path('.').glob('run_*.nxs')))
+
+Since the workers are started with the 'spawn' method, scripts that
+build scans with more than one worker should be protected by an
+``if __name__ == '__main__':`` clause.
+
+Scalar values, such as monitor counts or sample temperatures, can be
+collected from thousands of files without loading them as NeXus trees::
+
+    from nexpy.gui.scans import harvest_scalars
+
+    table = harvest_scalars('run_*.nxs', ['entry/monitor/integral'],
+                            scan_path='entry/sample/temperature')
+    table.plot()
+"""
+import glob
+import multiprocessing
+import os
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
+from pathlib import Path
+
+import numpy as np
+from nexusformat.nexus import (NeXusError, NXdata, NXfield, NXFile, NXroot,
+                               NXvirtualfield, nxload)
+
+
+def read_slab(filename, data_path, idx=None):
+    """
+    Return the signal slabs of an NXdata group stored in a file.
+
+    This is called by the worker processes of ``NXScanBuilder``.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NeXus file.
+    data_path : str
+        Path to the NXdata group within the file.
+    idx : tuple of slices, optional
+        Slab of each signal to be read. By default, the whole signal is
+        read.
+
+    Returns
+    -------
+    tuple
+        The file name and a dictionary of the signal slabs, keyed by
+        the signal names.
+    """
+    root = nxload(filename, 'r')
+    data = root[data_path]
+    slabs = {}
+    with root.nxfile:
+        for signal in [s for s in data.nxsignals if s.exists()]:
+            if idx is None:
+                slabs[signal.nxname] = signal.nxdata
+            else:
+                slabs[signal.nxname] = signal[idx].nxdata
+    return str(filename), slabs
+
+
+def _read_slab(task):
+    return read_slab(*task)
+
+
+def scan_values(files, data_path, scan_path=None, cache=None):
+    """
+    Return the valid files and the values of the scan variable.
+
+    Files that do not contain the NXdata group, a stored signal, or the
+    scan variable are skipped.
+
+    Parameters
+    ----------
+    files : list of str
+        Paths to the NeXus files.
+    data_path : str
+        Path to the NXdata group in each file.
+    scan_path : str, optional
+        Path to the scalar scan variable in each file. If it is not
+        defined, the values are given by the file index.
+    cache : dict, optional
+        Modification times and scan values of valid files that have
+        already been read, keyed by the file paths. Files that have not
+        been modified since are not opened again. The dictionary is
+        updated with the values of the other valid files.
+
+    Returns
+    -------
+    tuple of lists
+        The valid files and their scan values, sorted by value.
+    """
+    valid, values = [], []
+    for filename in [str(f) for f in files]:
+        try:
+            mtime = os.path.getmtime(filename)
+            if cache is not None and cache.get(filename, (None,))[0] == mtime:
+                value = cache[filename][1]
+            else:
+                root = nxload(filename, 'r')
+                if (data_path not in root or
+                        not root[data_path].nxsignal.exists()):
+                    continue
+                value = None
+                if scan_path:
+                    if scan_path not in root:
+                        continue
+                    value = root[scan_path].nxvalue
+                    if np.ndim(value) > 0:
+                        value = np.ravel(value)[0]
+                if cache is not None:
+                    cache[filename] = (mtime, value)
+        except Exception:
+            continue
+        valid.append(filename)
+        values.append(len(values) if value is None else value)
+    return sort_scan(valid, values)
+
+
+def sort_scan(files, values):
+    """Return the files and scan values sorted by value."""
+    order = sorted(range(len(files)), key=lambda i: values[i])
+    return [files[i] for i in order], [values[i] for i in order]
+
+
+def scan_axis(template, scan_path, values):
+    """
+    Return the scan axis with the given values.
+
+    The name, dtype, and the 'long_name' and 'units' attributes are
+    copied from the scan variable in the template file. If the scan
+    path is not defined, the axis contains the file indices.
+    """
+    if scan_path:
+        variable = template[scan_path]
+        axis = NXfield(values, dtype=variable.dtype, name=variable.nxname)
+        for attr in ['long_name', 'units']:
+            if attr in variable.attrs:
+                axis.attrs[attr] = variable.attrs[attr]
+    else:
+        axis = NXfield(values, dtype=np.int64, name='file_index',
+                       long_name='File Index')
+    return axis
+
+
+def virtual_scan(files, data_path, scan_path=None, idx=None, values=None):
+    """
+    Return a scan that maps the data in each file without copying them.
+
+    Each signal of the NXdata group, or the selected slab, is mapped
+    from every file into an HDF5 virtual dataset, which is stacked
+    along a new first dimension defined by the scan variable. Only the
+    metadata are written, so the cost does not depend on the size of
+    the data. The returned group can be plotted, projected or saved
+    like any other NXdata group, and the data are only read from the
+    source files when they are accessed.
+
+    Parameters
+    ----------
+    files : list of str
+        Paths to the source files.
+    data_path : str
+        Path to the NXdata group in each file.
+    scan_path : str, optional
+        Path to the scalar scan variable in each file. If it is not
+        defined, the scan axis contains the file indices.
+    idx : tuple of slices, optional
+        Slab of each signal to be mapped. By default, the whole signal
+        is mapped.
+    values : list of float, optional
+        Values of the scan variable for each file. By default, they are
+        read from each file.
+
+    Returns
+    -------
+    NXdata
+        NXdata group containing the virtual fields, sorted by the scan
+        values.
+    """
+    files = [str(f) for f in files]
+    if values is None:
+        files, values = scan_values(files, data_path, scan_path)
+    elif len(values) != len(files):
+        raise NeXusError("The numbers of files and scan values differ")
+    else:
+        files, values = sort_scan(files, values)
+    if not files:
+        raise NeXusError(f"{data_path} not found in files")
+    template = nxload(files[0], 'r')
+    group = template[data_path]
+    axes = group.nxaxes
+    if idx is not None:
+        axes = [axis[s] for axis, s in zip(axes, idx)]
+    signals = [NXvirtualfield(signal.nxfilepath, files, shape=signal.shape,
+                              dtype=signal.dtype, idx=idx, abspath=True,
+                              name=signal.nxname, attrs=signal.safe_attrs)
+               for signal in group.nxsignals if signal.exists()]
+    data = NXdata(signals[0],
+                  [scan_axis(template, scan_path, values)] + axes,
+                  name=group.nxname)
+    for signal in signals[1:]:
+        data[signal.nxname] = signal
+    if len(signals) > 1:
+        data.attrs['auxiliary_signals'] = [s.nxname for s in signals[1:]]
+    data.title = data_path
+    return data
+
+
+def read_scalars(filename, paths):
+    """
+    Return the scalar values stored at the given paths in a file.
+
+    The file is opened directly with h5py, without loading the NeXus
+    tree, and is closed as soon as the values have been read. This is
+    called by the worker threads of ``harvest_scalars``.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the NeXus file.
+    paths : list of str
+        Paths to the scalar fields within the file.
+
+    Returns
+    -------
+    list
+        The value at each path, or None if it is missing or not
+        numeric. The first element of an array is returned if it
+        contains more than one value.
+    """
+    values = []
+    try:
+        with NXFile(filename, 'r') as f:
+            for path in paths:
+                try:
+                    value = np.asarray(f[path][()])
+                    if value.dtype.kind not in 'biuf' or value.size == 0:
+                        value = None
+                    else:
+                        value = value.ravel()[0].item()
+                except Exception:
+                    value = None
+                values.append(value)
+    except Exception:
+        values = [None] * len(paths)
+    return values
+
+
+def harvest_scalars(files, paths, scan_path=None, workers=None,
+                    callback=None):
+    """
+    Return a table of scalar values read from many files.
+
+    The files are read by a pool of worker threads, each of which
+    keeps a file open only while its values are read. The values are
+    returned as the columns of an NXdata group, whose signal contains
+    the values at the first path and whose auxiliary signals contain
+    the values at any other paths. The axis contains the values of the
+    scan variable, sorted in increasing order, or the file index if no
+    scan variable is defined. Missing values are set to NaN, and files
+    without a scan value are skipped. The group also contains the
+    file names, so it can be plotted or saved directly.
+
+    Parameters
+    ----------
+    files : str or list of str
+        Paths to the files, or a glob pattern that matches them.
+    paths : str or list of str
+        Paths to the scalar fields within each file.
+    scan_path : str, optional
+        Path to the scalar scan variable within each file.
+    workers : int, optional
+        Number of worker threads. The default is 4 times the number of
+        processors, since reading a few values is limited by the file
+        access time.
+    callback : function, optional
+        Function called after each file is read with the fraction of
+        the files that have been read. If it returns True, the harvest
+        is abandoned.
+
+    Returns
+    -------
+    NXdata
+        NXdata group containing the harvested values, or None if the
+        harvest was abandoned.
+    """
+    if isinstance(files, (str, Path)):
+        files = sorted(glob.glob(str(files)))
+    files = [str(f) for f in files]
+    if isinstance(paths, str):
+        paths = [paths]
+    if not files:
+        raise NeXusError("No files to be read")
+    elif not paths:
+        raise NeXusError("No fields to be read")
+    fields = list(paths) + ([scan_path] if scan_path else [])
+    rows = [None] * len(files)
+    workers = workers or 4 * (os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=min(workers, len(files)),
+                            thread_name_prefix='nxharvest') as executor:
+        futures = {executor.submit(read_scalars, f, fields): i
+                   for i, f in enumerate(files)}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]] = future.result()
+            if callback and callback(completed / len(files)):
+                for future in futures:
+                    future.cancel()
+                return None
+
+    if scan_path:
+        valid = [i for i, row in enumerate(rows) if row[-1] is not None]
+        if not valid:
+            raise NeXusError(f"{scan_path} not found in files")
+        valid.sort(key=lambda i: rows[i][-1])
+        variable = Path(scan_path).name
+        axis = NXfield([rows[i][-1] for i in valid], name=variable)
+        with NXFile(files[valid[0]], 'r') as f:
+            for attr in ['long_name', 'units']:
+                if attr in f[scan_path].attrs:
+                    axis.attrs[attr] = f[scan_path].attrs[attr]
+    else:
+        valid = list(range(len(files)))
+        axis = NXfield(valid, name='file_index', long_name='File Index')
+    names = [Path(p).name for p in paths]
+    reserved = (axis.nxname, 'file_name', 'title')
+    names = [p.strip('/').replace('/', '_')
+             if names.count(n) > 1 or n in reserved else n
+             for p, n in zip(paths, names)]
+    columns = []
+    for j, (path, name) in enumerate(zip(paths, names)):
+        values = [rows[i][j] for i in valid]
+        columns.append(NXfield([np.nan if v is None else v for v in values],
+                               dtype=np.float64, name=name, long_name=path))
+    data = NXdata(columns[0], axis)
+    for column in columns[1:]:
+        data[column.nxname] = column
+    if len(columns) > 1:
+        data.attrs['auxiliary_signals'] = [c.nxname for c in columns[1:]]
+    data['file_name'] = NXfield([files[i] for i in valid])
+    data.title = ', '.join(paths)
+    return data
+
+
+class NXScanBuilder:
+    """
+    Consolidate the same NXdata slab from many files into one scan.
+
+    The slabs are stacked along a new first dimension, whose axis
+    contains the values of the scan variable in each file, or the file
+    index if no scan variable is defined, and sorted by its values. The
+    stacked signals are stored in chunked fields, with one chunk per
+    file, which are resized when more files are added. Alternatively,
+    the signals can be stored as virtual datasets that map the data in
+    each file without copying them, using ``virtual_scan``. Each call to
+    ``build`` only reads files that have not already been consolidated,
+    moving the existing slabs within the consolidated file if necessary
+    to keep the scan sorted. If files are removed from the scan, if
+    consolidated files have been modified, or if the data path, scan
+    path or slab change, the scan is rebuilt from scratch. The scan
+    value of each file is cached with its modification time, so that
+    files are only opened again to read it if they have been modified.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the file containing the consolidated scan. It is
+        overwritten when the scan is rebuilt.
+    data_path : str
+        Path to the NXdata group in each file.
+    scan_path : str, optional
+        Path to the scalar scan variable in each file.
+    idx : tuple of slices, optional
+        Slab of each signal to be consolidated. By default, the whole
+        signal is consolidated.
+    workers : int, optional
+        Number of worker processes. By default, this is the number of
+        processors. If the value is 1, the files are read in the
+        current process.
+    virtual : bool, optional
+        True if the scan is stored as virtual datasets. The default is
+        False.
+    """
+
+    def __init__(self, filename, data_path, scan_path=None, idx=None,
+                 workers=None, virtual=False):
+        self.filename = str(filename)
+        self.data_path = data_path
+        self.scan_path = scan_path or None
+        self.idx = idx
+        self.workers = workers
+        self.virtual = virtual
+        self.files = []
+        self.mtimes = {}
+        self.values = {}
+        self.root = None
+
+    def __repr__(self):
+        return f"NXScanBuilder('{self.filename}', files={len(self.files)})"
+
+    def __len__(self):
+        return len(self.files)
+
+    @property
+    def data(self):
+        """The consolidated NXdata group, or None if not yet built."""
+        if self.root is None:
+            return None
+        else:
+            return self.root['data']
+
+    def configure(self, data_path, scan_path=None, idx=None, virtual=False):
+        """
+        Redefine the data to be consolidated.
+
+        If the definition has changed, the scan is rebuilt by the next
+        call to ``build``.
+        """
+        scan_path = scan_path or None
+        definition = (data_path, scan_path, idx, virtual)
+        if definition != (self.data_path, self.scan_path, self.idx,
+                          self.virtual):
+            if (data_path, scan_path) != (self.data_path, self.scan_path):
+                self.values = {}
+            self.data_path, self.scan_path, self.idx, self.virtual = \
+                definition
+            self.reset()
+
+    def reset(self):
+        """Discard the consolidated scan, so that it is rebuilt."""
+        self.files = []
+        self.mtimes = {}
+
+    def build(self, files, values=None, callback=None):
+        """
+        Consolidate the data from a list of files.
+
+        Parameters
+        ----------
+        files : list of str
+            Paths to the files to be included in the scan.
+        values : list of float, optional
+            Values of the scan variable for each file. By default, they
+            are read from the scan path in each file, unless they were
+            read by a previous call and the file has not been modified,
+            or are given by the file index if no scan path is defined.
+        callback : function, optional
+            Function called after each file is read with the fraction
+            of the files that have been read. If it returns True, the
+            consolidation is abandoned.
+
+        Returns
+        -------
+        NXdata
+            The consolidated NXdata group, or None if the consolidation
+            was abandoned.
+
+        Raises
+        ------
+        NeXusError
+            If the files cannot be read. The scan is then rebuilt by
+            the next call.
+        """
+        files = [str(f) for f in files]
+        if values is None:
+            files, values = scan_values(files, self.data_path, self.scan_path,
+                                        cache=self.values)
+        elif len(values) != len(files):
+            raise NeXusError("The numbers of files and scan values differ")
+        else:
+            files, values = sort_scan(files, values)
+        if not files:
+            raise NeXusError(f"{self.data_path} not found in files")
+        if self.virtual:
+            root = NXroot()
+            root['data'] = virtual_scan(files, self.data_path, self.scan_path,
+                                        self.idx, values)
+            root.save(self.filename, mode='w')
+            self.root = root
+            self.reset()
+            return self.data
+
+        mtimes = {f: os.path.getmtime(f) for f in files}
+        if (self.root is None or not Path(self.filename).exists() or
+                any(f not in mtimes or mtimes[f] != self.mtimes[f]
+                    for f in self.files)):
+            self.reset()
+        new_files = [f for f in files if f not in self.mtimes]
+        if not new_files and len(files) == len(self.files):
+            return self.data
+
+        positions = {f: i for i, f in enumerate(files)}
+        if not self.files:
+            self.create(files[0], values)
+        else:
+            self.expand([positions[f] for f in self.files], len(files))
+        data = self.data
+        try:
+            with self.root.nxfile:
+                axis = data.nxaxes[0]
+                axis[:] = np.asarray(values, dtype=axis.dtype)
+                for name, slab in self.read(new_files, callback):
+                    if slab is None:
+                        self.reset()
+                        return None
+                    for signal in data.nxsignals:
+                        if signal.nxname in slab:
+                            signal[positions[name]] = slab[signal.nxname]
+        except NeXusError:
+            self.reset()
+            raise
+        except Exception as error:
+            self.reset()
+            raise NeXusError(f"Unable to consolidate the scan: {error}")
+        self.files = files
+        self.mtimes = mtimes
+        return data
+
+    def create(self, filename, values):
+        """
+        Create the consolidated file using the first file as a template.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the file used to define the consolidated fields.
+        values : list of float
+            Values of the scan variable.
+        """
+        template = nxload(filename, 'r')
+        group = template[self.data_path]
+        axes = group.nxaxes
+        if self.idx is not None:
+            axes = [axis[s] for axis, s in zip(axes, self.idx)]
+        axis = scan_axis(template, self.scan_path, values)
+        axis.maxshape = (None,)
+        size = len(values)
+        signals = []
+        for signal in [s for s in group.nxsignals if s.exists()]:
+            if self.idx is None:
+                shape = signal.shape
+            else:
+                shape = signal[self.idx].shape
+            signals.append(NXfield(shape=(size,)+shape, dtype=signal.dtype,
+                                   maxshape=(None,)+shape,
+                                   chunks=(1,)+shape, name=signal.nxname,
+                                   attrs=signal.safe_attrs))
+        data = NXdata(signals[0], [axis] + axes,
+                      name=group.nxname)
+        for signal in signals[1:]:
+            data[signal.nxname] = signal
+        if len(signals) > 1:
+            data.attrs['auxiliary_signals'] = [s.nxname for s in signals[1:]]
+        data.title = self.data_path
+        root = NXroot()
+        root['data'] = data
+        root.save(self.filename, mode='w')
+        self.root = root
+
+    def expand(self, positions, size):
+        """
+        Resize the consolidated fields, moving the existing slabs.
+
+        Parameters
+        ----------
+        positions : list of int
+            New positions of each existing slab, in increasing order.
+        size : int
+            Number of files in the expanded scan.
+        """
+        data = self.data
+        fields = [data.nxaxes[0]] + list(data.nxsignals)
+        with self.root.nxfile:
+            for field in fields:
+                field.resize((size,) + field.shape[1:])
+            for signal in data.nxsignals:
+                for old, new in reversed(list(enumerate(positions))):
+                    if new != old:
+                        signal[new] = signal[old].nxdata
+
+    def read(self, files, callback=None):
+        """
+        Read the slabs of a list of files with a pool of workers.
+
+        Yields
+        ------
+        tuple
+            The file name and a dictionary of its signal slabs, in the
+            order in which they are read. If the callback requests that
+            reading is abandoned, the last slab is None.
+        """
+        tasks = [(f, self.data_path, self.idx) for f in files]
+        workers = self.workers or os.cpu_count() or 1
+        workers = min(workers, len(tasks))
+        if workers <= 1:
+            for i, task in enumerate(tasks, start=1):
+                yield _read_slab(task)
+                if callback and callback(i / len(tasks)):
+                    yield task[0], None
+                    return
+            return
+        context = multiprocessing.get_context('spawn')
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        pending = set()
+        completed = 0
+        try:
+            tasks = iter(tasks)
+            while True:
+                for task in tasks:
+                    pending.add(executor.submit(_read_slab, task))
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    completed += 1
+                    if callback and callback(completed / len(files)):
+                        yield None, None
+                        return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -90,44 +90,104 @@ class NXtree(NXgroup):
         """
         self.sync_shell_names()
         if self._model:
-            self.sync_children(self._item)
-            for row in range(self._item.rowCount()):
-                for item in self._item.child(row).walk():
-                    self.sync_children(item)
+            synced = []
+            self.sync_changed(self._item, self, synced)
+            self.clear_plot_caches()
+            for node in synced:
+                node.set_unchanged()
             index = self._item.index()
             if index.isValid():
                 self._view.dataChanged(index, index)
             self._view.update()
             self._view.status_message(self._view.node)
 
-    def sync_children(self, item):
+    def clear_plot_caches(self):
+        """
+        Discard the cached slices of plots whose data have changed.
+
+        Plotted slices of data in the tree are cached by each plotting
+        window. The cache is keyed by the file modification time, which
+        does not detect changes to data stored in memory, so it is
+        cleared whenever the change status of the plotted data is set.
+        This must be called before the change status is reset.
+        """
+        from .plotview import plotviews
+        for plotview in list(plotviews.values()):
+            data = getattr(plotview, 'data', None)
+            if (data is not None and data.changed
+                    and data.nxroot.nxgroup is self):
+                plotview.clear_cache()
+
+    def sync_changed(self, item, node, synced, new=False):
+        """
+        Synchronize the tree items of NeXus objects that have changed.
+
+        Changes to a NeXus object are propagated to all its parent
+        groups, so only the branches containing changed objects are
+        traversed. The invisible root item, tree items that have just
+        been added and linked groups, whose targets may have been
+        changed in another branch, are always synchronized.
+        The change status of the synchronized objects is reset by the
+        set_changed method after the traversal.
+
+        Parameters
+        ----------
+        item : NXTreeItem
+            The tree item to be synchronized.
+        node : NXobject
+            The NeXus object of the tree item.
+        synced : list of NXobject
+            The NeXus objects that have been synchronized.
+        new : bool, optional
+            True if the tree item has just been created, by default False.
+        """
+        if not (new or node is self or node.changed
+                or isinstance(node, NXlink)):
+            return
+        synced.append(node)
+        added = self.sync_children(item, node)
+        if isinstance(node, NXgroup) and node.entries_loaded:
+            entries = node.entries
+            for child in [item.child(row) for row in range(item.rowCount())]:
+                if child.name in entries:
+                    self.sync_changed(child, entries[child.name], synced,
+                                      new=(child.name in added))
+
+    def sync_children(self, item, node=None):
         """
         Synchronize the children of a tree item with its NeXus group.
 
         If the NeXus group is a loaded NXgroup, this method adds
         children to the tree item if they are missing and removes them
         if they no longer exist in the NeXus group. This method should
-        only be called by the set_changed method.
+        only be called by the sync_changed method.
 
         Parameters
         ----------
         item : NXTreeItem
             The tree item to be synchronized.
+        node : NXobject, optional
+            The NeXus object of the tree item, by default item.node.
+
+        Returns
+        -------
+        set of str
+            The names of the children that were added.
         """
-        if isinstance(item.node, NXgroup):
-            children = []
-            if item.hasChildren():
-                for row in range(item.rowCount()):
-                    children.append(item.child(row))
-            names = [child.name for child in children]
-            if item.node.entries_loaded:
-                for name in item.node:
-                    if name not in names:
-                        item.appendRow(NXTreeItem(item.node[name]))
-                for child in children:
-                    if child.name not in item.node:
-                        item.removeRow(child.row())
-        item.node.set_unchanged()
+        if node is None:
+            node = item.node
+        added = set()
+        if isinstance(node, NXgroup) and node.entries_loaded:
+            children = [item.child(row) for row in range(item.rowCount())]
+            names = {child.name for child in children}
+            for name in node:
+                if name not in names:
+                    item.appendRow(NXTreeItem(node[name]))
+                    added.add(name)
+            for child in children:
+                if child.name not in node:
+                    item.removeRow(child.row())
+        return added
 
     def add(self, node):
         """
@@ -285,14 +345,22 @@ class NXtree(NXgroup):
         This method checks if the key in the tree is the same as the key
         in the shell namespace. If not, it assigns the tree key to the
         shell. If the previous key exists in the shell, it is deleted.
-
+        The shell namespace is only searched when a tree is missing from
+        it, using a reverse index of the names of each tree.
         """
-        for key, value in self.items():
-            shell_names = self.get_shell_names(value)
-            if key not in shell_names:
-                self._shell[key] = value
-                if shell_names:
-                    del self._shell[shell_names[0]]
+        missing = [(key, value) for key, value in self.items()
+                   if self._shell.get(key) is not value]
+        if not missing:
+            return
+        trees = {id(value) for _, value in missing}
+        shell_names = {}
+        for name, obj in self._shell.items():
+            if id(obj) in trees and not name.startswith('_'):
+                shell_names.setdefault(id(obj), []).append(name)
+        for key, value in missing:
+            self._shell[key] = value
+            if id(value) in shell_names:
+                del self._shell[shell_names[id(value)][0]]
 
     def node_from_file(self, fname):
         """
@@ -512,6 +580,7 @@ class NXTreeView(QtWidgets.QTreeView):
         self.mainwindow.overplot_line_action.setEnabled(False)
         self.mainwindow.multiplot_data_action.setEnabled(False)
         self.mainwindow.multiplot_lines_action.setEnabled(False)
+        self.mainwindow.waterfall_action.setEnabled(False)
         self.mainwindow.plot_weighted_data_action.setEnabled(False)
         self.mainwindow.plot_image_action.setEnabled(False)
         self.mainwindow.view_action.setEnabled(False)
@@ -615,6 +684,10 @@ class NXTreeView(QtWidgets.QTreeView):
                     if 'auxiliary_signals' in node.attrs:
                         self.mainwindow.multiplot_data_action.setEnabled(True)
                         self.mainwindow.multiplot_lines_action.setEnabled(True)
+                elif (isinstance(node, NXgroup) and
+                      node.nxsignal is not None and
+                      node.nxsignal.plot_rank == 2):
+                    self.mainwindow.waterfall_action.setEnabled(True)
                 if (isinstance(node, NXgroup) and
                         node.plottable_data is not None):
                     if node.nxweights is not None:
@@ -667,6 +740,7 @@ class NXTreeView(QtWidgets.QTreeView):
         self.addMenu(self.mainwindow.overplot_line_action)
         self.addMenu(self.mainwindow.multiplot_data_action)
         self.addMenu(self.mainwindow.multiplot_lines_action)
+        self.addMenu(self.mainwindow.waterfall_action)
         self.addMenu(self.mainwindow.plot_weighted_data_action)
         self.addMenu(self.mainwindow.plot_image_action)
         self.menu.addSeparator()
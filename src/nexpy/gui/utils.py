@@ -7,15 +7,22 @@
 # -----------------------------------------------------------------------------
 
 import copy
+import csv
 import gc
 import io
+import json
 import logging
 import os
 import re
 import sys
 import textwrap
+import time
 import traceback as tb
+import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from configparser import ConfigParser
+from contextlib import contextmanager
 from datetime import datetime
 
 if sys.version_info < (3, 10):
@@ -29,18 +36,19 @@ else:
 
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
-from threading import Thread
+from threading import RLock, Thread
 
 import dateparser
 import numpy as np
 from ansi2html import Ansi2HTMLConverter
 from IPython.core.ultratb import FormattedTB
-from matplotlib import __version__ as mplversion
 from matplotlib import rcParams
 from matplotlib.colors import colorConverter, hex2color, rgb2hex
-from packaging.version import Version
 from PIL import Image
 
+from .plotting import (NXStatistics, boundaries, centers,  # noqa: F401
+                       divgray_map, file_lock, gaussian_kernel, parula_map,
+                       smooth_image, xtec_map)
 from .pyqt import QtCore, QtGui, QtWidgets
 
 try:
@@ -226,54 +234,6 @@ def clamp(value, min_value, max_value):
     return max(min_value, min(value, max_value))
 
 
-def centers(axis, dimlen):
-    """
-    Return the centers of the axis bins.
-
-    This works regardless if the axis contains bin boundaries or
-    centers.
-
-    Parameters
-    ----------
-    dimlen : int
-        Size of the signal dimension. If this one more than the axis
-        size, it is assumed the axis contains bin boundaries.
-    """
-    ax = axis.astype(np.float64)
-    if ax.shape[0] == dimlen+1:
-        return (ax[:-1] + ax[1:])/2
-    else:
-        assert ax.shape[0] == dimlen
-        return ax
-
-
-def boundaries(axis, dimlen):
-    """
-    Return the boundaries of the axis bins.
-
-    This works regardless if the axis contains bin boundaries or
-    centers.
-
-    Parameters
-    ----------
-    dimlen : int
-        Size of the signal dimension. If this one more than the axis
-        size, it is assumed the axis contains bin boundaries.
-    """
-    ax = axis.astype(np.float64)
-    if ax.shape[0] == 1:
-        return ax
-    elif ax.shape[0] == dimlen:
-        start = ax[0] - (ax[1] - ax[0])/2
-        end = ax[-1] + (ax[-1] - ax[-2])/2
-        return np.concatenate((np.atleast_1d(start),
-                               (ax[:-1] + ax[1:])/2,
-                               np.atleast_1d(end)))
-    else:
-        assert ax.shape[0] == dimlen + 1
-        return ax
-
-
 def keep_data(data):
     """
     Store the data in the scratch workspace.
@@ -337,6 +297,214 @@ def fix_projection(shape, axes, limits):
     return fixed_axes, fixed_limits
 
 
+def project_data(data, axes, limits, summed=True, blocksize=64,
+                 workers=None, callback=None, lock=None):
+    """
+    Return a projection of the data, reducing it in blocks.
+
+    This produces the same result as the NXdata 'project' function, but
+    the selected slab is read in blocks of rows along its first
+    dimension, aligned with its HDF5 chunks if possible, so that it
+    never needs to be loaded into memory as a whole. Each block is
+    reduced over the summed axes by a pool of worker threads, and the
+    partial sums are accumulated as they are completed. The errors and
+    weights are reduced in the same way, and masked values are excluded
+    from the sums. If the slab fits in a single block, or there are no
+    axes to be summed, the 'project' function is called instead.
+
+    Parameters
+    ----------
+    data : NXdata
+        Data to be projected, which may be stored in a file.
+    axes : int or list of ints
+        Axes to be used in the projection.
+    limits : list of tuples
+        Minimum and maximum values for each dimension.
+    summed : bool, optional
+        True if the data are summed over the limits, False if they are
+        averaged. The default is True.
+    blocksize : float, optional
+        Approximate size of each block in MB. The default is 64.
+    workers : int, optional
+        Number of worker threads. The default is the number of CPUs.
+    callback : function, optional
+        Function called after each block is reduced with the fraction
+        of the projection that has been completed. If it returns True,
+        the projection is abandoned.
+    lock : threading.Lock, optional
+        Lock acquired while each block is read. The default is the lock
+        shared by all readers of the file containing the data.
+
+    Returns
+    -------
+    NXdata
+        NXdata group containing the projection, or None if the
+        projection was abandoned.
+    """
+    if not iterable(axes):
+        axes = [axes]
+    if len(axes) > 2:
+        raise NeXusError(
+            "Projections to more than two dimensions not supported")
+    signal = data.nxsignal
+    shape = signal.shape
+    if len(limits) < len(shape):
+        raise NeXusError("Too few limits specified")
+    idx, slab_axes = data.slab([slice(lo, hi) for lo, hi in limits])
+    idx = [i if isinstance(i, (int, np.integer))
+           else slice(*i.indices(n)[:2]) for i, n in zip(idx, shape)]
+    kept = [i for i in range(len(shape)) if isinstance(idx[i], slice)]
+    summed_axes = [i for i in kept if i not in axes]
+    slab_shape = [idx[i].stop - idx[i].start for i in kept]
+    if (not summed_axes or len(slab_axes) != len(shape)
+            or any(n <= 1 for n in slab_shape)):
+        return data.project(axes, limits, summed=summed)
+
+    first = kept[0]
+    start, stop = idx[first].start, idx[first].stop
+    rowsize = max(int(np.prod(slab_shape[1:])) * signal.dtype.itemsize, 1)
+    step = max(int(blocksize * 1e6 // rowsize), 1)
+    chunks = signal.chunks
+    if isinstance(chunks, tuple) and step > chunks[first]:
+        step = step // chunks[first] * chunks[first]
+    edges = [start] + list(range((start // step + 1) * step, stop, step))
+    blocks = [slice(lo, hi) for lo, hi in zip(edges, edges[1:] + [stop])]
+    if len(blocks) == 1:
+        return data.project(axes, limits, summed=summed)
+
+    fields = [signal, data.nxerrors, data.nxweights]
+    reduced = tuple(kept.index(i) for i in summed_axes)
+    output = [i for i in kept if i not in summed_axes]
+    if lock is None:
+        lock = file_lock(data)
+
+    def reduce_block(block):
+        index = list(idx)
+        index[first] = block
+        index = tuple(index)
+        with lock:
+            values = [f[index].nxdata if f is not None else None
+                      for f in fields]
+        sums, counts = [], []
+        for i, v in enumerate(values):
+            if v is None:
+                sums.append(None)
+                counts.append(None)
+                continue
+            if i == 1:
+                v = np.square(v)
+            mask = np.ma.getmask(v)
+            if mask is np.ma.nomask:
+                counts.append(None)
+            else:
+                counts.append(np.sum(mask, axis=reduced))
+            sums.append(np.sum(np.ma.filled(v, 0), axis=reduced))
+        return block, sums, counts
+
+    # Masked values are excluded from the sums of each field, as they
+    # are by NumPy, and the number of masked values is accumulated so
+    # that sums with no unmasked values can be masked.
+    totals, counts = [None] * len(fields), [None] * len(fields)
+    if first in output:
+        region = [slice(None)] * len(output)
+        offset = start
+    else:
+        region = None
+    workers = workers or os.cpu_count() or 1
+    executor = ThreadPoolExecutor(max_workers=workers,
+                                  thread_name_prefix='nxproject')
+    try:
+        pending = set()
+        queue = iter(blocks)
+        completed = 0
+        while True:
+            while len(pending) < 2 * workers:
+                block = next(queue, None)
+                if block is None:
+                    break
+                pending.add(executor.submit(reduce_block, block))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                block, sums, block_counts = future.result()
+                if region is not None:
+                    region[0] = slice(block.start-offset, block.stop-offset)
+                for i, (s, c) in enumerate(zip(sums, block_counts)):
+                    if s is None:
+                        continue
+                    if region is None:
+                        totals[i] = s if totals[i] is None else totals[i] + s
+                        if c is not None:
+                            counts[i] = (c if counts[i] is None
+                                         else counts[i] + c)
+                    else:
+                        if totals[i] is None:
+                            totals[i] = np.zeros((stop-start,) + s.shape[1:],
+                                                 dtype=s.dtype)
+                        totals[i][tuple(region)] = s
+                        if c is not None:
+                            if counts[i] is None:
+                                counts[i] = np.zeros(totals[i].shape,
+                                                     dtype=np.int64)
+                            counts[i][tuple(region)] = c
+                completed += 1
+                if callback and callback(completed / len(blocks)):
+                    for future in pending:
+                        future.cancel()
+                    return None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    size = int(np.prod([slab_shape[kept.index(i)] for i in summed_axes]))
+    for i, count in enumerate(counts):
+        if count is not None:
+            totals[i] = np.ma.masked_array(totals[i], mask=(count == size))
+
+    summed_bins = 1
+    for i in summed_axes:
+        summed_bins *= slab_axes[i].size
+    values, errors, weights = totals
+    if errors is not None:
+        errors = np.sqrt(errors)
+    if not summed:
+        values = values / summed_bins
+        if errors is not None:
+            errors = errors / summed_bins
+        if weights is not None:
+            weights = weights / summed_bins
+    output_axes = [slab_axes[i] for i in output]
+    # Transposing the arrays before the group is created avoids
+    # replacing masked fields, which is not supported
+    if len(axes) > 1 and axes[0] > axes[1]:
+        values, errors, weights = [v.T if v is not None else None
+                                   for v in (values, errors, weights)]
+        output_axes = output_axes[::-1]
+    attrs = signal.safe_attrs
+    attrs.pop('axes', None)
+    result = NXdata(NXfield(values, name=signal.nxname, attrs=attrs),
+                    output_axes)
+    for i in summed_axes:
+        summedaxis = copy.deepcopy(slab_axes[i])
+        summedaxis.attrs['minimum'] = summedaxis.nxdata[0]
+        summedaxis.attrs['maximum'] = summedaxis.nxdata[-1]
+        summedaxis.attrs['summed_bins'] = summedaxis.size
+        result.insert(NXfield(
+            0.5*(summedaxis.nxdata[0]+summedaxis.nxdata[-1]),
+            name=summedaxis.nxname, attrs=summedaxis.attrs))
+    if summed:
+        result.attrs['summed_bins'] = summed_bins
+    else:
+        result.attrs['averaged_bins'] = summed_bins
+    if errors is not None:
+        result.nxerrors = NXfield(errors)
+    if weights is not None:
+        result.nxweights = NXfield(weights)
+    if data.nxtitle:
+        result.title = data.nxtitle
+    return result
+
+
 def find_nearest(array, value):
     """Return the array value that is closest to the given value."""
     idx = (np.abs(array-value)).argmin()
@@ -530,108 +698,6 @@ def get_colors(n, first=None, last=None):
                      first[2]+(last[2]-first[2])*i/(n-1))) for i in range(n)]
 
 
-def parula_map():
-    """
-    Generate a color map similar to Matlab's Parula for use in NeXpy.
-
-    The color map data are from the 'fake_parula' function provided by
-    Ander Biguri, "Perceptually uniform colormaps"
-    MATLAB Central File Exchange (2020).
-    """
-    from matplotlib.colors import LinearSegmentedColormap
-    cm_data = [[0.2081, 0.1663, 0.5292],
-               [0.2116238095, 0.1897809524, 0.5776761905],
-               [0.212252381, 0.2137714286, 0.6269714286],
-               [0.2081, 0.2386, 0.6770857143],
-               [0.1959047619, 0.2644571429, 0.7279],
-               [0.1707285714, 0.2919380952, 0.779247619],
-               [0.1252714286, 0.3242428571, 0.8302714286],
-               [0.0591333333, 0.3598333333, 0.8683333333],
-               [0.0116952381, 0.3875095238, 0.8819571429],
-               [0.0059571429, 0.4086142857, 0.8828428571],
-               [0.0165142857, 0.4266, 0.8786333333],
-               [0.032852381, 0.4430428571, 0.8719571429],
-               [0.0498142857, 0.4585714286, 0.8640571429],
-               [0.0629333333, 0.4736904762, 0.8554380952],
-               [0.0722666667, 0.4886666667,  0.8467],
-               [0.0779428571, 0.5039857143, 0.8383714286],
-               [0.079347619, 0.5200238095, 0.8311809524],
-               [0.0749428571, 0.5375428571, 0.8262714286],
-               [0.0640571429, 0.5569857143, 0.8239571429],
-               [0.0487714286, 0.5772238095, 0.8228285714],
-               [0.0343428571, 0.5965809524, 0.819852381],
-               [0.0265, 0.6137, 0.8135],
-               [0.0238904762, 0.6286619048, 0.8037619048],
-               [0.0230904762, 0.6417857143, 0.7912666667],
-               [0.0227714286, 0.6534857143, 0.7767571429],
-               [0.0266619048, 0.6641952381, 0.7607190476],
-               [0.0383714286, 0.6742714286, 0.743552381],
-               [0.0589714286, 0.6837571429, 0.7253857143],
-               [0.0843, 0.6928333333, 0.7061666667],
-               [0.1132952381, 0.7015, 0.6858571429],
-               [0.1452714286, 0.7097571429, 0.6646285714],
-               [0.1801333333, 0.7176571429,  0.6424333333],
-               [0.2178285714, 0.7250428571, 0.6192619048],
-               [0.2586428571, 0.7317142857, 0.5954285714],
-               [0.3021714286, 0.7376047619, 0.5711857143],
-               [0.3481666667, 0.7424333333, 0.5472666667],
-               [0.3952571429, 0.7459, 0.5244428571],
-               [0.4420095238, 0.7480809524,  0.5033142857],
-               [0.4871238095, 0.7490619048, 0.4839761905],
-               [0.5300285714, 0.7491142857, 0.4661142857],
-               [0.5708571429, 0.7485190476, 0.4493904762],
-               [0.609852381, 0.7473142857, 0.4336857143],
-               [0.6473, 0.7456, 0.4188],
-               [0.6834190476, 0.7434761905, 0.4044333333],
-               [0.7184095238, 0.7411333333, 0.3904761905],
-               [0.7524857143, 0.7384, 0.3768142857],
-               [0.7858428571, 0.7355666667,  0.3632714286],
-               [0.8185047619, 0.7327333333, 0.3497904762],
-               [0.8506571429, 0.7299, 0.3360285714],
-               [0.8824333333, 0.7274333333, 0.3217],
-               [0.9139333333, 0.7257857143, 0.3062761905],
-               [0.9449571429, 0.7261142857,  0.2886428571],
-               [0.9738952381, 0.7313952381, 0.266647619],
-               [0.9937714286, 0.7454571429, 0.240347619],
-               [0.9990428571, 0.7653142857,  0.2164142857],
-               [0.9955333333, 0.7860571429, 0.196652381],
-               [0.988, 0.8066, 0.1793666667],
-               [0.9788571429, 0.8271428571, 0.1633142857],
-               [0.9697, 0.8481380952, 0.147452381],
-               [0.9625857143, 0.8705142857, 0.1309],
-               [0.9588714286, 0.8949, 0.1132428571],
-               [0.9598238095, 0.9218333333,  0.0948380952],
-               [0.9661, 0.9514428571, 0.0755333333],
-               [0.9763, 0.9831, 0.0538]]
-    return LinearSegmentedColormap.from_list('parula', cm_data)
-
-
-def xtec_map():
-    """
-    Generate a color map for use with the XTEC package.
-
-    The color map data is the same as the 'tab10' map, but with the
-    lowest value set to 'white'.
-    """
-    from matplotlib import colormaps
-    from matplotlib.colors import ListedColormap
-    cm_data = list(colormaps['tab10'].colors)
-    cm_data.insert(0, [1.0, 1.0, 1.0])
-    return ListedColormap(cm_data, name='xtec')
-
-
-def divgray_map():
-    """New divergent color map copied from the registered 'gray' map."""
-    if Version(mplversion) >= Version('3.5.0'):
-        from matplotlib import colormaps
-        cm = copy.copy(colormaps['gray'])
-    else:
-        from matplotlib.cm import get_cmap
-        cm = copy.copy(get_cmap('gray'))
-    cm.name = 'divgray'
-    return cm
-
-
 def cmyk_to_rgb(c, m, y, k):
     """Convert CMYK values to RGB values."""
     r = int(255 * (1.0 - (c + k) / 100.))
@@ -973,6 +1039,9 @@ def initialize_settings(settings):
     elif not settings.has_option('settings', 'scriptdirectory'):
         settings.set('settings', 'scriptdirectory', None)
 
+    if not settings.has_option('settings', 'slicecache'):
+        settings.set('settings', 'slicecache', 256)
+
     if 'plugins' not in settings.sections():
         settings.add_section('plugins')
 
@@ -1132,8 +1201,11 @@ def rotate_data(data, angle=45, aspect='equal'):
     Notes
     -----
     The rotation is performed about the geometric center of the data
-    using the scipy.ndimage.rotate function. The axes are recalculated
-    to match the new dimensions of the rotated data.
+    by bilinear interpolation, using a coordinate map that is cached for
+    each shape, angle and aspect ratio, so that rotations of successive
+    slices of the same data reuse it. The signal, errors and weights are
+    interpolated together. The axes are recalculated to match the new
+    dimensions of the rotated data.
     """
     if data.ndim != 2:
         raise NeXusError('Can only rotate 2D data.')
@@ -1173,9 +1245,6 @@ def rotate_data(data, angle=45, aspect='equal'):
         result.attrs['y0'] = y0
         return result
 
-    original_data = data.nxsignal
-    original_errors = data.nxerrors
-    original_weights = data.nxweights
     x_name = f"{x.nxname} * cos({angle}°) - {y.nxname} * sin({angle}°)"
     y_name = f"{x.nxname} * sin({angle}°) + {y.nxname} * cos({angle}°)"
 
@@ -1186,25 +1255,24 @@ def rotate_data(data, angle=45, aspect='equal'):
     xmin, ymin = np.min(corners, axis=0)
     xmax, ymax = np.max(corners, axis=0)
 
-    angle = np.radians(angle)
-
-    from scipy.ndimage import rotate, zoom
-
+    ny, nx = data.nxsignal.shape
     if not np.isclose(aspect, 1.0):
-        ny, nx = original_data.shape
-        zoom_y = aspect * (((y.max() - y.min()) * nx) /
-                           ((x.max() - x.min()) * ny))
-        original_data = zoom(original_data, (zoom_y, 1), order=1)
+        zoom_y = float(aspect * (((y.max() - y.min()) * nx) /
+                                 ((x.max() - x.min()) * ny)))
     else:
-        rotated_aspect = None
-
-    # The angle is negative because scipy assumes a top-left origin
-    angle = - np.degrees(angle)
-
-    rotated_data = NXfield(rotate(original_data, angle, axes=(1,0),
-                                  reshape=True, order=1, mode='constant',
-                                  cval=0.0), name=data.nxsignal.nxname)
-    if np.all(original_data >= 0.0):
+        zoom_y = 1.0
+
+    # The signal, errors and weights share the same coordinate map
+    original_data = np.ma.getdata(data.nxsignal.nxdata)
+    arrays = [original_data]
+    for field in (data.nxerrors, data.nxweights):
+        if field is not None:
+            arrays.append(np.ma.getdata(field.nxdata))
+    rotated = interpolate_rotation(
+        arrays, rotation_map((ny, nx), float(angle), zoom_y))
+
+    rotated_data = rotated.pop(0)
+    if np.all(original_data >= 0.0) and np.any(original_data):
         vmin = np.min(original_data[np.nonzero(original_data)])
         rotated_data[(rotated_data!=0) & (np.abs(rotated_data)<vmin)] = vmin
     ny, nx = rotated_data.shape
@@ -1213,27 +1281,511 @@ def rotate_data(data, angle=45, aspect='equal'):
     rotated_y = NXfield(np.linspace(ymin, ymax, ny), name='rotated_y',
                         long_name=y_name)
     rotated_aspect = ((xmax - xmin) * ny) / ((ymax - ymin) * nx)
-    if original_errors is not None:
-        rotated_errors = NXfield(rotate(original_errors, angle, axes=(1,0),
-                                        reshape=True, order=1,
-                                        mode='constant', cval=0.0),
-                                 name=data.nxerrors.nxname)
-    if original_weights is not None:
-        rotated_weights = NXfield(rotate(original_weights, angle, axes=(1,0),
-                                         reshape=True, order=1,
-                                         mode='constant', cval=0.0),
-                                  name=data.nxweights.nxname)
+    rotated_data = NXfield(rotated_data, name=data.nxsignal.nxname)
     result = NXdata(rotated_data, (rotated_y, rotated_x), title=data.nxtitle)
     result.attrs['aspect'] = rotated_aspect
     result.attrs['x0'] = x0
     result.attrs['y0'] = y0
-    if original_errors is not None:
-        result.nxerrors = rotated_errors
-    if original_weights is not None:
-        result.nxweights = rotated_weights
+    if data.nxerrors is not None:
+        result.nxerrors = NXfield(rotated.pop(0), name=data.nxerrors.nxname)
+    if data.nxweights is not None:
+        result.nxweights = NXfield(rotated.pop(0),
+                                   name=data.nxweights.nxname)
+    return result
+
+
+rotation_maps = OrderedDict()
+rotation_cache_size = 128.0
+rotation_lock = RLock()
+
+
+def rotation_map(shape, angle, zoom_y=1.0):
+    """
+    Return the coordinate map used to rotate a 2D array.
+
+    The map defines, for each pixel of the rotated array, the four
+    neighboring pixels of the original array and their bilinear
+    interpolation weights. It reproduces the output of
+    scipy.ndimage.rotate, with reshape=True, order=1 and
+    mode='constant', applied after the y-axis is zoomed by zoom_y to
+    correct for unequal axis scales, except that the zoomed values are
+    interpolated directly from the original array rather than twice.
+    Maps are stored in a least-recently-used cache, so they are
+    computed only once for each combination of shape, angle and zoom,
+    e.g., when successive slices of a 3D array are rotated. The total
+    size of the cached maps is limited to 'rotation_cache_size' MB.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the original array.
+    angle : float
+        Counter-clockwise angle of rotation in degrees.
+    zoom_y : float, optional
+        Zoom factor applied to the y-axis before the rotation. The
+        default is 1.
+
+    Returns
+    -------
+    tuple
+        The shape of the rotated array, a boolean mask of the rotated
+        pixels that lie within the original array, the flattened
+        indices of their lower-left neighbors, the fractional offsets
+        along the y and x-axes, and the row stride of the original
+        array. The arrays are read-only.
+    """
+    key = (tuple(shape), float(angle), float(zoom_y))
+    with rotation_lock:
+        if key in rotation_maps:
+            rotation_maps.move_to_end(key)
+            return rotation_maps[key]
+
+    from scipy.special import cosdg, sindg
+    ny, nx = shape
+    zy = int(round(ny * zoom_y)) if zoom_y != 1.0 else ny
+    c, s = cosdg(angle), sindg(angle)
+    matrix = np.array([[c, s], [-s, c]])
+    bounds = matrix @ [[0, 0, zy, zy], [0, nx, 0, nx]]
+    out_shape = tuple(int(n) for n in np.ptp(bounds, axis=1) + 0.5)
+    offset = ((np.array([zy, nx]) - 1) / 2 -
+              matrix @ ((np.array(out_shape) - 1) / 2))
+    i, j = np.ogrid[0:out_shape[0], 0:out_shape[1]]
+    # The terms are summed in the same order as scipy, so that pixels
+    # on the array boundaries are treated identically
+    yi = offset[0] + i * c + j * s
+    xi = offset[1] + i * -s + j * c
+    if zy != ny:
+        yi *= (ny - 1) / (zy - 1) if zy > 1 else 0.0
+    mask = (yi >= 0) & (yi <= ny - 1) & (xi >= 0) & (xi <= nx - 1)
+    yi, xi = yi[mask], xi[mask]
+    y0 = np.clip(np.floor(yi), 0, max(ny-2, 0))
+    x0 = np.clip(np.floor(xi), 0, max(nx-2, 0))
+    dtype = np.int32 if ny * nx < 2**31 else np.intp
+    index = (y0 * nx + x0).astype(dtype)
+    fy, fx = yi - y0, xi - x0
+    for a in (mask, index, fy, fx):
+        a.setflags(write=False)
+    rotation = (out_shape, mask, index, fy, fx, nx)
+
+    with rotation_lock:
+        rotation_maps[key] = rotation
+        nbytes = [sum(a.nbytes for a in r[1:5])
+                  for r in rotation_maps.values()]
+        while rotation_maps and sum(nbytes) > rotation_cache_size * 1e6:
+            rotation_maps.popitem(last=False)
+            nbytes.pop(0)
+    return rotation
+
+
+def interpolate_rotation(arrays, rotation):
+    """
+    Rotate a list of arrays using a precomputed coordinate map.
+
+    All the arrays, which must have the same shape, are interpolated in
+    a single pass using the same neighbor indices and weights.
+
+    Parameters
+    ----------
+    arrays : list of ndarray
+        2D arrays with the shape used to compute the map.
+    rotation : tuple
+        Coordinate map returned by rotation_map.
+
+    Returns
+    -------
+    list of ndarray
+        Rotated arrays, which are zero outside the original array.
+    """
+    out_shape, mask, index, fy, fx, stride = rotation
+    dtype = np.result_type(np.float32, *arrays)
+    stack = np.stack([np.ravel(a) for a in arrays]).astype(dtype, copy=False)
+    values = ((stack.take(index, axis=1, mode='clip') * (1 - fx) +
+               stack.take(index+1, axis=1, mode='clip') * fx) * (1 - fy) +
+              (stack.take(index+stride, axis=1, mode='clip') * (1 - fx) +
+               stack.take(index+stride+1, axis=1, mode='clip') * fx) * fy)
+    rotated = np.zeros((len(arrays),) + out_shape, dtype=dtype)
+    rotated[:, mask] = values
+    return list(rotated)
+
+
+def axis_index(values, axis, dimlen):
+    """
+    Return the fractional array indices of values along an axis.
+
+    The indices are linearly interpolated between the axis bin centers,
+    which may be unequally spaced and either increasing or decreasing.
+    Values outside the axis range are linearly extrapolated from the
+    outermost bins.
+
+    Parameters
+    ----------
+    values : array_like
+        Axis values to be converted.
+    axis : array_like
+        Axis bin centers or boundaries.
+    dimlen : int
+        Length of the corresponding data dimension.
+
+    Returns
+    -------
+    ndarray
+        Fractional indices, in which 0 corresponds to the center of the
+        first bin.
+    """
+    values = np.asarray(values, dtype=float)
+    axis_centers = np.asarray(centers(axis, dimlen), dtype=float)
+    indices = np.arange(dimlen, dtype=float)
+    if dimlen < 2:
+        return np.zeros_like(values)
+    elif axis_centers[0] > axis_centers[-1]:
+        axis_centers, indices = axis_centers[::-1], indices[::-1]
+    result = np.interp(values, axis_centers, indices)
+    lo, hi = values < axis_centers[0], values > axis_centers[-1]
+    result[lo] = indices[0] + ((values[lo] - axis_centers[0]) *
+                               (indices[1] - indices[0]) /
+                               (axis_centers[1] - axis_centers[0]))
+    result[hi] = indices[-1] + ((values[hi] - axis_centers[-1]) *
+                                (indices[-1] - indices[-2]) /
+                                (axis_centers[-1] - axis_centers[-2]))
     return result
 
 
+def line_profile(data, start, end, width=0.0, num=None, aspect=1.0,
+                 order=1):
+    """
+    Return the values of a 2D NXdata group sampled along a line.
+
+    The signal is interpolated at equally spaced points between the
+    start and end of the line using scipy.ndimage.map_coordinates, so
+    the cost is proportional to the length of the line rather than the
+    size of the image. If a width is given, the signal is averaged over
+    points sampled along lines perpendicular to the profile, spaced by
+    approximately one pixel. Errors and weights are sampled in the same
+    way.
+
+    Parameters
+    ----------
+    data : NXdata
+        NXdata group containing the 2D data.
+    start, end : tuple of float
+        The (x, y) coordinates of the ends of the line in axis units.
+    width : float, optional
+        Total width of the region perpendicular to the line over which
+        the signal is averaged, in x-axis units. The default is 0.0.
+    num : int, optional
+        Number of points along the line. By default, the line is
+        sampled approximately once per pixel.
+    aspect : float, optional
+        Ratio of the y-axis to x-axis units, which defines the
+        perpendicular direction and the distance along the line. The
+        default is 1.0.
+    order : int, optional
+        Order of the spline interpolation. The default is 1.
+
+    Returns
+    -------
+    NXdata
+        One-dimensional NXdata group, whose axis, 'distance', is the
+        distance from the start of the line in x-axis units. Points
+        that lie outside the data are set to NaN.
+    """
+    from scipy.ndimage import map_coordinates
+
+    if data.ndim != 2:
+        raise NeXusError('Can only extract line profiles from 2D data.')
+    elif aspect in ('auto', 'equal', None):
+        aspect = 1.0
+    signal = data.nxsignal
+    ny, nx = signal.shape
+    yaxis, xaxis = data.nxaxes
+    (x0, y0), (x1, y1) = start, end
+    dx, dy = float(x1 - x0), float(y1 - y0) * aspect
+    length = np.hypot(dx, dy)
+    if length == 0.0:
+        raise NeXusError('The line has zero length.')
+
+    def indices(x, y):
+        return axis_index(y, yaxis, ny), axis_index(x, xaxis, nx)
+
+    i0, j0 = indices(np.array([x0, x1]), np.array([y0, y1]))
+    if num is None:
+        num = int(np.ceil(np.hypot(i0[1] - i0[0], j0[1] - j0[0]))) + 1
+    num = max(num, 2)
+    t = np.linspace(0.0, 1.0, num)
+    x = x0 + t * (x1 - x0)
+    y = y0 + t * (y1 - y0)
+
+    if width > 0.0:
+        px, py = -dy / length, dx / (length * aspect)
+        xc, yc = (x0 + x1) / 2, (y0 + y1) / 2
+        ic, jc = indices(np.array([xc - px*width/2, xc + px*width/2]),
+                         np.array([yc - py*width/2, yc + py*width/2]))
+        nw = int(np.ceil(np.hypot(ic[1] - ic[0], jc[1] - jc[0]))) + 1
+        offsets = np.linspace(-width/2, width/2, nw)[:, np.newaxis]
+        x = x + offsets * px
+        y = y + offsets * py
+    else:
+        x, y = x[np.newaxis, :], y[np.newaxis, :]
+    i, j = indices(x.ravel(), y.ravel())
+    outside = (i < -0.5) | (i > ny - 0.5) | (j < -0.5) | (j > nx - 0.5)
+
+    def sample(field, square=False):
+        values = np.ma.filled(np.ma.asarray(field.nxdata, dtype=float),
+                              np.nan)
+        if square:
+            values = values**2
+        result = map_coordinates(values, [i, j], order=order,
+                                 mode='nearest')
+        result[outside] = np.nan
+        result = result.reshape(x.shape)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if square:
+                count = np.sum(np.isfinite(result), axis=0)
+                return np.sqrt(np.nansum(result, axis=0)) / np.maximum(count,
+                                                                       1)
+            else:
+                return np.nanmean(result, axis=0)
+
+    def copy_attrs(field, *keys):
+        return {key: field.attrs[key] for key in keys if key in field.attrs}
+
+    profile = NXdata(NXfield(sample(signal), name=signal.nxname,
+                             attrs=copy_attrs(signal, 'long_name', 'units')),
+                     NXfield(t * length, name='distance',
+                             attrs=copy_attrs(xaxis, 'units')),
+                     title=data.nxtitle)
+    if data.nxerrors is not None:
+        profile.nxerrors = NXfield(sample(data.nxerrors, square=True),
+                                   name=data.nxerrors.nxname)
+    if data.nxweights is not None:
+        profile.nxweights = NXfield(sample(data.nxweights),
+                                    name=data.nxweights.nxname)
+    return profile
+
+
+def reduce_image(image, factor, method='mean'):
+    """
+    Reduce the size of a 2D image by an integer factor.
+
+    Each block of factor x factor pixels is replaced by a single pixel
+    containing either the mean or the maximum of the block. NaNs and
+    masked values are ignored. If the image dimensions are not exact
+    multiples of the factor, the image is padded with NaNs, so the
+    reduced image covers a slightly larger extent than the original.
+
+    Parameters
+    ----------
+    image : ndarray
+        Two-dimensional array to be reduced.
+    factor : int
+        Number of original pixels along each dimension that are
+        combined into a single pixel.
+    method : str, optional
+        Reduction method, either 'mean' or 'max'. Default is 'mean'.
+
+    Returns
+    -------
+    ndarray
+        Reduced image with shape (ceil(ny/factor), ceil(nx/factor)).
+    """
+    if method not in ('mean', 'max'):
+        raise NeXusError(f"Invalid reduction method '{method}'")
+    factor = int(factor)
+    if factor <= 1:
+        return image
+    if np.ma.isMaskedArray(image):
+        image = image.astype(np.float64).filled(np.nan)
+    elif not np.issubdtype(image.dtype, np.floating):
+        image = image.astype(np.float64)
+    ny, nx = image.shape
+    pad_y, pad_x = -ny % factor, -nx % factor
+    if pad_y or pad_x:
+        image = np.pad(image, ((0, pad_y), (0, pad_x)),
+                       constant_values=np.nan)
+    blocks = image.reshape((ny + pad_y) // factor, factor,
+                           (nx + pad_x) // factor, factor)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        if method == 'max':
+            return np.nanmax(blocks, axis=(1, 3))
+        else:
+            return np.nanmean(blocks, axis=(1, 3))
+
+
+def decimate_line(x, y, xmin, xmax, columns, threshold=0):
+    """
+    Return the indices of the points needed to draw a dense line.
+
+    The visible x-range is divided into the given number of columns,
+    normally one per screen pixel. Within each column, only the first
+    and last points and the points with the minimum and maximum
+    y-values are retained, so the drawn line is indistinguishable from
+    the line through all the points, including any narrow peaks. The
+    nearest points outside the visible range are also retained so that
+    the line extends to the edges of the plot.
+
+    Parameters
+    ----------
+    x : ndarray
+        Monotonically increasing or decreasing x-values.
+    y : ndarray
+        The y-values.
+    xmin, xmax : float
+        The visible x-range.
+    columns : int
+        Number of columns in the visible x-range.
+    threshold : int, optional
+        Minimum number of visible points for decimation to be used.
+
+    Returns
+    -------
+    ndarray or None
+        Sorted indices of the retained points, or None if the data do
+        not need to be decimated, either because there are too few
+        visible points or because the x-values are not monotonic.
+    """
+    x = np.asarray(x)
+    y = np.ma.filled(np.ma.asarray(y, dtype=float), np.nan)
+    columns = int(columns)
+    if x.ndim != 1 or x.shape != y.shape or x.size < 2 or columns < 1:
+        return None
+    step = np.diff(x)
+    if np.all(step >= 0):
+        order = None
+    elif np.all(step <= 0):
+        order = np.arange(x.size)[::-1]
+        x, y = x[::-1], y[::-1]
+    else:
+        return None
+    xmin, xmax = min(xmin, xmax), max(xmin, xmax)
+    start = max(int(np.searchsorted(x, xmin, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, xmax, side='right')) + 1, x.size)
+    if stop - start <= max(threshold, 4 * columns) or xmax <= xmin:
+        return None
+    xs, ys = x[start:stop], y[start:stop]
+    column = np.clip(((xs - xmin) * columns / (xmax - xmin)).astype(np.int64),
+                     -1, columns)
+    first = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    last = np.r_[first[1:] - 1, xs.size - 1]
+    counts = last - first + 1
+    segment = np.repeat(np.arange(first.size), counts)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        ymin = np.repeat(np.fmin.reduceat(ys, first), counts)
+        ymax = np.repeat(np.fmax.reduceat(ys, first), counts)
+    _, imin = np.unique(segment[ys == ymin], return_index=True)
+    _, imax = np.unique(segment[ys == ymax], return_index=True)
+    index = np.unique(np.concatenate((first, last,
+                                      np.flatnonzero(ys == ymin)[imin],
+                                      np.flatnonzero(ys == ymax)[imax])))
+    index += start
+    if order is not None:
+        index = np.sort(order[index])
+    return index
+
+
+class NXTimings:
+    """
+    Rolling record of the time taken by each stage of a plot update.
+
+    Timings are only recorded when the 'enabled' attribute is True, so
+    that the instrumentation costs no more than an attribute lookup
+    when it is switched off. The most recent durations of each stage
+    are stored in a fixed-length deque, from which the last, mean and
+    maximum values are reported.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of durations retained for each stage. The default is 50.
+
+    Examples
+    --------
+    >>> timings = NXTimings()
+    >>> timings.enabled = True
+    >>> with timings.stage('read'):
+    ...     data = field.nxdata
+    >>> timings.summary()
+    [('read', 0.0021, 0.0021, 0.0021, 1)]
+    """
+
+    def __init__(self, window=50):
+        self.enabled = False
+        self.window = window
+        self.stages = OrderedDict()
+
+    def __len__(self):
+        return len(self.stages)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block, if timing is enabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, duration):
+        """Store the duration of a stage in seconds."""
+        if name not in self.stages:
+            self.stages[name] = deque(maxlen=self.window)
+        self.stages[name].append(duration)
+
+    def summary(self):
+        """
+        Return the statistics of each recorded stage.
+
+        Returns
+        -------
+        list of tuple
+            Tuples of the stage name, and the last, mean and maximum
+            durations in seconds, followed by the number of durations
+            used to compute them, in the order in which the stages were
+            first recorded.
+        """
+        return [(name, values[-1], sum(values) / len(values), max(values),
+                 len(values))
+                for name, values in self.stages.items() if values]
+
+    def clear(self):
+        """Remove all recorded timings."""
+        self.stages.clear()
+
+    def export(self, filename):
+        """
+        Save the timing statistics and recorded durations to a file.
+
+        The file is written in JSON format if the extension is '.json'
+        and as comma-separated values otherwise. Durations are saved in
+        milliseconds.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the output file.
+        """
+        rows = [{'stage': name, 'last': last * 1000, 'mean': mean * 1000,
+                 'max': maximum * 1000, 'count': count}
+                for name, last, mean, maximum, count in self.summary()]
+        if Path(filename).suffix.lower() == '.json':
+            for row in rows:
+                row['values'] = [v * 1000 for v in self.stages[row['stage']]]
+            with open(filename, 'w') as f:
+                json.dump({'units': 'ms', 'window': self.window,
+                           'stages': rows}, f, indent=2)
+        else:
+            with open(filename, 'w', newline='') as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=['stage', 'last', 'mean', 'max', 'count'])
+                writer.writeheader()
+                writer.writerows(rows)
+
+
 class NXListener(QtCore.QObject):
 
     change_signal = QtCore.Signal(str)
@@ -0,0 +1,25 @@
+"""Run the plotting benchmarks on small data to check that they complete."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+script = Path(__file__).parents[1] / 'benchmarks' / 'benchmark_plotting.py'
+
+
+def test_benchmarks_complete(tmp_path):
+    output = tmp_path / 'results.json'
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    subprocess.run([sys.executable, str(script), '--sizes', 'small',
+                    '--points', '1000', '--frame', '64,64',
+                    '--volume', '6,32,32', '--repeat', '1', '--steps', '2',
+                    '--output', str(output)],
+                   env=env, cwd=tmp_path, check=True, timeout=300,
+                   capture_output=True)
+    results = json.loads(output.read_text())['results']
+    for storage in ('memory', 'hdf5'):
+        for name in ('plot_1d', 'decimated_1d', 'format_coord_1d',
+                     'plot_2d', 'rotate_2d', 'format_coord_2d', 'plot_3d',
+                     'replot_3d', 'projection_3d'):
+            assert f'{name}[{storage}]' in results
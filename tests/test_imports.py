@@ -10,6 +10,10 @@ def test_gui_import():
     import nexpy.gui.importdialog
     import nexpy.gui.mainwindow
     import nexpy.gui.plotview
+    import nexpy.gui.plotting
+    import nexpy.gui.render
+    import nexpy.gui.scans
+    import nexpy.gui.index
     import nexpy.gui.scripteditor
     import nexpy.gui.treeview
     import nexpy.gui.utils
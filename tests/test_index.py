@@ -0,0 +1,77 @@
+"""Tests of the index of the metadata in directories of NeXus files."""
+import os
+from pathlib import Path
+
+from nexusformat.nexus import NXentry, NXroot, NXsample
+
+from nexpy.gui.index import NXIndex
+
+
+def make_file(directory, name, title, sample, temperature):
+    entry = NXentry(title=title, start_time='2026-01-01T00:00:00')
+    entry['sample'] = NXsample(temperature=temperature)
+    entry['sample/name'] = sample
+    filename = Path(directory) / name
+    NXroot(entry).save(filename)
+    return filename
+
+
+def make_index(tmp_path):
+    directory = tmp_path / 'data'
+    directory.mkdir()
+    files = [make_file(directory, 'run_001.nxs', '100% beam', 'LaB6', 10.0),
+             make_file(directory, 'run_002.nxs', '50 percent beam', 'Si',
+                       20.0),
+             make_file(directory, 'run_x03.nxs', 'scan_a1', 'Si', 30.0)]
+    (directory / 'notes.txt').write_text('Not a NeXus file')
+    index = NXIndex(tmp_path / 'index.db')
+    index.add_directory(directory)
+    index.set_fields(['sample/temperature'])
+    return index, files
+
+
+def filenames(results):
+    return [Path(r['filename']).name for r in results]
+
+
+def test_scan(tmp_path):
+    index, files = make_index(tmp_path)
+    assert sorted(f[0] for f in index.scan()) == [str(f) for f in files]
+    assert index.update() == 3
+    assert len(index) == 3
+    assert index.scan() == []
+
+
+def test_refresh(tmp_path):
+    index, files = make_index(tmp_path)
+    index.update()
+    assert index.update() == 0
+    os.utime(files[1], (0, 0))
+    assert [f[0] for f in index.scan()] == [str(files[1])]
+    assert index.update() == 1
+    files[2].unlink()
+    assert index.update() == 0
+    assert filenames(index.search()) == ['run_001.nxs', 'run_002.nxs']
+    index.set_fields(['sample/temperature', 'entry/missing'])
+    assert index.update() == 2
+
+
+def test_search(tmp_path):
+    index, _ = make_index(tmp_path)
+    index.update()
+    assert filenames(index.search('lab6')) == ['run_001.nxs']
+    assert filenames(index.search('Si')) == ['run_002.nxs', 'run_x03.nxs']
+    assert filenames(index.search(field='sample/temperature',
+                                  minimum=15.0)) == ['run_002.nxs',
+                                                     'run_x03.nxs']
+    results = index.search(field='sample/temperature', maximum=15.0)
+    assert results[0]['values'] == {'sample/temperature': 10.0}
+    assert results[0]['sample'] == 'LaB6'
+    assert filenames(index.search('run_0')) == ['run_001.nxs',
+                                                'run_002.nxs']
+    assert filenames(index.search('0%')) == ['run_001.nxs']
+    assert filenames(index.search('%')) == ['run_001.nxs']
+    assert filenames(index.search('n_a')) == ['run_x03.nxs']
+    assert index.search('e_t') == []
+    assert index.search('\\') == []
+    assert len(index.search(limit=2)) == 2
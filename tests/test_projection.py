@@ -0,0 +1,120 @@
+"""Tests of projections computed in blocks by worker threads."""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from nexusformat.nexus import NXdata, NXentry, NXfield, NXroot, nxload
+
+from nexpy.gui.utils import file_lock, project_data
+
+
+def make_data(shape=(20, 30, 40), boundaries=False, masked=False):
+    rng = np.random.default_rng(0)
+    signal = NXfield(rng.random(shape), name='counts')
+    axes = [NXfield(np.linspace(0.0, 1.0, n+1 if boundaries else n),
+                    name=f'x{i}') for i, n in enumerate(shape)]
+    data = NXdata(signal, axes, errors=NXfield(rng.random(shape)),
+                  weights=NXfield(rng.random(shape)))
+    if masked:
+        data.nxsignal[2:5, 3, :] = np.ma.masked
+        data.nxsignal[7, :, :] = np.ma.masked
+    return data
+
+
+def assert_same(result, expected):
+    for name in ['nxsignal', 'nxerrors', 'nxweights']:
+        a = getattr(result, name)
+        b = getattr(expected, name)
+        assert a.shape == b.shape
+        assert np.array_equal(np.ma.getmaskarray(a.nxdata),
+                              np.ma.getmaskarray(b.nxdata))
+        assert np.ma.allclose(a.nxdata, b.nxdata)
+    assert [a.nxname for a in result.nxaxes] == \
+        [a.nxname for a in expected.nxaxes]
+    for a, b in zip(result.nxaxes, expected.nxaxes):
+        assert np.allclose(a.nxdata, b.nxdata)
+    for key in ['summed_bins', 'averaged_bins']:
+        assert result.attrs.get(key) == expected.attrs.get(key)
+    for name in expected:
+        if 'summed_bins' in expected[name].attrs:
+            assert np.isclose(result[name], expected[name])
+            assert result[name].attrs['summed_bins'] == \
+                expected[name].attrs['summed_bins']
+
+
+limits = [(0.1, 0.9), (0.2, 0.8), (0.0, 1.0)]
+
+
+@pytest.mark.parametrize('axes', [[0], [1], [2], [0, 1], [1, 0], [2, 0]])
+@pytest.mark.parametrize('summed', [True, False])
+def test_in_memory(axes, summed):
+    data = make_data()
+    assert_same(project_data(data, axes, limits, summed=summed,
+                             blocksize=1e-3, workers=2),
+                data.project(axes, limits, summed=summed))
+
+
+@pytest.mark.parametrize('axes', [[0], [2], [0, 2], [1, 2]])
+def test_masked(axes):
+    data = make_data(masked=True)
+    assert_same(project_data(data, axes, limits, blocksize=1e-3),
+                data.project(axes, limits))
+
+
+@pytest.mark.parametrize('axes', [[0], [1, 2]])
+@pytest.mark.parametrize('summed', [True, False])
+def test_boundaries(axes, summed):
+    data = make_data(boundaries=True)
+    assert_same(project_data(data, axes, limits, summed=summed,
+                             blocksize=1e-3),
+                data.project(axes, limits, summed=summed))
+
+
+@pytest.mark.parametrize('axes', [[0], [1], [1, 2]])
+def test_file(tmp_path, axes):
+    root = NXroot(NXentry(make_data(masked=True)))
+    root.save(tmp_path / 'data.nxs')
+    data = nxload(tmp_path / 'data.nxs')['entry/data']
+    assert_same(project_data(data, axes, limits, blocksize=1e-3),
+                data.project(axes, limits))
+
+
+def test_shared_file_lock(tmp_path):
+    root = NXroot(NXentry(make_data()))
+    root.save(tmp_path / 'data.nxs')
+    first = nxload(tmp_path / 'data.nxs')['entry/data']
+    second = nxload(tmp_path / 'data.nxs')['entry/data']
+    assert file_lock(first) is file_lock(second.nxsignal)
+    assert file_lock(first) is not file_lock(make_data())
+    expected = first.project([0], limits)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda data: project_data(data, [0], limits, blocksize=1e-3),
+            [first, second] * 4))
+    for result in results:
+        assert_same(result, expected)
+
+
+def test_masked_transpose():
+    data = make_data(masked=True)
+    result = project_data(data, [2, 0], limits, blocksize=1e-3)
+    expected = project_data(data, [0, 2], limits, blocksize=1e-3)
+    for name in ['nxsignal', 'nxerrors', 'nxweights']:
+        a = getattr(result, name).nxdata
+        b = getattr(expected, name).nxdata.T
+        assert np.array_equal(np.ma.getmaskarray(a), np.ma.getmaskarray(b))
+        assert np.ma.allclose(a, b)
+    assert [a.nxname for a in result.nxaxes] == ['x2', 'x0']
+
+
+def test_large_in_memory():
+    data = make_data(shape=(200, 100, 100))
+    assert data.nxsignal.chunks is True
+    assert_same(project_data(data, [1], limits, blocksize=1),
+                data.project([1], limits))
+
+
+def test_cancel():
+    data = make_data()
+    assert project_data(data, [0], limits, blocksize=1e-3,
+                        callback=lambda fraction: True) is None
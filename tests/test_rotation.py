@@ -0,0 +1,56 @@
+"""Tests of the cached coordinate maps used to rotate 2D data."""
+import numpy as np
+import pytest
+from scipy.ndimage import rotate
+
+from nexpy.gui import utils
+from nexpy.gui.utils import interpolate_rotation, rotation_map
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    utils.rotation_maps.clear()
+    yield
+    utils.rotation_maps.clear()
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (1, 7), (7, 1), (2, 9), (3, 3),
+                                   (20, 31), (64, 64)])
+@pytest.mark.parametrize('angle', [-90.0, -60.0, 10.0, 30.0, 45.0, 135.0])
+def test_matches_scipy(shape, angle):
+    data = np.random.default_rng(0).random(shape)
+    expected = rotate(data, angle, reshape=True, order=1, mode='constant')
+    rotated = interpolate_rotation([data], rotation_map(shape, angle))[0]
+    assert rotated.shape == expected.shape
+    np.testing.assert_allclose(rotated, expected, rtol=0, atol=1e-12)
+
+
+def test_companions_share_map():
+    rng = np.random.default_rng(1)
+    arrays = [rng.random((16, 24)) for _ in range(3)]
+    rotated = interpolate_rotation(arrays, rotation_map((16, 24), 30.0))
+    for array, result in zip(arrays, rotated):
+        np.testing.assert_allclose(result, rotate(array, 30.0, order=1),
+                                   rtol=0, atol=1e-12)
+
+
+def test_float32_data():
+    data = np.random.default_rng(2).random((16, 24)).astype(np.float32)
+    rotated = interpolate_rotation([data], rotation_map((16, 24), 30.0))[0]
+    assert rotated.dtype == np.float32
+    np.testing.assert_allclose(rotated, rotate(data, 30.0, order=1),
+                               rtol=1e-6, atol=1e-6)
+
+
+def test_cache_size_limited(monkeypatch):
+    monkeypatch.setattr(utils, 'rotation_cache_size', 0.3)
+    first = rotation_map((64, 64), 30.0)
+    assert rotation_map((64, 64), 30.0) is first
+    for angle in (10.0, 20.0, 40.0, 50.0):
+        rotation_map((64, 64), angle)
+    nbytes = sum(sum(a.nbytes for a in r[1:5])
+                 for r in utils.rotation_maps.values())
+    assert nbytes <= 0.3e6
+    assert ((64, 64), 30.0, 1.0) not in utils.rotation_maps
+    rotation_map((256, 256), 30.0)
+    assert len(utils.rotation_maps) == 0
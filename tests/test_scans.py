@@ -0,0 +1,156 @@
+"""Tests of scans combining the data of many NeXus files."""
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from nexusformat.nexus import (NeXusError, NXdata, NXentry, NXroot, NXsample,
+                               nxconsolidate, nxload)
+
+import nexpy.gui.scans
+from nexpy.gui.scans import NXScanBuilder, harvest_scalars, virtual_scan
+
+
+def make_files(directory, values):
+    files = []
+    for i, value in enumerate(values):
+        x = np.linspace(0.0, 1.0, 6)
+        y = np.linspace(0.0, 1.0, 5)
+        signal = np.full((5, 6), float(i)) + np.outer(y, x)
+        root = NXroot(NXentry(NXdata(signal, [y, x], name='data'),
+                              NXsample(temperature=value, name='sample')))
+        filename = Path(directory) / f'run_{i:03d}.nxs'
+        root.save(filename)
+        files.append(filename)
+    return files
+
+
+def test_virtual_relative_paths(tmp_path, monkeypatch):
+    make_files(tmp_path, [30.0, 10.0, 20.0])
+    monkeypatch.chdir(tmp_path)
+    data = virtual_scan(sorted(Path('.').glob('run_*.nxs')), 'entry/data',
+                        'entry/sample/temperature')
+    NXroot(NXentry(data)).save(tmp_path / 'scan.nxs')
+    monkeypatch.chdir(tmp_path.parent)
+    scan = nxload(tmp_path / 'scan.nxs')['entry/data']
+    assert np.allclose(scan.nxaxes[0], [10.0, 20.0, 30.0])
+    assert np.allclose(scan.nxsignal.nxdata[:, 0, 0], [1.0, 2.0, 0.0])
+
+
+def assert_consolidated(data, files):
+    expected = nxconsolidate([str(f) for f in files], 'entry/data',
+                             'entry/sample/temperature')
+    assert np.allclose(data.nxaxes[0], expected.nxaxes[0])
+    assert np.allclose(data.nxsignal.nxdata, expected.nxsignal.nxdata)
+
+
+def test_builder(tmp_path):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0, 40.0, 25.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=1)
+    assert_consolidated(builder.build(files[:3]), files[:3])
+    assert_consolidated(builder.build(files), files)
+    assert len(builder) == 5
+    assert_consolidated(nxload(tmp_path / 'scan.nxs')['data'], files)
+
+
+def test_builder_reorder(tmp_path):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0, 40.0, 25.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=1)
+    builder.build(files[1:4])
+    # The new files are sorted before and between the existing files
+    assert_consolidated(builder.build(files[::-1]), files)
+    assert_consolidated(builder.build(files[2:]), files[2:])
+
+
+def test_builder_modified(tmp_path):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=1)
+    builder.build(files)
+    root = nxload(files[0], 'rw')
+    root['entry/data/signal'] = root['entry/data'].nxsignal.nxdata * 2
+    os.utime(files[0], (0, 0))
+    assert_consolidated(builder.build(files), files)
+
+
+def test_builder_workers(tmp_path):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0, 40.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=2)
+    builder.build(files[:2])
+    assert_consolidated(builder.build(files), files)
+
+
+def test_builder_cancel(tmp_path):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=1)
+    assert builder.build(files, callback=lambda fraction: True) is None
+    assert len(builder) == 0
+    assert_consolidated(builder.build(files), files)
+
+
+def test_builder_reuses_scan_values(tmp_path, monkeypatch):
+    files = make_files(tmp_path, [30.0, 10.0, 20.0, 40.0])
+    builder = NXScanBuilder(tmp_path / 'scan.nxs', 'entry/data',
+                            'entry/sample/temperature', workers=1)
+    builder.build(files[:3])
+    loaded = []
+    load = nexpy.gui.scans.nxload
+
+    def counted(filename, *args, **kwargs):
+        loaded.append(Path(filename).name)
+        return load(filename, *args, **kwargs)
+    monkeypatch.setattr(nexpy.gui.scans, 'nxload', counted)
+    data = builder.build(files)
+    assert np.allclose(data.nxaxes[0], [10.0, 20.0, 30.0, 40.0])
+    assert set(loaded) == {'run_003.nxs'}
+    os.utime(files[0], (0, 0))
+    loaded.clear()
+    data = builder.build(files)
+    assert np.allclose(data.nxaxes[0], [10.0, 20.0, 30.0, 40.0])
+    # The scan is rebuilt, but only the modified file is opened again to
+    # read its scan value before the template and slabs are read
+    assert loaded[:2] == ['run_000.nxs', 'run_001.nxs']
+    assert_consolidated(data, files)
+
+
+def test_scan_tab_unsaved_roots():
+    from nexpy.gui.dialogs import ScanTab
+
+    class Tab:
+        running = False
+        scan_files = [NXroot(name='saved'), NXroot(name='unsaved')]
+    Tab.scan_files[0]._filename = 'saved.nxs'
+    with pytest.raises(NeXusError, match='unsaved'):
+        ScanTab.create_scan_data(Tab())
+
+
+def test_harvest_scalars(tmp_path):
+    files = []
+    for i, (temperature, pressure) in enumerate([(30.0, 3.0), (10.0, 1.0),
+                                                 (20.0, None)]):
+        sample = NXsample(temperature=temperature)
+        if pressure is not None:
+            sample['pressure'] = pressure
+        sample['temperature'].attrs['units'] = 'K'
+        files.append(tmp_path / f'run_{i:03d}.nxs')
+        NXroot(NXentry(sample)).save(files[-1])
+    (tmp_path / 'run_003.nxs').write_text('Not a NeXus file')
+    files.append(tmp_path / 'run_003.nxs')
+    data = harvest_scalars(tmp_path / 'run_*.nxs', 'entry/sample/pressure',
+                           scan_path='entry/sample/temperature', workers=2)
+    assert np.allclose(data.nxaxes[0], [10.0, 20.0, 30.0])
+    assert data.nxaxes[0].attrs['units'] == 'K'
+    assert np.allclose(data.nxsignal, [1.0, np.nan, 3.0], equal_nan=True)
+    assert [Path(f).name for f in data['file_name'].nxvalue] == \
+        ['run_001.nxs', 'run_002.nxs', 'run_000.nxs']
+    data = harvest_scalars(files, ['entry/sample/temperature',
+                                   'entry/sample/pressure'], workers=2)
+    assert np.allclose(data.nxaxes[0], [0, 1, 2, 3])
+    assert np.allclose(data['temperature'], [30.0, 10.0, 20.0, np.nan],
+                       equal_nan=True)
+    assert np.allclose(data['pressure'], [3.0, 1.0, np.nan, np.nan],
+                       equal_nan=True)
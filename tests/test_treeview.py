@@ -0,0 +1,111 @@
+"""Tests of the synchronization of the tree view with the NeXus tree."""
+import numpy as np
+import pytest
+from nexusformat.nexus import (NXcollection, NXdata, NXentry, NXfield,
+                               NXgroup, NXlink, NXroot)
+
+from nexpy.gui.pyqt import QtWidgets
+from nexpy.gui.treeview import NXtree, NXTreeView
+
+
+class MainWindow(QtWidgets.QMainWindow):
+
+    def __init__(self):
+        super().__init__()
+        self.user_ns = {}
+
+
+@pytest.fixture
+def tree():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    mainwindow = MainWindow()
+    tree = NXtree()
+    view = NXTreeView(tree, mainwindow)
+    for i in range(3):
+        tree[f'w{i}'] = NXroot(NXentry(
+            NXdata(np.arange(10), name='data'),
+            *[NXcollection(name=f'g{j}', **{f'f{k}': k for k in range(20)})
+              for j in range(10)]))
+    yield tree
+    view.timer.stop()
+    view.deleteLater()
+    mainwindow.deleteLater()
+    app.processEvents()
+
+
+def check_items(item, node):
+    if isinstance(node, NXgroup) and node.entries_loaded:
+        names = sorted(item.child(row).name for row in range(item.rowCount()))
+        assert names == sorted(node.entries)
+        for row in range(item.rowCount()):
+            child = item.child(row)
+            check_items(child, node.entries[child.name])
+
+
+def synced_paths(monkeypatch):
+    synced = []
+    sync_children = NXtree.sync_children
+
+    def counted(self, item, node=None):
+        synced.append(getattr(item, 'path', None))
+        return sync_children(self, item, node)
+    monkeypatch.setattr(NXtree, 'sync_children', counted)
+    return synced
+
+
+def test_edit_syncs_changed_branch(tree, monkeypatch):
+    synced = synced_paths(monkeypatch)
+    tree['w1']['entry/g3/f4'] = 100
+    assert set(synced) <= {None, 'w1/', 'w1/entry', 'w1/entry/g3',
+                           'w1/entry/g3/f4'}
+    check_items(tree._item, tree)
+
+
+def test_new_items_are_synced(tree, monkeypatch):
+    synced = synced_paths(monkeypatch)
+    tree['w2']['entry/new'] = NXgroup(NXgroup(NXfield(1, name='f'),
+                                              name='inner'), name='new')
+    assert set(synced) <= {None, 'w2/', 'w2/entry', 'w2/entry/new',
+                           'w2/entry/new/inner', 'w2/entry/new/inner/f'}
+    assert 'w2/entry/new/inner/f' in synced
+    check_items(tree._item, tree)
+
+
+def test_structure_changes(tree):
+    tree['w0/entry/g1/f3'].rename('renamed')
+    del tree['w0']['entry/g2']
+    tree['w1']['entry/link'] = NXlink(tree['w1/entry/g5'])
+    tree['w1']['entry/g5/extra'] = NXgroup(NXfield(1, name='f'), name='extra')
+    check_items(tree._item, tree)
+    del tree['w2']
+    check_items(tree._item, tree)
+    assert 'w2' not in tree._shell
+
+
+def test_shell_names(tree):
+    tree['w1'].rename('renamed')
+    assert tree._shell['renamed'] is tree['renamed']
+    assert 'w1' not in tree._shell
+
+
+def test_plot_cache_cleared(tree, monkeypatch):
+    import nexpy.gui.plotview
+
+    class PlotView:
+
+        def __init__(self, data):
+            self.data = data
+            self.cleared = 0
+
+        def clear_cache(self):
+            self.cleared += 1
+    plotted, other = PlotView(tree['w0/entry/data']), PlotView(
+        tree['w1/entry/data'])
+    monkeypatch.setattr(nexpy.gui.plotview, 'plotviews',
+                        {'Figure 1': plotted, 'Figure 2': other})
+    tree['w0/entry/data'].nxsignal[2] = -1
+    assert plotted.cleared > 0
+    assert other.cleared == 0
+    cleared = plotted.cleared
+    tree['w0']['entry/g3/f4'] = 100
+    assert plotted.cleared == cleared